@@ -0,0 +1,88 @@
+"""Benchmark loading the background and clearing a frame to it.
+
+Startup: decoding hass-dash-house.bmp (what PILRenderer and the display
+script did on every start) against mapping the packed raw template
+cached next to it. Clear: a new copy of the background image per frame
+(the old PILRenderer.clear), an in-place paste into the working image
+(the current one) and unpacking the packed template into it.
+
+    python benchmarks/background_bench.py --repeat 500
+"""
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PIL import Image  # noqa: E402
+
+from rendering.background import BackgroundTemplate  # noqa: E402
+
+SIZE = (800, 480)
+BACKGROUND = ROOT / "assets" / "hass-dash-house.bmp"
+
+
+def time_calls(call: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def decode_bmp(path: Path) -> Image.Image:
+    """Background as PILRenderer loaded it before the template."""
+    with Image.open(path) as loaded:
+        image = loaded.convert("1")
+    if image.size != SIZE:
+        image = image.resize(SIZE)
+    return image
+
+
+def report(name: str, timings: List[float]) -> None:
+    print(
+        f"{name:28} mean {statistics.mean(timings) * 1e6:9.1f} us  "
+        f"max {max(timings) * 1e6:9.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bmp = Path(tmp) / BACKGROUND.name
+        shutil.copy(BACKGROUND, bmp)
+        BackgroundTemplate.load(bmp, SIZE, cache=True).close()
+
+        def map_template(to_image: bool) -> None:
+            with BackgroundTemplate.load(bmp, SIZE, cache=True) as template:
+                if to_image:
+                    template.to_image()
+
+        print("startup")
+        report("decode BMP", time_calls(lambda: decode_bmp(bmp), args.repeat))
+        report("map raw template", time_calls(lambda: map_template(False), args.repeat))
+        report("map raw template + image", time_calls(lambda: map_template(True), args.repeat))
+
+    template = BackgroundTemplate.load(BACKGROUND, SIZE)
+    background = template.to_image()
+    frame = background.copy()
+    packed = bytes(template.data)
+
+    print("clear")
+    report("copy background (new image)", time_calls(background.copy, args.repeat))
+    report("paste background in place", time_calls(lambda: frame.paste(background), args.repeat))
+    report("unpack template in place", time_calls(lambda: frame.frombytes(packed), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark the packed 1-bit frame diff on 800x480 dashboard frames.
+
+Renders the mock dashboard, changes it in a few typical ways and times
+partial_updates() between the two packed frames (as produced for
+EPD.getbuffer). Reports the mean and worst time per diff and the
+rectangles produced. "separated changes" scatters small changes over the
+whole frame, so the rectangle merge has hundreds of candidates; "full
+refresh" changes every value the dashboard shows (weather, sun, all rooms)
+at once; "every other row" is the worst case for band and span splitting.
+
+The mean time is also scaled by --pi-factor (how much slower a Pi Zero
+runs this than the benchmark machine, roughly 10-30x from x86) and checked
+against the --budget-ms a diff may take on the Pi.
+
+    python benchmarks/frame_diff_bench.py --repeat 500
+    python benchmarks/frame_diff_bench.py --rect-overhead 0 --pi-factor 10
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from components.rooms_widget import RoomsWidget  # noqa: E402
+from components.sun_widget import SunWidget  # noqa: E402
+from components.weather_widget import WeatherWidget  # noqa: E402
+from core.hass_mock import MockHASSClient  # noqa: E402
+from dashboard import Dashboard  # noqa: E402
+from rendering.frame_diff import DEFAULT_RECT_OVERHEAD, partial_updates  # noqa: E402
+from rendering.renderer import PILRenderer  # noqa: E402
+
+WIDTH, HEIGHT = 800, 480
+
+
+def render_frame(update: Callable[[MockHASSClient], None] = lambda hass: None) -> bytes:
+    """Render the mock dashboard (after applying update) as a packed frame."""
+    hass = MockHASSClient()
+    update(hass)
+    renderer = PILRenderer(size=(WIDTH, HEIGHT))
+    dashboard = Dashboard(renderer)
+    dashboard.add_widget(WeatherWidget(hass, renderer))
+    dashboard.add_widget(SunWidget(hass, renderer))
+    dashboard.add_widget(RoomsWidget(hass, renderer, config_path=str(ROOT / "rooms.widget.yml")))
+    dashboard.update_all()
+    renderer.clear()
+    for widget in dashboard.widgets:
+        widget.render()
+    return renderer.get_image().tobytes()
+
+
+def set_values(hass: MockHASSClient, step: int) -> None:
+    """Set every value the dashboard shows (weather, sun times, all rooms) for a step."""
+    hass.set_entity("weather.home", "rainy", {"temperature": 9.5 + step, "condition": "rainy"})
+    hass.set_entity(
+        "sun.sun",
+        "below_horizon",
+        {
+            "next_rising": f"2025-11-02T06:{10 + step:02d}:00+00:00",
+            "next_setting": f"2025-11-01T15:{20 + step:02d}:00+00:00",
+        },
+    )
+    rooms = RoomsWidget(hass, None, config_path=str(ROOT / "rooms.widget.yml"))
+    for index, entity_id in enumerate(rooms.entity_ids()):
+        if entity_id.startswith("climate."):
+            temperature = 17.0 + index * 0.7 + step * 1.3
+            hass.set_entity(entity_id, "heat", {"current_temperature": temperature})
+        else:
+            hass.set_entity(entity_id, str(35 + index * 3 + step * 7), {})
+
+
+def scatter(frame: bytes, columns: int = 25, rows: int = 16) -> bytes:
+    """Flip a 16x3-pixel block on a columns x rows grid: many far-apart changes."""
+    stride = WIDTH // 8
+    changed = bytearray(frame)
+    for row in range(rows):
+        top = row * HEIGHT // rows + 5
+        for column in range(columns):
+            offset = top * stride + column * stride // columns
+            for y in range(3):
+                changed[offset + y * stride] ^= 0xFF
+                changed[offset + y * stride + 1] ^= 0xFF
+    return bytes(changed)
+
+
+def every_other_row(frame: bytes) -> bytes:
+    """Flip every fourth byte of every other row: the most bands and spans per frame."""
+    stride = WIDTH // 8
+    changed = bytearray(frame)
+    for y in range(0, HEIGHT, 2):
+        for x in range(0, stride, 4):
+            changed[y * stride + x] ^= 0xFF
+    return bytes(changed)
+
+
+def scenarios() -> Dict[str, Tuple[bytes, bytes]]:
+    """(previous, current) frame pairs for each scenario."""
+    base = render_frame()
+    warmer = render_frame(
+        lambda hass: hass.set_entity("weather.home", "rainy", {"temperature": 9.5})
+    )
+    rng = random.Random(1)
+    return {
+        "identical": (base, base),
+        "weather changed": (base, warmer),
+        "full refresh": (
+            render_frame(lambda hass: set_values(hass, 0)),
+            render_frame(lambda hass: set_values(hass, 1)),
+        ),
+        "separated changes": (base, scatter(base)),
+        "every other row": (base, every_other_row(base)),
+        "full inversion": (base, bytes(byte ^ 0xFF for byte in base)),
+        "random noise": (base, rng.randbytes(len(base))),
+    }
+
+
+def time_diff(previous: bytes, current: bytes, repeat: int, rect_overhead: int) -> List[float]:
+    """Time partial_updates() repeat times, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        partial_updates(previous, current, WIDTH, HEIGHT, rect_overhead)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="diffs per scenario")
+    parser.add_argument(
+        "--rect-overhead", type=int, default=DEFAULT_RECT_OVERHEAD, help="bytes per rectangle"
+    )
+    parser.add_argument(
+        "--pi-factor", type=float, default=30.0, help="Pi Zero slowdown vs this machine"
+    )
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="Pi time budget per diff")
+    args = parser.parse_args()
+
+    over = 0
+    for name, (previous, current) in scenarios().items():
+        timings = time_diff(previous, current, args.repeat, args.rect_overhead)
+        updates = partial_updates(previous, current, WIDTH, HEIGHT, args.rect_overhead)
+        mean_ms = sum(timings) / len(timings) * 1000
+        pi_ms = mean_ms * args.pi_factor
+        verdict = "ok" if pi_ms <= args.budget_ms else "OVER"
+        over += verdict == "OVER"
+        rects = ", ".join(str(update.rect) for update in updates[:4])
+        more = f" +{len(updates) - 4}" if len(updates) > 4 else ""
+        print(
+            f"{name:18} mean {mean_ms:7.3f} ms  max {max(timings) * 1000:7.3f} ms  "
+            f"Pi ~{pi_ms:7.1f} ms {verdict:4}  {len(updates)} rect(s) {rects}{more}"
+        )
+    print(
+        f"{over} scenario(s) over the {args.budget_ms:g} ms Pi budget "
+        f"(mean time x {args.pi_factor:g})"
+    )
+
+
+if __name__ == "__main__":
+    main()
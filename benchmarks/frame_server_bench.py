@@ -0,0 +1,88 @@
+"""Load test FrameServer with many screens polling the dashboard frame.
+
+Renders the mock dashboard once, publishes it and lets --clients threads
+poll it over keep-alive connections, --requests times each, the way extra
+screens would: the first request downloads the frame, the rest send
+If-None-Match and get 304. Reports requests/sec, latency and how often
+each format was encoded. --replay renders a HASS recording instead of
+mock data.
+
+    python benchmarks/frame_server_bench.py --clients 20 --requests 200
+"""
+import argparse
+import http.client
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from rendering.frame_server import FrameServer  # noqa: E402
+from rendering.renderer import PILRenderer  # noqa: E402
+from render_bench import build_dashboard, open_hass, seed_states  # noqa: E402
+
+
+def poll(server: FrameServer, path: str, requests: int, latencies: List[float]) -> None:
+    """Fetch path once, then revalidate it requests - 1 times with its ETag."""
+    host, port = server.url.split("//")[1].split(":")
+    connection = http.client.HTTPConnection(host, int(port), timeout=10)
+    etag = None
+    for _ in range(requests):
+        started = time.perf_counter()
+        connection.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        etag = response.getheader("ETag", etag)
+    connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=10, help="concurrent screens")
+    parser.add_argument("--requests", type=int, default=100, help="requests per screen")
+    parser.add_argument("--replay", help="HASS recording to render instead of mock data")
+    args = parser.parse_args()
+
+    hass = open_hass(args.replay)
+    with tempfile.TemporaryDirectory() as tmp, FrameServer() as server:
+        renderer = PILRenderer(size=(800, 480), output_path=str(Path(tmp) / "frame.bmp"))
+        dashboard = build_dashboard(hass, renderer)
+        dashboard.frame_server = server
+        seed_states(hass, dashboard)
+        dashboard.update_all()
+        dashboard.render()
+
+        latencies: List[float] = []
+        paths = ["/frame.png", "/frame.bmp", "/frame.raw"]
+        threads = [
+            threading.Thread(
+                target=poll, args=(server, paths[i % len(paths)], args.requests, latencies)
+            )
+            for i in range(args.clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        print(f"requests     {server.request_count} ({server.not_modified_count} x 304)")
+        print(f"requests/sec {server.request_count / elapsed:.0f}")
+        print(
+            f"latency      p50 {statistics.median(latencies) * 1000:.2f} ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms"
+        )
+        print(f"encoded      {sorted(server.current.encodings)} once each for one render")
+
+
+if __name__ == "__main__":
+    main()
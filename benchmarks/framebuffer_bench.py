@@ -0,0 +1,92 @@
+"""Benchmark turning a dashboard image into the panel's SPI buffers.
+
+Compares the path the display script used (EPD.getbuffer for the black
+and the blank red image, then EPD.display inverting the black bytes back,
+all in Python loops) with FrameBuffer packing both planes in PIL. The
+legacy code is reproduced here because epd7in5b_V2 needs the Pi's GPIO
+and SPI modules to import. Sending the bytes is left out.
+
+    python benchmarks/framebuffer_bench.py --repeat 50
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from rendering.framebuffer import FrameBuffer  # noqa: E402
+
+WIDTH, HEIGHT = 800, 480
+
+
+def legacy_getbuffer(image: Image.Image) -> bytearray:
+    """EPD.getbuffer: pack the image and invert every byte in Python."""
+    buf = bytearray(image.convert("1").tobytes("raw"))
+    for i in range(len(buf)):
+        buf[i] ^= 0xFF
+    return buf
+
+
+def legacy_frame(black: Image.Image, red: Image.Image) -> Tuple[bytes, bytes]:
+    """Bytes EPD.display sent to 0x10 and 0x13 for getbuffer() output."""
+    imageblack = legacy_getbuffer(black)
+    imagered = legacy_getbuffer(red)
+    for i in range(len(imageblack)):
+        imageblack[i] ^= 0xFF
+    return bytes(imageblack), bytes(imagered)
+
+
+def sample_image() -> Image.Image:
+    """An 800x480 frame with some text and shapes on it."""
+    image = Image.new("1", (WIDTH, HEIGHT), 255)
+    draw = ImageDraw.Draw(image)
+    for row in range(0, HEIGHT, 40):
+        draw.text((10, row), "Living room 21.5°C 45 %" * 3, fill=0)
+    draw.rectangle((500, 100, 700, 300), outline=0, width=4)
+    return image
+
+
+def time_calls(call: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="frames per path")
+    args = parser.parse_args()
+
+    image = sample_image()
+    blank = Image.new("1", (WIDTH, HEIGHT), 255)
+    frame = FrameBuffer(WIDTH, HEIGHT)
+
+    expected = legacy_frame(image, blank)
+    packed = (bytes(frame.pack_black(image)), bytes(frame.pack_red(blank)))
+    if packed != expected:
+        sys.exit("FrameBuffer output differs from the legacy buffers")
+
+    paths = {
+        "getbuffer+display": lambda: legacy_frame(image, blank),
+        "framebuffer": lambda: (frame.pack_black(image), frame.pack_red(blank)),
+        "framebuffer, no red": lambda: (frame.pack_black(image), frame.clear_red()),
+    }
+    for name, call in paths.items():
+        timings = time_calls(call, args.repeat)
+        print(
+            f"{name:20} mean {statistics.mean(timings) * 1000:8.3f} ms  "
+            f"max {max(timings) * 1000:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Load test RealHASSClient against the in-process fake Home Assistant.
+
+Builds the dashboard from rooms.widget.yml (plus the weather, forecast and
+sun widgets), points it at a FakeHASSServer with the requested latency,
+jitter, error rate and entity count, and runs update cycles with every
+widget cache disabled. Reports HTTP requests/sec and cycle latency
+percentiles. With --replay the cycles run offline against a recording
+made with src/run_dashboard.py --record, at its recorded response times.
+
+    python benchmarks/load_test.py --cycles 200 --latency 0.02 --jitter 0.01
+    python benchmarks/load_test.py --cycles 50 --replay hass.jsonl.gz
+"""
+import argparse
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from components.rooms_widget import RoomsWidget  # noqa: E402
+from components.sun_widget import SunWidget  # noqa: E402
+from components.weather_forecast_widget import WeatherForecastWidget  # noqa: E402
+from components.weather_widget import WeatherWidget  # noqa: E402
+from core.testing.fake_hass_server import FakeHASSServer  # noqa: E402
+from core.hass_client import HASSClient, RealHASSClient  # noqa: E402
+from core.recording_client import ReplayHASSClient  # noqa: E402
+from dashboard import Dashboard  # noqa: E402
+from rendering.renderer import PILRenderer  # noqa: E402
+from run_dashboard import FORECAST_DEVICE_ID  # noqa: E402
+
+FORECAST = [
+    {"datetime": f"2025-11-01T{hour:02d}:00:00+00:00", "condition": "cloudy", "temperature": 12.0}
+    for hour in range(24)
+]
+
+
+@dataclass
+class LoadTestResult:
+    """Summary of one load test run."""
+
+    cycles: int
+    requests: int
+    errors: int
+    elapsed: float
+    cycle_times: List[float]
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Cycle latency percentile in seconds (nearest rank)."""
+        ordered = sorted(self.cycle_times)
+        index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+        return ordered[index]
+
+    def report(self) -> str:
+        return "\n".join(
+            [
+                f"cycles:        {self.cycles}",
+                f"requests:      {self.requests} ({self.errors} injected errors)",
+                f"requests/sec:  {self.requests_per_second:.1f}",
+                f"cycle mean:    {statistics.mean(self.cycle_times) * 1000:.2f} ms",
+                f"cycle p50:     {self.percentile(0.50) * 1000:.2f} ms",
+                f"cycle p99:     {self.percentile(0.99) * 1000:.2f} ms",
+            ]
+        )
+
+
+def build_dashboard(client: HASSClient, config_path: str) -> Dashboard:
+    """Dashboard with the production widget set and caching disabled."""
+    renderer = PILRenderer(size=(800, 480))
+    dashboard = Dashboard(renderer)
+    dashboard.add_widget(WeatherWidget(client, renderer, cache_ttl=0))
+    dashboard.add_widget(
+        WeatherForecastWidget(client, renderer, device_id=FORECAST_DEVICE_ID, cache_ttl=0)
+    )
+    dashboard.add_widget(SunWidget(client, renderer, cache_ttl=0))
+    dashboard.add_widget(RoomsWidget(client, renderer, config_path=config_path, cache_ttl=0))
+    return dashboard
+
+
+def seed_states(server: FakeHASSServer, dashboard: Dashboard) -> None:
+    """Serve a plausible state for every entity the dashboard reads."""
+    server.set_forecast(FORECAST)
+    server.set_state(
+        "weather.home", "cloudy", {"temperature": 12.5, "humidity": 80, "wind_speed": 4.2}
+    )
+    server.set_state(
+        "sun.sun",
+        "above_horizon",
+        {"next_rising": "2025-11-02T06:23:08+00:00", "next_setting": "2025-11-01T16:02:11+00:00"},
+    )
+    for entity_id in dashboard.entity_ids():
+        if entity_id.startswith("climate."):
+            server.set_state(entity_id, "heat", {"current_temperature": 21.5})
+        elif entity_id.startswith("sensor."):
+            server.set_state(entity_id, "45", {"unit_of_measurement": "%"})
+
+
+def run_cycles(dashboard: Dashboard, cycles: int) -> List[float]:
+    """Run update cycles; returns each cycle's duration in seconds."""
+    cycle_times = []
+    for _ in range(cycles):
+        cycle_start = time.perf_counter()
+        dashboard.update_all()
+        cycle_times.append(time.perf_counter() - cycle_start)
+    return cycle_times
+
+
+def run_replay_test(
+    replay: str,
+    cycles: int = 100,
+    latency_scale: float = 1.0,
+    config_path: str = str(ROOT / "rooms.widget.yml"),
+) -> LoadTestResult:
+    """Run dashboard update cycles against a recording, with its response times."""
+    client = ReplayHASSClient(replay, replay_latency=True, latency_scale=latency_scale)
+    dashboard = build_dashboard(client, config_path)
+    started = time.perf_counter()
+    cycle_times = run_cycles(dashboard, cycles)
+    return LoadTestResult(
+        cycles=cycles,
+        requests=client.request_count,
+        errors=0,
+        elapsed=time.perf_counter() - started,
+        cycle_times=cycle_times,
+    )
+
+
+def run_load_test(
+    cycles: int = 100,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    entity_count: int = 0,
+    pool_maxsize: int = 4,
+    config_path: str = str(ROOT / "rooms.widget.yml"),
+    seed: int = 1,
+) -> LoadTestResult:
+    """Run dashboard update cycles against a fake Home Assistant."""
+    with FakeHASSServer(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        entity_count=entity_count,
+        seed=seed,
+    ) as server:
+        # No retries or breaker trips: measure raw request behaviour.
+        client = RealHASSClient(server.url, "token", pool_maxsize=pool_maxsize, max_retries=0)
+        client.breaker.failure_threshold = cycles * 10
+        dashboard = build_dashboard(client, config_path)
+        seed_states(server, dashboard)
+
+        with client:
+            started = time.perf_counter()
+            cycle_times = run_cycles(dashboard, cycles)
+            elapsed = time.perf_counter() - started
+
+        return LoadTestResult(
+            cycles=cycles,
+            requests=server.request_count,
+            errors=server.error_count,
+            elapsed=elapsed,
+            cycle_times=cycle_times,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=100, help="dashboard update cycles")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="max delay deviation (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500s")
+    parser.add_argument("--entities", type=int, default=0, help="filler entities served")
+    parser.add_argument("--pool", type=int, default=4, help="HTTP connection pool size")
+    parser.add_argument("--config", default=str(ROOT / "rooms.widget.yml"), help="rooms config")
+    parser.add_argument("--replay", help="HASS recording to replay instead of the fake server")
+    parser.add_argument(
+        "--latency-scale", type=float, default=1.0, help="factor on replayed response times"
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        result = run_replay_test(args.replay, args.cycles, args.latency_scale, args.config)
+        print(result.report())
+        return
+
+    result = run_load_test(
+        cycles=args.cycles,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        entity_count=args.entities,
+        pool_maxsize=args.pool,
+        config_path=args.config,
+    )
+    print(result.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark rendering the full dashboard with PILRenderer.
+
+Builds the production widget set (weather, forecast, sun and the
+rooms.widget.yml rooms) on mock data and times the render pass
+(renderer.clear(), every widget's render() and getting the finished
+image) frame after frame, with the data changing a little between frames
+the way a live dashboard does. Writing the BMP is left out. With
+--replay the data comes from a recording made with
+src/run_dashboard.py --record, refreshed every tenth frame.
+
+    python benchmarks/render_bench.py --frames 200
+    python benchmarks/render_bench.py --replay hass.jsonl.gz
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from components.rooms_widget import RoomsWidget  # noqa: E402
+from components.sun_widget import SunWidget  # noqa: E402
+from components.weather_forecast_widget import WeatherForecastWidget  # noqa: E402
+from components.weather_widget import WeatherWidget  # noqa: E402
+from core.hass_client import HASSClient  # noqa: E402
+from core.hass_mock import MockHASSClient  # noqa: E402
+from core.recording_client import ReplayHASSClient  # noqa: E402
+from dashboard import Dashboard  # noqa: E402
+from rendering.layers import LayeredPILRenderer  # noqa: E402
+from rendering.renderer import PILRenderer  # noqa: E402
+from run_dashboard import FORECAST_DEVICE_ID  # noqa: E402
+
+FORECAST = [
+    {"datetime": f"2025-11-01T{hour:02d}:00:00+00:00", "condition": "rainy", "temperature": 9.0}
+    for hour in range(24)
+]
+
+
+def build_dashboard(hass: HASSClient, renderer: PILRenderer) -> Dashboard:
+    """Dashboard with the production widget set and caching disabled."""
+    dashboard = Dashboard(renderer)
+    dashboard.add_widget(WeatherWidget(hass, renderer, cache_ttl=0))
+    dashboard.add_widget(
+        WeatherForecastWidget(hass, renderer, device_id=FORECAST_DEVICE_ID, cache_ttl=0)
+    )
+    dashboard.add_widget(SunWidget(hass, renderer, cache_ttl=0))
+    dashboard.add_widget(
+        RoomsWidget(hass, renderer, config_path=str(ROOT / "rooms.widget.yml"), cache_ttl=0)
+    )
+    return dashboard
+
+
+def open_hass(replay: Optional[str] = None) -> HASSClient:
+    """Client serving a recording, or a mock client (to be seeded with seed_states)."""
+    if replay is not None:
+        return ReplayHASSClient(replay)
+    return MockHASSClient()
+
+
+def seed_states(hass: HASSClient, dashboard: Dashboard) -> None:
+    """Serve a reading for every room entity the dashboard reads (mock clients only)."""
+    if not isinstance(hass, MockHASSClient):
+        return
+    hass.set_forecast(FORECAST)
+    for entity_id in dashboard.entity_ids():
+        if entity_id.startswith("climate."):
+            hass.set_entity(entity_id, "heat", {"current_temperature": 21.5})
+        elif entity_id.startswith("sensor."):
+            hass.set_entity(entity_id, "45", {"unit_of_measurement": "%"})
+
+
+def render_frames(frames: int, replay: Optional[str] = None, **renderer_options) -> List[float]:
+    """Time the render pass of frames consecutive dashboard frames, in seconds.
+
+    Every tenth frame the data is refreshed (on mock data the outdoor
+    temperature changes), so text that changes now and then is part of the
+    workload.
+    """
+    hass = open_hass(replay)
+    if renderer_options.pop("layered", False):
+        renderer = LayeredPILRenderer(size=(800, 480), **renderer_options)
+    else:
+        renderer = PILRenderer(size=(800, 480), **renderer_options)
+    dashboard = build_dashboard(hass, renderer)
+    seed_states(hass, dashboard)
+
+    timings = []
+    for frame in range(frames):
+        if frame % 10 == 0:
+            if isinstance(hass, MockHASSClient):
+                hass.set_entity("weather.home", "cloudy", {"temperature": 10 + frame % 7})
+            dashboard.update_all()
+
+        started = time.perf_counter()
+        renderer.clear()
+        for index, widget in enumerate(dashboard.widgets):
+            renderer.begin_widget(str(index))
+            widget.render()
+        renderer.get_image()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def configurations() -> Dict[str, dict]:
+    """Renderer options per benchmarked configuration."""
+    return {
+        "no text cache": {"text_cache_bytes": 0},
+        "text cache": {},
+        "retained": {"retained": True},
+        "layered": {"layered": True},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100, help="frames per configuration")
+    parser.add_argument("--replay", help="HASS recording to render instead of mock data")
+    args = parser.parse_args()
+
+    for name, options in configurations().items():
+        timings = render_frames(args.frames, replay=args.replay, **options)
+        print(
+            f"{name:16} mean {statistics.mean(timings) * 1000:7.3f} ms  "
+            f"p50 {statistics.median(timings) * 1000:7.3f} ms  "
+            f"max {max(timings) * 1000:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
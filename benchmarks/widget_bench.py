@@ -0,0 +1,75 @@
+"""Benchmark each widget's render() apart from rasterization.
+
+Builds the production widget set on mock data (see render_bench.py) and
+times every widget's render() three ways: against NullRenderer (the
+widget's own logic only), against PILRenderer (logic plus Pillow), and
+through a RecordingRenderer wrapping a PILRenderer, which splits the
+Pillow time out per call. --replay uses a HASS recording instead of mock
+data.
+
+    python benchmarks/widget_bench.py --frames 200
+    python benchmarks/widget_bench.py --replay hass.jsonl.gz
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from rendering.recording import NullRenderer, RecordingRenderer  # noqa: E402
+from rendering.renderer import PILRenderer, Renderer  # noqa: E402
+from render_bench import build_dashboard, open_hass, seed_states  # noqa: E402
+
+
+def time_widgets(
+    renderer: Renderer, frames: int, replay: Optional[str] = None
+) -> Dict[str, List[float]]:
+    """Seconds each widget's render() took per frame, keyed by widget class."""
+    hass = open_hass(replay)
+    dashboard = build_dashboard(hass, renderer)
+    seed_states(hass, dashboard)
+    dashboard.update_all()
+
+    timings: Dict[str, List[float]] = {type(w).__name__: [] for w in dashboard.widgets}
+    for _ in range(frames):
+        renderer.clear()
+        for widget in dashboard.widgets:
+            name = type(widget).__name__
+            renderer.begin_widget(name)
+            started = time.perf_counter()
+            widget.render()
+            timings[name].append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100, help="frames per renderer")
+    parser.add_argument("--replay", help="HASS recording to render instead of mock data")
+    args = parser.parse_args()
+
+    logic = time_widgets(NullRenderer(), args.frames, args.replay)
+    full = time_widgets(PILRenderer(size=(800, 480)), args.frames, args.replay)
+    recorder = RecordingRenderer(PILRenderer(size=(800, 480)))
+    time_widgets(recorder, args.frames, args.replay)
+    pillow = recorder.time_by_widget()
+    calls = recorder.calls_by_widget()
+
+    print(f"{'widget':24} {'logic':>10} {'with PIL':>10} {'PIL calls':>10} {'draws':>6}")
+    for name in logic:
+        print(
+            f"{name:24} "
+            f"{statistics.mean(logic[name]) * 1e6:8.1f}us "
+            f"{statistics.mean(full[name]) * 1e6:8.1f}us "
+            f"{pillow.get(name, 0.0) / args.frames * 1e6:8.1f}us "
+            f"{calls.get(name, 0) // args.frames:6d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
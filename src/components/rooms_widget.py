@@ -1,10 +1,14 @@
 """Rooms widget component."""
+import time
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from components.widget import Widget
-from core.hass_client import HASSClient
+from core.async_hass_client import AnyHASSClient, AsyncHASSClient
+from core.hass_client import Entity
+from core.history import HistoryBuffer, HistoryPoint, window_start
 from rendering.renderer import Renderer
 import yaml
 
@@ -27,6 +31,8 @@ class Room:
     humidity: Optional[float] = None
     climate_position: Optional[Tuple[int, int]] = None
     humidity_position: Optional[Tuple[int, int]] = None
+    temperature_history: Optional[HistoryBuffer] = None
+    humidity_history: Optional[HistoryBuffer] = None
 
 
 class RoomsWidget(Widget):
@@ -34,10 +40,13 @@ class RoomsWidget(Widget):
 
     def __init__(
         self,
-        hass_client: HASSClient,
+        hass_client: AnyHASSClient,
         renderer: Renderer,
         config_path: Optional[str] = None,
-        cache_ttl: int = 60
+        cache_ttl: int = 60,
+        fan_out: bool = False,
+        history_hours: Optional[float] = None,
+        history_points: int = 96,
     ):
         """Initialize rooms widget.
         
@@ -46,11 +55,24 @@ class RoomsWidget(Widget):
             renderer: Rendering backend
             config_path: Path to rooms.yml configuration file
             cache_ttl: Cache time-to-live in seconds (default: 60 = 1 min)
+            fan_out: Fetch each room's entities as a separate request on the
+                dashboard's thread pool instead of one bulk request (for
+                clients without a cheap bulk lookup)
+            history_hours: Keep this many hours of temperature and humidity
+                history per room (None = no history)
+            history_points: Samples kept per entity across history_hours
         """
         super().__init__(hass_client, renderer, cache_ttl=cache_ttl)
         self.config_path = config_path or "rooms.widget.yml"
+        self.fan_out = fan_out
         self.rooms: List[Room] = []
         self._room_config: Dict[str, Any] = {}
+        self.history_hours = history_hours
+        self.history_points = history_points
+        # entity ID -> samples, filled incrementally from the newest timestamp
+        self._histories: Dict[str, HistoryBuffer] = {}
+        # entity ID -> time its history was last known to be complete
+        self._history_checked: Dict[str, float] = {}
 
     def _resolve_config_path(self) -> Path:
         """Resolve the rooms config path from CWD or the repository root."""
@@ -131,36 +153,241 @@ class RoomsWidget(Widget):
         except Exception as e:
             print(f"Error loading room config: {e}")
 
-    def _fetch_data(self) -> None:
-        """Fetch room data from HASS."""
+    def _room_entity_configs(
+        self,
+    ) -> List[Tuple[str, Dict[str, Any], Optional[EntityConfig], Optional[EntityConfig]]]:
+        """Get (key, config, climate, humidity) for every configured room."""
         if not self._room_config:
             self._load_config()
 
-        self.rooms = []
-
+        configs = []
         for room_key, room_config in self._room_config.items():
             if not isinstance(room_config, dict):
                 continue
 
+            configs.append(
+                (
+                    str(room_key),
+                    room_config,
+                    self._parse_entity_config(room_config.get("climate")),
+                    self._parse_entity_config(room_config.get("humidity")),
+                )
+            )
+
+        return configs
+
+    def entity_ids(self) -> List[str]:
+        """Get all climate and humidity entities referenced by the rooms config."""
+        entity_ids: List[str] = []
+        for _, _, climate_config, humidity_config in self._room_entity_configs():
+            for entity_config in (climate_config, humidity_config):
+                if entity_config and entity_config.entity_id not in entity_ids:
+                    entity_ids.append(entity_config.entity_id)
+
+        return entity_ids
+
+    def _fans_out(self) -> bool:
+        """Check whether rooms are fetched as separate requests on the shared pool."""
+        return self.fan_out and self.executor is not None
+
+    def prefetch_entity_ids(self) -> List[str]:
+        """Get the entities for the dashboard's prefetch (none when fanning out)."""
+        return [] if self._fans_out() else self.entity_ids()
+
+    def _room_entity_id_groups(self) -> List[List[str]]:
+        """Get the entity IDs of each room, one list per room."""
+        groups = []
+        for _, _, climate_config, humidity_config in self._room_entity_configs():
+            entity_ids = [
+                entity_config.entity_id
+                for entity_config in (climate_config, humidity_config)
+                if entity_config
+            ]
+            if entity_ids:
+                groups.append(entity_ids)
+        return groups
+
+    def _history_batches(self) -> List[Tuple[Optional[str], List[str]]]:
+        """Get (attribute, entity IDs) for each history request.
+
+        Climate entities report the temperature as an attribute, humidity
+        sensors as their state, so each kind needs its own request.
+        """
+        climate_ids: List[str] = []
+        humidity_ids: List[str] = []
+        for _, _, climate_config, humidity_config in self._room_entity_configs():
+            if climate_config and climate_config.entity_id not in climate_ids:
+                climate_ids.append(climate_config.entity_id)
+            if humidity_config and humidity_config.entity_id not in humidity_ids:
+                humidity_ids.append(humidity_config.entity_id)
+
+        return [
+            (attribute, entity_ids)
+            for attribute, entity_ids in (
+                ("current_temperature", climate_ids),
+                (None, humidity_ids),
+            )
+            if entity_ids
+        ]
+
+    def _history_requests(self, entity_ids: List[str]) -> List[Tuple[datetime, List[str]]]:
+        """Split a batch of entities into (start, entity IDs) history requests.
+
+        Each entity's history is complete up to its newest sample or the last
+        request that returned it, whichever is later. Entities seen before
+        are requested together from the oldest of those cursors; entities
+        never seen yet need the full window and get a request of their own,
+        so a new or unknown entity does not drag the whole batch back to the
+        start of the window.
+        """
+        seen: List[str] = []
+        unseen: List[str] = []
+        cursors = []
+        for entity_id in entity_ids:
+            checked = self._history_checked.get(entity_id)
+            if checked is None:
+                unseen.append(entity_id)
+                continue
+            last = self._histories[entity_id].last_timestamp
+            cursors.append(checked if last is None else max(last, checked))
+            seen.append(entity_id)
+
+        requests = []
+        if seen:
+            requests.append((datetime.fromtimestamp(min(cursors), timezone.utc), seen))
+        if unseen:
+            requests.append((window_start(self.history_hours), unseen))
+        return requests
+
+    def _apply_history(
+        self,
+        entity_ids: List[str],
+        history: Dict[str, List[HistoryPoint]],
+        requested_at: float,
+    ) -> None:
+        """Downsample fetched history into each entity's ring buffer."""
+        window = self.history_hours * 3600
+        for entity_id in entity_ids:
+            buffer = self._histories.get(entity_id)
+            if buffer is None:
+                buffer = self._histories[entity_id] = HistoryBuffer(self.history_points)
+            # Entities missing from the response (failed request, unknown
+            # entity) are requested from the same point again next time.
+            if entity_id in history:
+                buffer.extend_downsampled(history[entity_id], window)
+                self._history_checked[entity_id] = requested_at
+
+    def _fetch_history(self) -> None:
+        """Refresh every room's history buffers (one request per batch and cursor group)."""
+        for attribute, batch in self._history_batches():
+            for since, entity_ids in self._history_requests(batch):
+                requested_at = time.time()
+                history = self.hass_client.get_history(entity_ids, since, attribute=attribute)
+                self._apply_history(entity_ids, history, requested_at)
+
+    def _fetch_data(self) -> bool:
+        """Fetch room data from HASS with a single bulk state lookup, or per room."""
+        if self.history_hours:
+            self._fetch_history()
+
+        if self._fans_out():
+            entities: Dict[str, Entity] = {}
+            for room_entities in self._fan_out(
+                self.hass_client.get_entities, self._room_entity_id_groups()
+            ):
+                entities.update(room_entities)
+            return self._apply_entities(entities)
+
+        return self._apply_entities(self._get_entities(self.entity_ids()))
+
+    async def _fetch_data_async(self) -> Optional[bool]:
+        """Fetch room data from an async HASS client."""
+        if not isinstance(self.hass_client, AsyncHASSClient):
+            return await super()._fetch_data_async()
+
+        if self.history_hours:
+            for attribute, batch in self._history_batches():
+                for since, history_ids in self._history_requests(batch):
+                    requested_at = time.time()
+                    history = await self.hass_client.get_history(
+                        history_ids, since, attribute=attribute
+                    )
+                    self._apply_history(history_ids, history, requested_at)
+
+        return self._apply_entities(await self._get_entities_async(self.entity_ids()))
+
+    def _apply_entities(self, entities: Dict[str, Entity]) -> bool:
+        """Rebuild the room list from fetched entity states.
+
+        Returns:
+            False if none of the rooms' entities were returned (the room list
+            is then left as it was)
+        """
+        if not entities and self.entity_ids():
+            return False
+
+        room_configs = self._room_entity_configs()
+
+        # Built aside and swapped in at once, so a render on another thread
+        # never sees a half-built room list.
+        rooms: List[Room] = []
+        for room_key, room_config, climate_config, humidity_config in room_configs:
             room = Room(
-                key=str(room_key),
+                key=room_key,
                 name=str(room_config.get("name", room_key)),
             )
 
-            climate_config = self._parse_entity_config(room_config.get("climate"))
-            humidity_config = self._parse_entity_config(room_config.get("humidity"))
-
             if climate_config:
                 room.climate_position = climate_config.position
-                temp_entity = self.hass_client.get_entity(climate_config.entity_id)
+                temp_entity = entities.get(climate_config.entity_id)
                 room.temperature = self._extract_float(temp_entity, "current_temperature")
+                room.temperature_history = self._histories.get(climate_config.entity_id)
 
             if humidity_config:
                 room.humidity_position = humidity_config.position
-                humid_entity = self.hass_client.get_entity(humidity_config.entity_id)
+                humid_entity = entities.get(humidity_config.entity_id)
                 room.humidity = self._extract_float(humid_entity)
+                room.humidity_history = self._histories.get(humidity_config.entity_id)
+
+            rooms.append(room)
 
-            self.rooms.append(room)
+        self.rooms = rooms
+        return True
+
+    def to_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Get room readings and positions for the dashboard snapshot, one row per room."""
+        if not self.rooms:
+            return None
+        return {
+            "rooms": [
+                [
+                    room.key,
+                    room.name,
+                    room.temperature,
+                    room.humidity,
+                    room.climate_position,
+                    room.humidity_position,
+                ]
+                for room in self.rooms
+            ]
+        }
+
+    def _restore_snapshot(self, data: Dict[str, Any]) -> None:
+        # Positions are stored with the readings so a restore does not need
+        # to parse the YAML config.
+        self.rooms = [
+            Room(
+                key=key,
+                name=name,
+                temperature=temperature,
+                humidity=humidity,
+                climate_position=tuple(climate_position) if climate_position else None,
+                humidity_position=tuple(humidity_position) if humidity_position else None,
+            )
+            for key, name, temperature, humidity, climate_position, humidity_position in (
+                data.get("rooms") or []
+            )
+        ]
 
     def render(self) -> None:
         """Render rooms widget."""
@@ -1,15 +1,18 @@
 """Sun widget component."""
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from components.widget import Widget
-from core.hass_client import HASSClient
+from core.async_hass_client import AnyHASSClient, AsyncHASSClient
+from core.hass_client import Entity
 from rendering.renderer import Renderer
 
 
 class SunWidget(Widget):
     """Self-contained sun widget that fetches and renders sun/sunrise/sunset data."""
 
-    def __init__(self, hass_client: HASSClient, renderer: Renderer, cache_ttl: int = 300):
+    STALE_MARKER_POSITION = (105, 425)
+
+    def __init__(self, hass_client: AnyHASSClient, renderer: Renderer, cache_ttl: int = 300):
         """Initialize sun widget.
         
         Args:
@@ -22,31 +25,74 @@ class SunWidget(Widget):
         self.sunset: Optional[datetime] = None
         self.is_night: bool = False
 
-    def _fetch_data(self) -> None:
+    def entity_ids(self) -> List[str]:
+        """Get the sun entity read by this widget."""
+        return ["sun.sun"]
+
+    def _fetch_data(self) -> bool:
         """Fetch sun data from HASS."""
-        sun_entity = self.hass_client.get_entity("sun.sun")
+        return self._apply_entities(self._get_entities(self.entity_ids()))
+
+    async def _fetch_data_async(self) -> Optional[bool]:
+        """Fetch sun data from an async HASS client."""
+        if not isinstance(self.hass_client, AsyncHASSClient):
+            return await super()._fetch_data_async()
+
+        return self._apply_entities(await self._get_entities_async(self.entity_ids()))
+
+    def _apply_entities(self, entities: Dict[str, Entity]) -> bool:
+        """Update sunrise/sunset from fetched entity states.
+
+        Returns:
+            False if the sun entity was missing or unparsable
+        """
+        sun_entity = entities.get("sun.sun")
         if not sun_entity:
-            return
+            return False
 
         attrs = sun_entity.attributes
 
         # Parse sunrise/sunset times
         from localize import local_dt_from_utc_str
 
+        sunrise, sunset, is_night = self.sunrise, self.sunset, self.is_night
         try:
             rising_str = attrs.get("next_rising")
             setting_str = attrs.get("next_setting")
 
             if rising_str:
-                self.sunrise = local_dt_from_utc_str(rising_str)
+                sunrise = local_dt_from_utc_str(rising_str)
             if setting_str:
-                self.sunset = local_dt_from_utc_str(setting_str)
+                sunset = local_dt_from_utc_str(setting_str)
 
             # Simple night detection: if next rising is after next setting, it's night
-            if self.sunrise and self.sunset:
-                self.is_night = self.sunrise > self.sunset
+            if sunrise and sunset:
+                is_night = sunrise > sunset
         except Exception as e:
             print(f"Error parsing sun data: {e}")
+            return False
+
+        # Assigned together so a concurrent render sees one consistent state.
+        self.sunrise, self.sunset, self.is_night = sunrise, sunset, is_night
+        return True
+
+    def to_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Get sunrise/sunset for the dashboard snapshot."""
+        if self.sunrise is None and self.sunset is None:
+            return None
+        return {
+            "sunrise": self.sunrise.isoformat() if self.sunrise else None,
+            "sunset": self.sunset.isoformat() if self.sunset else None,
+            "is_night": self.is_night,
+        }
+
+    def _restore_snapshot(self, data: Dict[str, Any]) -> None:
+        sunrise, sunset = data.get("sunrise"), data.get("sunset")
+        self.sunrise, self.sunset, self.is_night = (
+            datetime.fromisoformat(sunrise) if sunrise else None,
+            datetime.fromisoformat(sunset) if sunset else None,
+            bool(data.get("is_night")),
+        )
 
     def render(self) -> None:
         """Render sun widget."""
@@ -1,11 +1,11 @@
 """Weather forecast widget component."""
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from components.weather_icons import get_icon_for_condition
 from components.widget import Widget
-from core.hass_client import HASSClient
+from core.async_hass_client import AnyHASSClient, AsyncHASSClient
 from localize import local_dt_from_utc_str
 from rendering.renderer import Renderer
 
@@ -23,9 +23,11 @@ class WeatherForecastItem:
 class WeatherForecastWidget(Widget):
     """Self-contained widget for rendering a compact hourly forecast strip."""
 
+    STALE_MARKER_POSITION = (45, 122)
+
     def __init__(
         self,
-        hass_client: HASSClient,
+        hass_client: AnyHASSClient,
         renderer: Renderer,
         device_id: str,
         forecast_type: str = "hourly",
@@ -85,19 +87,68 @@ class WeatherForecastWidget(Widget):
         )
         return item
 
-    def _fetch_data(self) -> None:
-        forecast_data = self.hass_client.get_forecast(
-            device_id=self.device_id,
-            forecast_type=self.forecast_type,
+    def _fetch_data(self) -> bool:
+        return self._apply_forecast(
+            self.hass_client.get_forecast(
+                device_id=self.device_id,
+                forecast_type=self.forecast_type,
+            )
+        )
+
+    async def _fetch_data_async(self) -> Optional[bool]:
+        if not isinstance(self.hass_client, AsyncHASSClient):
+            return await super()._fetch_data_async()
+
+        return self._apply_forecast(
+            await self.hass_client.get_forecast(
+                device_id=self.device_id,
+                forecast_type=self.forecast_type,
+            )
         )
 
+    def _apply_forecast(self, forecast_data: list) -> bool:
+        """Replace the forecast items, unless the fetch returned none.
+
+        Returns:
+            False if there were no usable forecast entries
+        """
         normalized: List[WeatherForecastItem] = []
         for raw in forecast_data or []:
             item = self._normalize_item(raw)
             if item is not None:
                 normalized.append(item)
 
+        if not normalized:
+            return False
         self.items = normalized
+        return True
+
+    def to_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Get forecast items for the dashboard snapshot, one compact row each."""
+        if not self.items:
+            return None
+        return {
+            "items": [
+                [
+                    item.time.isoformat() if item.time else None,
+                    item.temperature,
+                    item.condition,
+                    item.condition_icon,
+                ]
+                for item in self.items
+            ]
+        }
+
+    def _restore_snapshot(self, data: Dict[str, Any]) -> None:
+        self.items = [
+            WeatherForecastItem(
+                time=datetime.fromisoformat(time) if time else None,
+                temperature=temperature,
+                condition=condition,
+                condition_icon=condition_icon,
+            )
+            for time, temperature, condition, condition_icon in data.get("items") or []
+        ]
 
     def get_items(self) -> List[WeatherForecastItem]:
         """Get sampled forecast items for display.
@@ -1,7 +1,8 @@
 """Weather widget component."""
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from components.widget import Widget
-from core.hass_client import HASSClient
+from core.async_hass_client import AnyHASSClient, AsyncHASSClient
+from core.hass_client import Entity
 from rendering.renderer import Renderer
 from components.weather_icons import get_icon_for_condition
 
@@ -9,9 +10,11 @@ from components.weather_icons import get_icon_for_condition
 class WeatherWidget(Widget):
     """Self-contained weather widget that fetches and renders weather data."""
 
+    STALE_MARKER_POSITION = (200, 20)
+
     def __init__(
         self,
-        hass_client: HASSClient,
+        hass_client: AnyHASSClient,
         renderer: Renderer,
         device_id: str = "",
         cache_ttl: int = 300
@@ -28,18 +31,49 @@ class WeatherWidget(Widget):
         self.device_id = device_id
         self.current_weather: Optional[Dict[str, Any]] = None
 
-    def _fetch_data(self) -> None:
+    def entity_ids(self) -> List[str]:
+        """Get the weather entity read by this widget."""
+        return ["weather.home"]
+
+    def _fetch_data(self) -> bool:
         """Fetch weather data from HASS."""
+        return self._apply_entities(self._get_entities(self.entity_ids()))
+
+    async def _fetch_data_async(self) -> Optional[bool]:
+        """Fetch weather data from an async HASS client."""
+        if not isinstance(self.hass_client, AsyncHASSClient):
+            return await super()._fetch_data_async()
+
+        return self._apply_entities(await self._get_entities_async(self.entity_ids()))
+
+    def _apply_entities(self, entities: Dict[str, Entity]) -> bool:
+        """Update current weather from fetched entity states.
+
+        Returns:
+            False if the weather entity was missing
+        """
         # Get current weather
-        weather_entity = self.hass_client.get_entity("weather.home")
-        if weather_entity:
-            condition = weather_entity.attributes.get("condition", "")
-            self.current_weather = {
-                "temperature": weather_entity.attributes.get("temperature"),
-                "humidity": weather_entity.attributes.get("humidity"),
-                "condition": condition,
-                "condition_icon": get_icon_for_condition(str(condition)) or "",
-            }
+        weather_entity = entities.get("weather.home")
+        if not weather_entity:
+            return False
+
+        condition = weather_entity.attributes.get("condition", "")
+        self.current_weather = {
+            "temperature": weather_entity.attributes.get("temperature"),
+            "humidity": weather_entity.attributes.get("humidity"),
+            "condition": condition,
+            "condition_icon": get_icon_for_condition(str(condition)) or "",
+        }
+        return True
+
+    def to_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Get current weather for the dashboard snapshot."""
+        if not self.current_weather:
+            return None
+        return {"current_weather": self.current_weather}
+
+    def _restore_snapshot(self, data: Dict[str, Any]) -> None:
+        self.current_weather = data.get("current_weather")
 
     def render(self) -> None:
         """Render weather widget."""
@@ -1,10 +1,16 @@
 """Base widget class for dashboard components."""
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 from datetime import datetime
-from core.hass_client import HASSClient
+from core.async_hass_client import AnyHASSClient
+from core.hass_client import Entity
 from rendering.renderer import Renderer
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class Widget(ABC):
     """Abstract base class for dashboard components.
@@ -15,24 +21,44 @@ class Widget(ABC):
     - Knows how to render itself to a drawing context
     """
 
+    # Where render_stale_marker() notes that the widget's data is stale
+    # (None = rely on the dashboard-wide marker).
+    STALE_MARKER_POSITION: Optional[Tuple[int, int]] = None
+
     def __init__(
         self,
-        hass_client: HASSClient,
+        hass_client: AnyHASSClient,
         renderer: Renderer,
-        cache_ttl: Optional[int] = None
+        cache_ttl: Optional[int] = None,
+        fetch_timeout: Optional[float] = None,
     ):
         """Initialize widget.
         
         Args:
-            hass_client: Home Assistant client instance
+            hass_client: Home Assistant client instance (sync or async)
             renderer: Rendering backend (PIL, hardware, etc.)
             cache_ttl: Cache time-to-live in seconds (None = no expiry)
+            fetch_timeout: Seconds an async update may take (None = dashboard default)
         """
         self.hass_client = hass_client
         self.renderer = renderer
         self.cache_ttl = cache_ttl
+        self.fetch_timeout = fetch_timeout
         self._last_update: Optional[datetime] = None
         self._data = {}
+        # True while the widget shows data that is not from its latest
+        # update: restored from a snapshot, or its fetch missed the deadline.
+        self.stale = False
+        # Worker pool shared with the dashboard in threaded mode (see _fan_out).
+        self.executor: Optional[Executor] = None
+        self.stale_marker_position = self.STALE_MARKER_POSITION
+        # Entity states the dashboard fetched for the running update (see update()).
+        self._prefetched: Optional[Dict[str, Entity]] = None
+
+    @property
+    def last_update(self) -> Optional[datetime]:
+        """When the widget's data was last fetched (None = never)."""
+        return self._last_update
 
     def needs_update(self) -> bool:
         """Check if data needs to be refreshed from HASS."""
@@ -45,24 +71,149 @@ class Widget(ABC):
         elapsed = (datetime.now() - self._last_update).total_seconds()
         return elapsed > self.cache_ttl
 
-    def update(self) -> None:
-        """Fetch fresh data from HASS."""
+    def update(self, entities: Optional[Dict[str, Entity]] = None) -> None:
+        """Fetch fresh data from HASS.
+
+        A fetch that returned nothing leaves the widget as it was: it keeps
+        showing its previous (possibly stale) data and is retried next update.
+
+        Args:
+            entities: Entity states the dashboard already fetched this cycle;
+                the widget reads its entities from them instead of asking HASS
+        """
         if not self.needs_update():
             return
 
-        self._fetch_data()
+        self._prefetched = entities
+        try:
+            fetched = self._fetch_data()
+        finally:
+            self._prefetched = None
+        if fetched is False:
+            return
         self._last_update = datetime.now()
+        self.stale = False
+
+    async def update_async(self, entities: Optional[Dict[str, Entity]] = None) -> None:
+        """Fetch fresh data from HASS without blocking the event loop.
+
+        Args:
+            entities: Entity states the dashboard already fetched this cycle
+        """
+        if not self.needs_update():
+            return
+
+        self._prefetched = entities
+        try:
+            fetched = await self._fetch_data_async()
+        finally:
+            self._prefetched = None
+        if fetched is False:
+            return
+        self._last_update = datetime.now()
+        self.stale = False
+
+    def entity_ids(self) -> List[str]:
+        """Get the HASS entity IDs this widget reads.
+
+        Widgets fetch these together through HASSClient.get_entities, so one
+        update costs one request regardless of how many entities it shows.
+        """
+        return []
+
+    def prefetch_entity_ids(self) -> List[str]:
+        """Get the entity IDs the dashboard should fetch for this widget.
+
+        The dashboard collects these from all widgets and fetches them with
+        one request per cycle, handing the states to update(). A widget that
+        makes its own entity requests returns [] instead.
+        """
+        return self.entity_ids()
+
+    def _get_entities(self, entity_ids: List[str]) -> Dict[str, Entity]:
+        """Get entity states, from the dashboard's prefetch when there is one."""
+        if self._prefetched is not None:
+            prefetched = self._prefetched
+            return {
+                entity_id: prefetched[entity_id]
+                for entity_id in entity_ids
+                if entity_id in prefetched
+            }
+        return self.hass_client.get_entities(entity_ids) if entity_ids else {}
+
+    async def _get_entities_async(self, entity_ids: List[str]) -> Dict[str, Entity]:
+        """Async counterpart of _get_entities for an AsyncHASSClient."""
+        if self._prefetched is not None:
+            return self._get_entities(entity_ids)
+        return await self.hass_client.get_entities(entity_ids) if entity_ids else {}
 
     @abstractmethod
-    def _fetch_data(self) -> None:
-        """Fetch data from HASS client. Subclasses implement this."""
+    def _fetch_data(self) -> Optional[bool]:
+        """Fetch data from HASS client. Subclasses implement this.
+
+        Returns:
+            False if HASS returned nothing for the widget, which then keeps
+            its current data untouched
+        """
         pass
 
+    async def _fetch_data_async(self) -> Optional[bool]:
+        """Async counterpart of _fetch_data.
+
+        The default runs the blocking _fetch_data in a worker thread, which is
+        all a widget with a synchronous HASSClient can do. Widgets override
+        this to await an AsyncHASSClient directly.
+        """
+        return await asyncio.to_thread(self._fetch_data)
+
+    def _fan_out(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Apply fn to every item, in parallel on the shared executor when there is one.
+
+        Runs inline without an executor. The widget's own update usually
+        occupies one of the pool's workers, so a queued call that no worker
+        has picked up yet is cancelled and run by the caller instead; this
+        keeps a saturated (or single-worker) pool from deadlocking.
+        """
+        items = list(items)
+        if self.executor is None:
+            return [fn(item) for item in items]
+
+        futures = [self.executor.submit(fn, item) for item in items]
+        return [
+            fn(item) if future.cancel() else future.result()
+            for item, future in zip(items, futures)
+        ]
+
+    def to_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Get the widget's data as JSON-serializable values.
+
+        Returns:
+            Snapshot data, or None if the widget has nothing worth persisting
+        """
+        return None
+
+    def restore_snapshot(self, data: Dict[str, Any]) -> None:
+        """Restore data produced by to_snapshot() and mark the widget stale.
+
+        The widget still needs an update; restored data is only shown until
+        fresh data arrives.
+        """
+        self._restore_snapshot(data)
+        self.stale = True
+
+    def _restore_snapshot(self, data: Dict[str, Any]) -> None:
+        """Apply snapshot data. Widgets that implement to_snapshot override this."""
+
     @abstractmethod
     def render(self) -> None:
         """Render widget to the current renderer's draw context."""
         pass
 
+    def render_stale_marker(self) -> None:
+        """Mark the widget's area as showing stale data."""
+        if self.stale_marker_position is not None:
+            self.renderer.draw_text(self.stale_marker_position, "stale", style="small", fill=0)
+
     def get_data(self):
         """Get cached data."""
         return self._data
@@ -1,5 +1,31 @@
 """Core abstractions and implementations."""
 from core.hass_client import HASSClient, RealHASSClient, Entity
-from core.hass_mock import MockHASSClient
+from core.circuit_breaker import CircuitBreaker
+from core.async_hass_client import AsyncHASSClient, RealAsyncHASSClient
+from core.hass_mock import MockHASSClient, AsyncMockHASSClient
+from core.hass_websocket import WebSocketHASSClient
+from core.caching_client import CachingHASSClient, CacheStats
+from core.forecast_cache import StaleWhileRevalidateHASSClient
+from core.coalescing_client import CoalescingHASSClient, CoalescingAsyncHASSClient
+from core.history import HistoryBuffer
+from core.recording_client import RecordingHASSClient, ReplayHASSClient
 
-__all__ = ["HASSClient", "RealHASSClient", "MockHASSClient", "Entity"]
+__all__ = [
+    "HASSClient",
+    "RealHASSClient",
+    "MockHASSClient",
+    "Entity",
+    "CircuitBreaker",
+    "AsyncHASSClient",
+    "RealAsyncHASSClient",
+    "AsyncMockHASSClient",
+    "WebSocketHASSClient",
+    "CachingHASSClient",
+    "CacheStats",
+    "StaleWhileRevalidateHASSClient",
+    "CoalescingHASSClient",
+    "CoalescingAsyncHASSClient",
+    "HistoryBuffer",
+    "RecordingHASSClient",
+    "ReplayHASSClient",
+]
@@ -0,0 +1,224 @@
+"""Asyncio counterpart of the Home Assistant client interface."""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from core.hass_client import Entity, HASSClient, extract_forecast_list
+from core.history import HistoryPoint, history_request, parse_history
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHASSClient(ABC):
+    """Abstract base class for an asyncio Home Assistant client.
+
+    Mirrors HASSClient method for method, but every lookup is a coroutine so
+    widgets can fetch concurrently on one event loop.
+    """
+
+    @abstractmethod
+    async def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity by ID.
+
+        Args:
+            entity_id: The entity ID (e.g., 'sensor.temperature')
+
+        Returns:
+            Entity object or None if not found
+        """
+        pass
+
+    @abstractmethod
+    async def get_all_states(self) -> Dict[str, Entity]:
+        """Get every entity state known to Home Assistant in a single request.
+
+        Returns:
+            Mapping of entity ID to Entity (empty on failure)
+        """
+        pass
+
+    async def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities at once.
+
+        Args:
+            entity_ids: Entity IDs to look up
+
+        Returns:
+            Mapping of entity ID to Entity; IDs that are not found are omitted
+        """
+        wanted = list(dict.fromkeys(entity_ids))
+        if not wanted:
+            return {}
+
+        states = await self.get_all_states()
+        return {entity_id: states[entity_id] for entity_id in wanted if entity_id in states}
+
+    @abstractmethod
+    async def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get weather forecast data.
+
+        Args:
+            device_id: The weather device ID
+            forecast_type: "hourly" or "daily"
+
+        Returns:
+            List of forecast dictionaries
+        """
+        pass
+
+    async def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get numeric state history for several entities (see HASSClient.get_history)."""
+        return {}
+
+    def is_available(self) -> bool:
+        """Check whether requests are currently expected to reach Home Assistant."""
+        return True
+
+    async def close(self) -> None:
+        """Release any network resources held by the client."""
+
+
+AnyHASSClient = Union[HASSClient, AsyncHASSClient]
+
+
+class RealAsyncHASSClient(AsyncHASSClient):
+    """Real asyncio implementation using homeassistant_api on aiohttp.
+
+    The aiohttp session is created lazily on first use so it binds to the
+    running event loop, and is kept (with a bounded connector) until close().
+    Requests use the same connect/read timeouts as RealHASSClient.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        pool_maxsize: int = 4,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+    ):
+        """Initialize with Home Assistant URL and token.
+
+        Args:
+            url: Home Assistant API URL (e.g. 'http://hass.local:8123/api')
+            token: Long-lived access token
+            pool_maxsize: Maximum number of concurrent connections to Home Assistant
+            connect_timeout: Seconds to wait for a TCP connection
+            read_timeout: Seconds to wait for response data once connected
+        """
+        self.url = url
+        self.token = token
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._client: Optional[Any] = None
+        # Expected network/API errors, filled in with the lazily imported client.
+        self._errors: Tuple[Type[BaseException], ...] = ()
+
+    def _get_client(self) -> Any:
+        """Create the underlying API client on the running loop."""
+        if self._client is None:
+            import aiohttp
+            from homeassistant_api import Client as HassApiClient
+
+            from homeassistant_api.errors import HomeassistantAPIError
+
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+            )
+            self._client = HassApiClient(
+                self.url, self.token, use_async=True, async_cache_session=session
+            )
+            self._errors = (
+                HomeassistantAPIError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValueError,
+            )
+        return self._client
+
+    async def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get entity from Home Assistant."""
+        try:
+            state = await self._get_client().async_get_state(entity_id=entity_id)
+            return Entity(
+                entity_id=entity_id,
+                state=state.state,
+                attributes=state.attributes or {}
+            )
+        except self._errors as e:
+            logger.warning("Error fetching entity %s: %s", entity_id, e)
+            return None
+
+    async def get_all_states(self) -> Dict[str, Entity]:
+        """Get all entity states from Home Assistant with one /api/states call."""
+        try:
+            states = await self._get_client().async_get_states()
+            return {
+                state.entity_id: Entity(
+                    entity_id=state.entity_id,
+                    state=state.state,
+                    attributes=state.attributes or {}
+                )
+                for state in states
+            }
+        except self._errors as e:
+            logger.warning("Error fetching states: %s", e)
+            return {}
+
+    async def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities, using one bulk request when more than one is needed."""
+        wanted = list(dict.fromkeys(entity_ids))
+        if len(wanted) == 1:
+            entity = await self.get_entity(wanted[0])
+            return {wanted[0]: entity} if entity is not None else {}
+
+        return await super().get_entities(wanted)
+
+    async def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get forecast from Home Assistant."""
+        try:
+            forecasts = await self._get_client().async_trigger_service_with_response(
+                "weather", "get_forecasts", device_id=device_id, type=forecast_type
+            )
+            return extract_forecast_list(forecasts)
+        except self._errors as e:
+            logger.warning("Error fetching forecast: %s", e)
+            return []
+
+    async def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history for many entities with one /api/history/period call."""
+        wanted = list(dict.fromkeys(entity_ids))
+        if not wanted:
+            return {}
+
+        path, params = history_request(wanted, start, end, attribute)
+        try:
+            data = await self._get_client().async_request(path, params=params)
+        except self._errors as e:
+            logger.warning("Error fetching history: %s", e)
+            return {}
+        return parse_history(data, attribute)
+
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        if self._client is not None:
+            await self._client.async_cache_session.close()
+            self._client = None
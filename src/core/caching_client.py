@@ -0,0 +1,199 @@
+"""Caching decorator for any HASSClient."""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from core.hass_client import Entity, HASSClient
+from core.history import HistoryPoint
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachingHASSClient(HASSClient):
+    """HASSClient wrapper that memoizes entity and forecast lookups.
+
+    Entries expire after a TTL chosen per entity, then per domain, then the
+    default. The cache holds at most max_entries results and evicts the
+    least recently used one when full. Share one instance between all widgets
+    (and dashboards) so an entity read by several widgets is fetched once:
+
+        hass = CachingHASSClient(RealHASSClient(url, token), domain_ttls={"sun": 300})
+        dashboard.add_widget(WeatherWidget(hass, renderer))
+        dashboard.add_widget(SunWidget(hass, renderer))
+
+    Failed lookups (None entities, empty forecasts) are not cached.
+    """
+
+    def __init__(
+        self,
+        client: HASSClient,
+        default_ttl: float = 60.0,
+        domain_ttls: Optional[Dict[str, float]] = None,
+        entity_ttls: Optional[Dict[str, float]] = None,
+        forecast_ttl: float = 300.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize caching client.
+
+        Args:
+            client: Client to fetch cache misses from
+            default_ttl: TTL in seconds for entities without a specific TTL
+            domain_ttls: TTL per entity domain, e.g. {"weather": 300}
+            entity_ttls: TTL per entity ID; takes precedence over domain TTLs
+            forecast_ttl: TTL in seconds for forecasts
+            max_entries: Maximum number of cached results (LRU eviction)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.client = client
+        self.default_ttl = default_ttl
+        self.domain_ttls = dict(domain_ttls or {})
+        self.entity_ttls = dict(entity_ttls or {})
+        self.forecast_ttl = forecast_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the hit/miss/eviction counters."""
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses, self._stats.evictions)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def ttl_for(self, entity_id: str) -> float:
+        """Get the TTL that applies to an entity."""
+        if entity_id in self.entity_ttls:
+            return self.entity_ttls[entity_id]
+
+        domain = entity_id.split(".", 1)[0]
+        return self.domain_ttls.get(domain, self.default_ttl)
+
+    def clear(self) -> None:
+        """Drop every cached result (counters are kept)."""
+        with self._lock:
+            self._cache.clear()
+
+    def invalidate(self, entity_id: str) -> None:
+        """Drop the cached state of one entity."""
+        with self._lock:
+            self._cache.pop(("entity", entity_id), None)
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history from the wrapped client (not cached)."""
+        return self.client.get_history(entity_ids, start, end, attribute)
+
+    def is_available(self) -> bool:
+        """Report the wrapped client's availability."""
+        return self.client.is_available()
+
+    def close(self) -> None:
+        """Close the wrapped client."""
+        self.client.close()
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, counting the hit or miss."""
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > self._clock():
+                self._cache.move_to_end(key)
+                self._stats.hits += 1
+                return True, cached[1]
+
+            if cached is not None:
+                del self._cache[key]
+            self._stats.misses += 1
+            return False, None
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Cache a value, evicting least recently used entries beyond the bound."""
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._cache[key] = (self._clock() + ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._stats.evictions += 1
+
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity, from the cache when fresh."""
+        hit, entity = self._lookup(("entity", entity_id))
+        if hit:
+            return entity
+
+        entity = self.client.get_entity(entity_id)
+        if entity is not None:
+            self._store(("entity", entity_id), entity, self.ttl_for(entity_id))
+        return entity
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities, fetching only the stale ones in one bulk call."""
+        result: Dict[str, Entity] = {}
+        missing = []
+        for entity_id in dict.fromkeys(entity_ids):
+            hit, entity = self._lookup(("entity", entity_id))
+            if hit:
+                result[entity_id] = entity
+            else:
+                missing.append(entity_id)
+
+        if missing:
+            fetched = self.client.get_entities(missing)
+            for entity_id, entity in fetched.items():
+                self._store(("entity", entity_id), entity, self.ttl_for(entity_id))
+            result.update(fetched)
+
+        return result
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get all states from the wrapped client.
+
+        Entities that are already cached are refreshed with the returned
+        states; the rest are not added, so a full dump cannot flush the
+        entities the widgets actually read out of the LRU.
+        """
+        states = self.client.get_all_states()
+        for entity_id, entity in states.items():
+            if ("entity", entity_id) in self._cache:
+                self._store(("entity", entity_id), entity, self.ttl_for(entity_id))
+        return states
+
+    def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get a forecast, from the cache when fresh."""
+        key = ("forecast", device_id, forecast_type)
+        hit, forecast = self._lookup(key)
+        if hit:
+            return forecast
+
+        forecast = self.client.get_forecast(device_id, forecast_type)
+        if forecast:
+            self._store(key, forecast, self.forecast_ttl)
+        return forecast
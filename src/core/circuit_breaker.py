@@ -0,0 +1,102 @@
+"""Circuit breaker for calls to an unreliable Home Assistant instance."""
+import threading
+import time
+from typing import Callable, Optional
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures instead of waiting out every timeout.
+
+    The breaker starts 'closed' and lets every call through. After
+    failure_threshold consecutive failures it 'opens' and rejects calls for
+    reset_timeout seconds. Then it goes 'half_open' and lets a single trial
+    call through: success closes the breaker again, failure reopens it for
+    another reset_timeout.
+
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        if breaker.allow_request():
+            try:
+                result = fetch()
+                breaker.record_success()
+            except Exception:
+                breaker.record_failure()
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to fail fast before allowing a trial call
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_count = 0
+        self.open_count = 0
+        self._clock = clock
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a trial call through (0 if it already would)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go out, claiming the trial slot when half open."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call and close the breaker."""
+        with self._lock:
+            self.failure_count = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker at the threshold."""
+        with self._lock:
+            self.failure_count += 1
+            trial_failed = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial_failed or self.failure_count >= self.failure_threshold:
+                if self._opened_at is None or trial_failed:
+                    self.open_count += 1
+                self._opened_at = self._clock()
+
+    def reset(self) -> None:
+        """Force the breaker closed (e.g. after reconfiguring the connection)."""
+        self.record_success()
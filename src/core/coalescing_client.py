@@ -0,0 +1,250 @@
+"""Single-flight request coalescing for sync and async HASS clients."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, TypeVar
+
+from core.async_hass_client import AsyncHASSClient
+from core.hass_client import Entity, HASSClient
+from core.history import HistoryPoint
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing how much work coalescing saved."""
+
+    executed: int = 0
+    shared: int = 0
+
+    @property
+    def saved_requests(self) -> int:
+        """Number of calls answered by another caller's in-flight request."""
+        return self.shared
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight block and receive the same result or
+    exception. Once the call finishes the key is forgotten, so results are
+    never cached beyond the flight itself.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+        self._stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Get a snapshot of the executed/shared counters."""
+        with self._lock:
+            return SingleFlightStats(self._stats.executed, self._stats.shared)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn for key, or wait for the identical call already in flight."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+                self._stats.executed += 1
+            else:
+                self._stats.shared += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+
+class AsyncSingleFlight:
+    """Asyncio counterpart of SingleFlight for one event loop.
+
+    The leader's coroutine runs as a task; followers await it shielded, so a
+    caller that times out or is cancelled does not cancel the shared request.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Get a snapshot of the executed/shared counters."""
+        return SingleFlightStats(self._stats.executed, self._stats.shared)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn() for key, or join the identical call already in flight."""
+        task = self._flights.get(key)
+        if task is not None:
+            self._stats.shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            self._stats.executed += 1
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+
+        return await asyncio.shield(task)
+
+
+def _entities_key(entity_ids: Iterable[str]) -> Hashable:
+    """Order-independent key for a bulk entity lookup."""
+    return ("entities", tuple(sorted(set(entity_ids))))
+
+
+def _history_key(
+    entity_ids: Iterable[str],
+    start: datetime,
+    end: Optional[datetime],
+    attribute: Optional[str],
+) -> Hashable:
+    """Key for a history lookup of an entity set over a period."""
+    return ("history", tuple(sorted(set(entity_ids))), start, end, attribute)
+
+
+class CoalescingHASSClient(HASSClient):
+    """HASSClient wrapper that deduplicates concurrent identical lookups.
+
+    With threaded updates several widgets, or several dashboards sharing the
+    client, ask for 'weather.home' or the same forecast at the same moment.
+    Only one request per entity ID, entity set or (device_id, forecast_type)
+    goes to the wrapped client; the other callers wait for it. stats shows
+    how many requests were saved.
+    """
+
+    def __init__(self, client: HASSClient):
+        """Initialize coalescing client.
+
+        Args:
+            client: Client whose concurrent identical requests are merged
+        """
+        self.client = client
+        self._flight = SingleFlight()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Get executed/shared request counters."""
+        return self._flight.stats
+
+    def is_available(self) -> bool:
+        """Report the wrapped client's availability."""
+        return self.client.is_available()
+
+    def close(self) -> None:
+        """Close the wrapped client."""
+        self.client.close()
+
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity, joining an identical in-flight lookup if there is one."""
+        return self._flight.do(("entity", entity_id), lambda: self.client.get_entity(entity_id))
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities, joining an in-flight lookup of the same set."""
+        wanted = list(dict.fromkeys(entity_ids))
+        return self._flight.do(_entities_key(wanted), lambda: self.client.get_entities(wanted))
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get all states, joining an in-flight state dump if there is one."""
+        return self._flight.do(("all_states",), self.client.get_all_states)
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history, joining an identical in-flight request if there is one."""
+        wanted = list(dict.fromkeys(entity_ids))
+        return self._flight.do(
+            _history_key(wanted, start, end, attribute),
+            lambda: self.client.get_history(wanted, start, end, attribute),
+        )
+
+    def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get a forecast, joining an identical in-flight request if there is one."""
+        return self._flight.do(
+            ("forecast", device_id, forecast_type),
+            lambda: self.client.get_forecast(device_id, forecast_type),
+        )
+
+
+class CoalescingAsyncHASSClient(AsyncHASSClient):
+    """AsyncHASSClient wrapper that deduplicates concurrent identical lookups."""
+
+    def __init__(self, client: AsyncHASSClient):
+        """Initialize coalescing client.
+
+        Args:
+            client: Async client whose concurrent identical requests are merged
+        """
+        self.client = client
+        self._flight = AsyncSingleFlight()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Get executed/shared request counters."""
+        return self._flight.stats
+
+    def is_available(self) -> bool:
+        """Report the wrapped client's availability."""
+        return self.client.is_available()
+
+    async def close(self) -> None:
+        """Close the wrapped client."""
+        await self.client.close()
+
+    async def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity, joining an identical in-flight lookup if there is one."""
+        return await self._flight.do(
+            ("entity", entity_id), lambda: self.client.get_entity(entity_id)
+        )
+
+    async def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities, joining an in-flight lookup of the same set."""
+        wanted = list(dict.fromkeys(entity_ids))
+        return await self._flight.do(
+            _entities_key(wanted), lambda: self.client.get_entities(wanted)
+        )
+
+    async def get_all_states(self) -> Dict[str, Entity]:
+        """Get all states, joining an in-flight state dump if there is one."""
+        return await self._flight.do(("all_states",), self.client.get_all_states)
+
+    async def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history, joining an identical in-flight request if there is one."""
+        wanted = list(dict.fromkeys(entity_ids))
+        return await self._flight.do(
+            _history_key(wanted, start, end, attribute),
+            lambda: self.client.get_history(wanted, start, end, attribute),
+        )
+
+    async def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get a forecast, joining an identical in-flight request if there is one."""
+        return await self._flight.do(
+            ("forecast", device_id, forecast_type),
+            lambda: self.client.get_forecast(device_id, forecast_type),
+        )
@@ -0,0 +1,163 @@
+"""Stale-while-revalidate forecast cache for any HASSClient."""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.hass_client import Entity, HASSClient
+from core.history import HistoryPoint
+
+
+@dataclass
+class _ForecastEntry:
+    """Last good forecast for one (device_id, forecast_type) key."""
+
+    forecast: list
+    fetched_at: float
+    attempted_at: float
+    refresh: Optional[threading.Thread] = None
+
+
+class StaleWhileRevalidateHASSClient(HASSClient):
+    """HASSClient wrapper that serves forecasts without waiting on the network.
+
+    The weather service call is the slowest request we make. This wrapper
+    keeps the last good forecast per (device_id, forecast_type) and:
+
+    - younger than soft_ttl: returns it as is;
+    - older than soft_ttl: returns it immediately and refreshes it on a
+      background thread (one refresh per key at a time);
+    - older than hard_ttl: refreshes in the foreground; if that fails too
+      the stale forecast is dropped and [] is returned.
+
+    A failed background refresh (exception or empty result) keeps serving
+    the cached forecast, so errors are hidden until hard_ttl expires; the
+    next refresh is not started until retry_interval has passed since the
+    failed attempt. Only the very first lookup for a key blocks. Entity
+    lookups pass straight through to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        client: HASSClient,
+        soft_ttl: float = 300.0,
+        hard_ttl: float = 3600.0,
+        retry_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize forecast cache.
+
+        Args:
+            client: Client to fetch forecasts from
+            soft_ttl: Age in seconds after which a background refresh starts
+            hard_ttl: Age in seconds after which a cached forecast is no longer served
+            retry_interval: Seconds to wait after a failed refresh before the next one
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.client = client
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.retry_interval = retry_interval
+        self.refresh_count = 0
+        self.refresh_failures = 0
+        self._clock = clock
+        self._entries: Dict[Tuple[str, str], _ForecastEntry] = {}
+        self._lock = threading.Lock()
+
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity from the wrapped client."""
+        return self.client.get_entity(entity_id)
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities from the wrapped client."""
+        return self.client.get_entities(entity_ids)
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get all states from the wrapped client."""
+        return self.client.get_all_states()
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history from the wrapped client."""
+        return self.client.get_history(entity_ids, start, end, attribute)
+
+    def is_available(self) -> bool:
+        """Report the wrapped client's availability."""
+        return self.client.is_available()
+
+    def close(self) -> None:
+        """Wait briefly for in-flight refreshes, then close the wrapped client."""
+        self.wait_for_refresh(timeout=1.0)
+        self.client.close()
+
+    def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get a forecast, serving the cached one while it is refreshed."""
+        key = (device_id, forecast_type)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self._clock()
+
+            if entry is not None and now - entry.fetched_at < self.hard_ttl:
+                if (
+                    now - entry.fetched_at >= self.soft_ttl
+                    and entry.refresh is None
+                    and now - entry.attempted_at >= self.retry_interval
+                ):
+                    entry.attempted_at = now
+                    entry.refresh = threading.Thread(
+                        target=self._refresh, args=(key,), daemon=True
+                    )
+                    entry.refresh.start()
+                return entry.forecast
+
+        # Nothing servable: fetch in the foreground.
+        forecast = self._fetch(key)
+        with self._lock:
+            if forecast:
+                now = self._clock()
+                self._entries[key] = _ForecastEntry(forecast, now, now)
+            else:
+                self._entries.pop(key, None)
+        return forecast
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """Block until in-flight background refreshes finish (for tests and shutdown)."""
+        with self._lock:
+            threads = [entry.refresh for entry in self._entries.values() if entry.refresh]
+        for thread in threads:
+            thread.join(timeout)
+
+    def _fetch(self, key: Tuple[str, str]) -> list:
+        """Fetch a forecast, treating exceptions and empty results as failures."""
+        with self._lock:
+            self.refresh_count += 1
+        try:
+            forecast = self.client.get_forecast(*key)
+        except Exception as e:
+            print(f"Error refreshing forecast {key}: {e}")
+            forecast = []
+
+        if not forecast:
+            with self._lock:
+                self.refresh_failures += 1
+        return forecast
+
+    def _refresh(self, key: Tuple[str, str]) -> None:
+        """Background refresh: replace the entry on success, keep it on failure."""
+        forecast = self._fetch(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if forecast:
+                now = self._clock()
+                self._entries[key] = _ForecastEntry(forecast, now, now)
+            else:
+                entry.refresh = None
@@ -1,8 +1,15 @@
 """Abstract interface for Home Assistant client."""
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
 from dataclasses import dataclass
 
+from core.circuit_breaker import CircuitBreaker
+from core.history import HistoryPoint, history_request, parse_history
+
+T = TypeVar("T")
+
 
 @dataclass
 class Entity:
@@ -12,6 +19,37 @@ class Entity:
     attributes: Dict[str, Any]
 
 
+def extract_forecast_list(forecasts: Any) -> list:
+    """Normalize different API response shapes into a list of forecast dicts."""
+    if isinstance(forecasts, list):
+        if forecasts and all(isinstance(item, dict) and "datetime" in item for item in forecasts):
+            return forecasts
+
+        for item in forecasts:
+            extracted = extract_forecast_list(item)
+            if extracted:
+                return extracted
+
+    if isinstance(forecasts, tuple):
+        for item in forecasts:
+            extracted = extract_forecast_list(item)
+            if extracted:
+                return extracted
+
+    if isinstance(forecasts, dict):
+        direct = forecasts.get("forecast")
+        if isinstance(direct, list):
+            return direct
+
+        for value in forecasts.values():
+            if isinstance(value, dict):
+                nested = value.get("forecast")
+                if isinstance(nested, list):
+                    return nested
+
+    return []
+
+
 class HASSClient(ABC):
     """Abstract base class for Home Assistant client.
     
@@ -30,6 +68,34 @@ class HASSClient(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get every entity state known to Home Assistant in a single request.
+
+        Returns:
+            Mapping of entity ID to Entity (empty on failure)
+        """
+        pass
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities at once.
+
+        The default implementation filters a single get_all_states() call, so
+        implementations only need to override this when they can do better.
+
+        Args:
+            entity_ids: Entity IDs to look up
+
+        Returns:
+            Mapping of entity ID to Entity; IDs that are not found are omitted
+        """
+        wanted = list(dict.fromkeys(entity_ids))
+        if not wanted:
+            return {}
+
+        states = self.get_all_states()
+        return {entity_id: states[entity_id] for entity_id in wanted if entity_id in states}
+
     @abstractmethod
     def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
         """Get weather forecast data.
@@ -43,74 +109,262 @@ class HASSClient(ABC):
         """
         pass
 
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get numeric state history for several entities.
+
+        The default implementation has no history and returns {}.
+
+        Args:
+            entity_ids: Entities to fetch, all in one request
+            start: Start of the period
+            end: End of the period (None = now)
+            attribute: Attribute holding the value (None = the state itself)
+
+        Returns:
+            Mapping of entity ID to (timestamp, value) samples, oldest first;
+            non-numeric samples are skipped
+        """
+        return {}
+
+    def is_available(self) -> bool:
+        """Check whether requests are currently expected to reach Home Assistant.
+
+        The dashboard skips updates while this is False and renders the data
+        widgets already have, instead of blocking on a backend that is down.
+        """
+        return True
+
+    def close(self) -> None:
+        """Release any network resources held by the client."""
+
 
 class RealHASSClient(HASSClient):
-    """Real implementation using homeassistant_api."""
+    """Real implementation using homeassistant_api.
+
+    The client keeps one keep-alive HTTP session with a bounded connection
+    pool for its whole lifetime, so repeated lookups reuse the same TCP/TLS
+    connection. Call close() (or use it as a context manager) when done.
+    Like homeassistant_api's default session, GET responses are kept in an
+    in-memory HTTP cache for cache_expire_after seconds.
+
+    Every request has connect/read timeouts. Transient failures (connection
+    errors, timeouts, 5xx responses) are retried with exponential backoff;
+    when a request still fails the circuit breaker counts it, and once the
+    breaker opens requests fail fast until its cooldown has passed.
+    """
 
-    def __init__(self, url: str, token: str):
-        """Initialize with Home Assistant URL and token."""
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        pool_maxsize: int = 4,
+        cache_expire_after: float = 300,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize with Home Assistant URL and token.
+
+        Args:
+            url: Home Assistant API URL (e.g. 'http://hass.local:8123/api')
+            token: Long-lived access token
+            pool_maxsize: Maximum number of pooled connections to Home Assistant
+            cache_expire_after: Seconds GET responses stay in the in-memory HTTP cache
+                (0 disables the cache)
+            connect_timeout: Seconds to wait for a TCP connection
+            read_timeout: Seconds to wait for a response once connected
+            max_retries: Retries after the first attempt for transient failures
+            backoff: Delay in seconds before the first retry (doubles each retry)
+            max_backoff: Upper bound for the retry delay
+            breaker: Circuit breaker shared by all requests (default: 3 failures, 30s)
+            sleep: Function used to wait between retries (injectable for tests)
+        """
+        import requests
+        import requests_cache
+        from requests.adapters import HTTPAdapter
         from homeassistant_api import Client as HassApiClient
 
         self.url = url
         self.token = token
-        self._client = HassApiClient(url, token)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self._sleep = sleep
+
+        # Block instead of opening throwaway connections when all pooled
+        # connections are busy; Home Assistant is a single host.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=True)
+        if cache_expire_after > 0:
+            self._session = requests_cache.CachedSession(
+                cache_name="default_cache",
+                backend="memory",
+                expire_after=cache_expire_after,
+            )
+        else:
+            self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._client = HassApiClient(
+            url,
+            token,
+            cache_session=self._session,
+            global_request_kwargs={"timeout": (connect_timeout, read_timeout)},
+        )
+
+    def is_available(self) -> bool:
+        """Check whether the circuit breaker currently lets requests through."""
+        return self.breaker.state != CircuitBreaker.OPEN
+
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self._session.close()
+
+    def __enter__(self) -> "RealHASSClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     def _extract_forecast_list(self, forecasts: Any) -> list:
         """Normalize different API response shapes into a list of forecast dicts."""
-        if isinstance(forecasts, list):
-            if forecasts and all(isinstance(item, dict) and "datetime" in item for item in forecasts):
-                return forecasts
-
-            for item in forecasts:
-                extracted = self._extract_forecast_list(item)
-                if extracted:
-                    return extracted
-
-        if isinstance(forecasts, tuple):
-            for item in forecasts:
-                extracted = self._extract_forecast_list(item)
-                if extracted:
-                    return extracted
-
-        if isinstance(forecasts, dict):
-            direct = forecasts.get("forecast")
-            if isinstance(direct, list):
-                return direct
-
-            for value in forecasts.values():
-                if isinstance(value, dict):
-                    nested = value.get("forecast")
-                    if isinstance(nested, list):
-                        return nested
-
-        return []
+        return extract_forecast_list(forecasts)
+
+    def _is_transient(self, error: Exception) -> bool:
+        """Check whether a failed request is worth retrying.
+
+        Network errors, timeouts and server errors are; answers such as
+        404 (unknown entity) or 401 mean Home Assistant is up and retrying
+        would not change the outcome.
+        """
+        import requests
+        from homeassistant_api.errors import (
+            InternalServerError,
+            RequestTimeoutError,
+            UnexpectedStatusCodeError,
+        )
+
+        return isinstance(
+            error,
+            (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                RequestTimeoutError,
+                InternalServerError,
+                UnexpectedStatusCodeError,
+                ConnectionError,
+                TimeoutError,
+            ),
+        )
+
+    def _call(self, description: str, request: Callable[[], T], default: T) -> T:
+        """Run a request with retries and the circuit breaker.
+
+        Args:
+            description: What is being fetched, for error messages
+            request: Function performing the request
+            default: Value returned when the request fails or is short-circuited
+
+        Returns:
+            The request's result, or default
+        """
+        if not self.breaker.allow_request():
+            return default
+
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = request()
+            except Exception as e:
+                if not self._is_transient(e):
+                    # Home Assistant answered; the request itself was bad.
+                    self.breaker.record_success()
+                    print(f"Error fetching {description}: {e}")
+                    return default
+
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    print(f"Error fetching {description} after {attempt + 1} attempts: {e}")
+                    return default
+
+                self._sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+            else:
+                self.breaker.record_success()
+                return result
+
+        return default
 
     def get_entity(self, entity_id: str) -> Optional[Entity]:
         """Get entity from Home Assistant."""
-        try:
-            with self._client:
-                entity = self._client.get_entity(entity_id=entity_id)
-                if entity is None:
-                    return None
-                state = entity.get_state()
-                return Entity(
-                    entity_id=entity_id,
-                    state=state.state,
-                    attributes=state.attributes or {}
-                )
-        except Exception as e:
-            print(f"Error fetching entity {entity_id}: {e}")
+        # get_state is a single GET; get_entity(...).get_state() costs two.
+        state = self._call(
+            f"entity {entity_id}", lambda: self._client.get_state(entity_id=entity_id), None
+        )
+        if state is None:
             return None
+        return Entity(
+            entity_id=entity_id,
+            state=state.state,
+            attributes=state.attributes or {}
+        )
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get all entity states from Home Assistant with one /api/states call."""
+        states = self._call("states", self._client.get_states, ())
+        return {
+            state.entity_id: Entity(
+                entity_id=state.entity_id,
+                state=state.state,
+                attributes=state.attributes or {}
+            )
+            for state in states
+        }
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities, using one bulk request when more than one is needed."""
+        wanted = list(dict.fromkeys(entity_ids))
+        if len(wanted) == 1:
+            # /api/states/<id> is far smaller than the full state dump.
+            entity = self.get_entity(wanted[0])
+            return {wanted[0]: entity} if entity is not None else {}
+
+        return super().get_entities(wanted)
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history for many entities with one /api/history/period call."""
+        wanted = list(dict.fromkeys(entity_ids))
+        if not wanted:
+            return {}
+
+        path, params = history_request(wanted, start, end, attribute)
+        data = self._call("history", lambda: self._client.request(path, params=params), None)
+        return parse_history(data, attribute)
 
     def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
         """Get forecast from Home Assistant."""
-        try:
-            with self._client:
-                weather = self._client.get_domain("weather")
-                if weather is None:
-                    return []
-                forecasts = weather.get_forecasts(device_id=device_id, type=forecast_type)
-                return self._extract_forecast_list(forecasts)
-        except Exception as e:
-            print(f"Error fetching forecast: {e}")
-            return []
+        def fetch() -> list:
+            # Call the service directly; get_domain() would first fetch the
+            # whole /api/services listing on every call.
+            _, response = self._client.trigger_service_with_response(
+                "weather", "get_forecasts", device_id=device_id, type=forecast_type
+            )
+            return self._extract_forecast_list(response)
+
+        return self._call("forecast", fetch, [])
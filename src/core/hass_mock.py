@@ -1,6 +1,11 @@
 """Mock Home Assistant client for testing."""
-from typing import Any, Dict, Optional
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.async_hass_client import AsyncHASSClient
 from core.hass_client import HASSClient, Entity
+from core.history import HistoryPoint, parse_history
 
 
 class MockHASSClient(HASSClient):
@@ -10,6 +15,11 @@ class MockHASSClient(HASSClient):
         """Initialize with default mock data."""
         self.entities: Dict[str, Entity] = {}
         self.forecast_data: list = []
+        # entity ID -> [(timestamp, state, attributes)]
+        self.history: Dict[str, List[Tuple[float, str, Dict[str, Any]]]] = {}
+        self.history_requests: List[Tuple[List[str], datetime]] = []
+        self.request_count = 0
+        self._count_lock = threading.Lock()
         self._setup_defaults()
 
     def _setup_defaults(self) -> None:
@@ -56,10 +66,116 @@ class MockHASSClient(HASSClient):
         """Set mock forecast data."""
         self.forecast_data = forecast_data
 
+    def add_history(
+        self,
+        entity_id: str,
+        timestamp: float,
+        state: str,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add a recorded state change to the mock history."""
+        self.history.setdefault(entity_id, []).append((timestamp, state, attributes or {}))
+        self.history[entity_id].sort(key=lambda change: change[0])
+
+    def _count_request(self) -> None:
+        with self._count_lock:
+            self.request_count += 1
+
     def get_entity(self, entity_id: str) -> Optional[Entity]:
         """Get mock entity."""
+        self._count_request()
         return self.entities.get(entity_id)
 
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get all mock entities."""
+        self._count_request()
+        return dict(self.entities)
+
     def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
         """Get mock forecast."""
+        self._count_request()
         return self.forecast_data
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get mock history, shaped like a /api/history/period response."""
+        self._count_request()
+        wanted = list(dict.fromkeys(entity_ids))
+        self.history_requests.append((wanted, start))
+
+        first = start.timestamp()
+        last = end.timestamp() if end is not None else float("inf")
+        data = [
+            [
+                {
+                    "entity_id": entity_id,
+                    "state": state,
+                    "attributes": attributes,
+                    "last_updated": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                }
+                for timestamp, state, attributes in self.history[entity_id]
+                if first <= timestamp <= last
+            ]
+            for entity_id in wanted
+            if entity_id in self.history
+        ]
+        return parse_history(data, attribute)
+
+
+class AsyncMockHASSClient(AsyncHASSClient):
+    """Async mock that serves a MockHASSClient's data after a simulated latency."""
+
+    def __init__(self, source: Optional[MockHASSClient] = None, latency: float = 0.0):
+        """Initialize async mock.
+
+        Args:
+            source: Mock client providing entities and forecast (default: fresh mock)
+            latency: Seconds each call sleeps before answering
+        """
+        self.source = source or MockHASSClient()
+        self.latency = latency
+        self.request_count = 0
+
+    def set_entity(self, entity_id: str, state: str, attributes: Dict[str, Any]) -> None:
+        """Set mock entity data."""
+        self.source.set_entity(entity_id, state, attributes)
+
+    def set_forecast(self, forecast_data: list) -> None:
+        """Set mock forecast data."""
+        self.source.set_forecast(forecast_data)
+
+    async def _respond(self) -> None:
+        self.request_count += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    async def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get mock entity."""
+        await self._respond()
+        return self.source.entities.get(entity_id)
+
+    async def get_all_states(self) -> Dict[str, Entity]:
+        """Get all mock entities."""
+        await self._respond()
+        return dict(self.source.entities)
+
+    async def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get mock forecast."""
+        await self._respond()
+        return self.source.forecast_data
+
+    async def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get mock history."""
+        await self._respond()
+        return self.source.get_history(entity_ids, start, end, attribute)
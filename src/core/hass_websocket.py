@@ -0,0 +1,340 @@
+"""Home Assistant client that mirrors entity states over the WebSocket API."""
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit, urlunsplit
+
+from core.hass_client import Entity, HASSClient, extract_forecast_list
+
+
+def websocket_url(url: str) -> str:
+    """Turn a REST API URL into the matching WebSocket endpoint URL.
+
+    'http://hass.local:8123/api' becomes 'ws://hass.local:8123/api/websocket'.
+    """
+    parts = urlsplit(url)
+    scheme = {"http": "ws", "https": "wss"}.get(parts.scheme, parts.scheme)
+    path = parts.path.rstrip("/")
+    if not path.endswith("/api/websocket"):
+        if not path.endswith("/api"):
+            path += "/api"
+        path += "/websocket"
+    return urlunsplit((scheme, parts.netloc, path, "", ""))
+
+
+class WebSocketHASSClient(HASSClient):
+    """HASSClient backed by a live state table fed by the WebSocket API.
+
+    A background thread connects to Home Assistant, subscribes to exactly the
+    configured entity IDs with 'subscribe_entities' and applies every pushed
+    change to an in-memory table. get_entity and friends read that table and
+    never touch the network. When the connection drops the thread reconnects
+    with exponential backoff and the fresh subscription resyncs the table.
+
+        client = WebSocketHASSClient(url, token)
+        client.subscribe(dashboard.entity_ids())
+        client.start()
+        client.wait_until_synced(timeout=10)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        entity_ids: Iterable[str] = (),
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        request_timeout: float = 10.0,
+    ):
+        """Initialize WebSocket client.
+
+        Args:
+            url: Home Assistant API URL (http(s)://... or ws(s)://.../api/websocket)
+            token: Long-lived access token
+            entity_ids: Entity IDs to subscribe to (more can be added with subscribe())
+            reconnect_delay: Initial delay in seconds before reconnecting
+            max_reconnect_delay: Upper bound for the exponential reconnect delay
+            request_timeout: Seconds to wait for a command result (e.g. forecasts)
+        """
+        self.url = websocket_url(url)
+        self.token = token
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.request_timeout = request_timeout
+        self.reconnect_count = 0
+
+        self._entity_ids: List[str] = list(dict.fromkeys(entity_ids))
+        self._states: Dict[str, Entity] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._connection: Optional[Any] = None
+        self._next_id = 1
+        self._pending: Dict[int, Future] = {}
+        self._subscriptions: Dict[int, List[str]] = {}
+        self._awaiting_snapshot: Set[int] = set()
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Lifecycle
+
+    def start(self) -> "WebSocketHASSClient":
+        """Start the background connection thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="hass-websocket", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait_until_synced(self, timeout: Optional[float] = None) -> bool:
+        """Block until the subscribed states have been received.
+
+        Returns:
+            True if the state table is in sync, False on timeout
+        """
+        return self._synced.wait(timeout)
+
+    def is_connected(self) -> bool:
+        """Check whether the WebSocket connection is currently up."""
+        return self._connection is not None
+
+    def close(self) -> None:
+        """Stop the background thread and close the connection."""
+        self._stop.set()
+        connection = self._connection
+        if connection is not None:
+            connection.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "WebSocketHASSClient":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def subscribe(self, entity_ids: Iterable[str]) -> None:
+        """Add entity IDs to the subscription.
+
+        Takes effect immediately on a live connection, otherwise when the
+        client (re)connects.
+        """
+        with self._lock:
+            added = [
+                entity_id
+                for entity_id in dict.fromkeys(entity_ids)
+                if entity_id not in self._entity_ids
+            ]
+            self._entity_ids.extend(added)
+
+        connection = self._connection
+        if added and connection is not None:
+            try:
+                self._subscribe_entities(connection, added)
+            except Exception as e:
+                print(f"Error subscribing to {added}: {e}")
+
+    # HASSClient interface (zero I/O for state reads)
+
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity from the live state table."""
+        with self._lock:
+            return self._states.get(entity_id)
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities from the live state table."""
+        with self._lock:
+            return {
+                entity_id: self._states[entity_id]
+                for entity_id in entity_ids
+                if entity_id in self._states
+            }
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get every subscribed entity from the live state table."""
+        with self._lock:
+            return dict(self._states)
+
+    def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get forecast by calling weather.get_forecasts over the socket."""
+        result = self._request(
+            {
+                "type": "call_service",
+                "domain": "weather",
+                "service": "get_forecasts",
+                "service_data": {"type": forecast_type},
+                "target": {"device_id": device_id},
+                "return_response": True,
+            }
+        )
+        if result is None:
+            return []
+        return extract_forecast_list(result.get("response"))
+
+    # Connection handling
+
+    def _run(self) -> None:
+        """Connect, subscribe and apply pushed changes until stopped."""
+        from websockets.sync.client import connect
+
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                with connect(self.url, open_timeout=self.request_timeout) as connection:
+                    self._authenticate(connection)
+                    self._connection = connection
+                    with self._lock:
+                        entity_ids = list(self._entity_ids)
+                    if entity_ids:
+                        self._subscribe_entities(connection, entity_ids)
+                    else:
+                        self._synced.set()
+                    delay = self.reconnect_delay
+
+                    for raw in connection:
+                        self._handle_message(json.loads(raw))
+            except Exception as e:
+                if not self._stop.is_set():
+                    print(f"WebSocket connection to {self.url} lost: {e}")
+            finally:
+                self._connection = None
+                self._synced.clear()
+                self._fail_pending()
+
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnect_count += 1
+
+    def _authenticate(self, connection: Any) -> None:
+        """Run the auth_required / auth / auth_ok handshake."""
+        message = json.loads(connection.recv(timeout=self.request_timeout))
+        if message.get("type") != "auth_required":
+            raise ConnectionError(f"Unexpected handshake message: {message}")
+
+        connection.send(json.dumps({"type": "auth", "access_token": self.token}))
+        message = json.loads(connection.recv(timeout=self.request_timeout))
+        if message.get("type") != "auth_ok":
+            raise ConnectionError(f"Authentication failed: {message.get('message', message)}")
+
+    def _subscribe_entities(self, connection: Any, entity_ids: List[str]) -> None:
+        """Subscribe to state changes for the given entities.
+
+        The table counts as out of sync until the subscription's initial
+        snapshot has arrived.
+        """
+        with self._send_lock:
+            message_id = self._next_id
+            self._next_id += 1
+            self._subscriptions[message_id] = list(entity_ids)
+            with self._lock:
+                self._awaiting_snapshot.add(message_id)
+                self._synced.clear()
+            connection.send(
+                json.dumps({"id": message_id, "type": "subscribe_entities", "entity_ids": entity_ids})
+            )
+
+    def _request(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send a command and wait for its result payload."""
+        connection = self._connection
+        if connection is None:
+            print(f"WebSocket not connected; cannot send {message.get('type')}")
+            return None
+
+        future: Future = Future()
+        try:
+            with self._send_lock:
+                message_id = self._next_id
+                self._next_id += 1
+                self._pending[message_id] = future
+                connection.send(json.dumps({"id": message_id, **message}))
+            response = future.result(timeout=self.request_timeout)
+        except Exception as e:
+            print(f"WebSocket request {message.get('type')} failed: {e}")
+            return None
+
+        if not response.get("success"):
+            print(f"WebSocket request {message.get('type')} failed: {response.get('error')}")
+            return None
+        return response.get("result") or {}
+
+    def _fail_pending(self) -> None:
+        """Fail outstanding requests and forget subscriptions after a disconnect."""
+        with self._send_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._subscriptions.clear()
+            with self._lock:
+                self._awaiting_snapshot.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(ConnectionError("WebSocket connection closed"))
+
+    # Message handling
+
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        """Dispatch one message received from Home Assistant."""
+        message_type = message.get("type")
+        message_id = message.get("id")
+
+        if message_type == "event" and message_id in self._subscriptions:
+            self._apply_entity_event(message_id, message.get("event") or {})
+        elif message_type == "result":
+            future = self._pending.pop(message_id, None)
+            if future is not None and not future.done():
+                future.set_result(message)
+            elif not message.get("success"):
+                print(f"WebSocket command {message_id} failed: {message.get('error')}")
+
+    def _apply_entity_event(self, subscription_id: int, event: Dict[str, Any]) -> None:
+        """Apply a compressed subscribe_entities event to the state table.
+
+        'a' carries full states (sent first on every new subscription, which
+        is what resyncs the table after a reconnect), 'c' carries diffs with
+        '+' (changed state/attributes) and '-' (removed attributes), and 'r'
+        lists removed entities. The initial snapshot replaces the
+        subscription's entities in the table, so entities removed while
+        disconnected disappear.
+        """
+        with self._lock:
+            initial = "a" in event and subscription_id in self._awaiting_snapshot
+            if initial:
+                for entity_id in self._subscriptions.get(subscription_id, []):
+                    self._states.pop(entity_id, None)
+
+            for entity_id, compressed in (event.get("a") or {}).items():
+                self._states[entity_id] = Entity(
+                    entity_id=entity_id,
+                    state=str(compressed.get("s")),
+                    attributes=dict(compressed.get("a") or {}),
+                )
+
+            for entity_id, diff in (event.get("c") or {}).items():
+                current = self._states.get(entity_id)
+                if current is None:
+                    continue
+
+                attributes = dict(current.attributes)
+                state = current.state
+                added = diff.get("+") or {}
+                if "s" in added:
+                    state = str(added["s"])
+                attributes.update(added.get("a") or {})
+                for name in (diff.get("-") or {}).get("a") or []:
+                    attributes.pop(name, None)
+
+                self._states[entity_id] = Entity(
+                    entity_id=entity_id, state=state, attributes=attributes
+                )
+
+            for entity_id in event.get("r") or []:
+                self._states.pop(entity_id, None)
+
+            if initial:
+                self._awaiting_snapshot.discard(subscription_id)
+                if not self._awaiting_snapshot:
+                    self._synced.set()
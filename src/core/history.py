@@ -0,0 +1,218 @@
+"""Entity history: request helpers, LTTB downsampling and compact ring buffers."""
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+# (Unix timestamp, numeric value)
+HistoryPoint = Tuple[float, float]
+
+
+def history_request(
+    entity_ids: Iterable[str],
+    start: datetime,
+    end: Optional[datetime] = None,
+    attribute: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Build the path and query string for one /api/history/period request.
+
+    Without an attribute the states alone are needed, so the response is
+    trimmed with minimal_response and no_attributes. With an attribute the
+    full states are requested, including attribute-only changes.
+
+    Returns:
+        (path relative to the API root, query string)
+    """
+    if start.tzinfo is None:
+        start = start.astimezone()
+    params = [f"filter_entity_id={quote(','.join(entity_ids), safe=',')}"]
+    if end is not None:
+        if end.tzinfo is None:
+            end = end.astimezone()
+        params.append(f"end_time={quote(end.isoformat(timespec='seconds'))}")
+    if attribute is None:
+        params.extend(["minimal_response", "no_attributes"])
+    else:
+        params.append("significant_changes_only=0")
+
+    return f"history/period/{quote(start.isoformat(timespec='seconds'))}", "&".join(params)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def parse_history(data: Any, attribute: Optional[str] = None) -> Dict[str, List[HistoryPoint]]:
+    """Turn a /api/history/period response into numeric series per entity.
+
+    The response holds one list of states per entity; with minimal_response
+    only the first state of each list carries the entity_id. States that are
+    not numbers ('unavailable', missing attributes) are skipped.
+    """
+    series: Dict[str, List[HistoryPoint]] = {}
+    for states in data or []:
+        if not states:
+            continue
+
+        entity_id = states[0].get("entity_id")
+        points: List[HistoryPoint] = []
+        for state in states:
+            timestamp = state.get("last_updated") or state.get("last_changed")
+            if attribute is None:
+                value = _to_float(state.get("state"))
+            else:
+                value = _to_float((state.get("attributes") or {}).get(attribute))
+            if timestamp is None or value is None:
+                continue
+            points.append((datetime.fromisoformat(timestamp).timestamp(), value))
+
+        if entity_id:
+            series[entity_id] = points
+    return series
+
+
+def lttb(points: Sequence[HistoryPoint], threshold: int) -> List[HistoryPoint]:
+    """Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each bucket in between, the
+    point forming the largest triangle with its neighbours, which preserves
+    the visual shape (peaks and dips) far better than plain decimation.
+
+    Args:
+        points: Series ordered by timestamp
+        threshold: Number of points to keep (>= 3 to take effect)
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third triangle vertex.
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_count = next_end - next_start
+        avg_x = sum(point[0] for point in points[next_start:next_end]) / next_count
+        avg_y = sum(point[1] for point in points[next_start:next_end]) / next_count
+
+        ax, ay = points[selected]
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            x, y = points[index]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = index
+
+        sampled.append(points[best])
+        selected = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+class HistoryBuffer:
+    """Fixed-capacity ring buffer of (timestamp, value) samples.
+
+    Timestamps are kept in an array('d') and values in an array('f'), so a
+    day of samples for a room costs a few hundred bytes instead of a list of
+    tuples of boxed floats. When full, the oldest sample is overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of samples kept
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("f", bytes(4 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[HistoryPoint]:
+        for offset in range(self._size):
+            index = (self._start + offset) % self.capacity
+            yield self._timestamps[index], self._values[index]
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        """Timestamp of the newest sample (None when empty)."""
+        if not self._size:
+            return None
+        return self._timestamps[(self._start + self._size - 1) % self.capacity]
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        index = (self._start + self._size) % self.capacity
+        self._timestamps[index] = timestamp
+        self._values[index] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend_downsampled(self, points: Sequence[HistoryPoint], window: float) -> int:
+        """Add samples newer than the buffer, downsampled to the buffer's density.
+
+        The buffer spreads its capacity over window seconds, so a batch
+        covering span seconds is reduced with LTTB to about
+        capacity * span / window samples before it is stored.
+
+        Args:
+            points: Series ordered by timestamp (may overlap the buffer)
+            window: Seconds of history the buffer's capacity represents
+
+        Returns:
+            Number of samples stored
+        """
+        last = self.last_timestamp
+        fresh = [point for point in points if last is None or point[0] > last]
+        if not fresh:
+            return 0
+
+        span = fresh[-1][0] - (last if last is not None else fresh[0][0])
+        target = max(1, math.ceil(self.capacity * span / window)) if window > 0 else len(fresh)
+        if target < len(fresh):
+            # LTTB needs room for both endpoints; tiny batches keep the newest.
+            fresh = lttb(fresh, target) if target >= 3 else fresh[-target:]
+
+        for timestamp, value in fresh:
+            self.append(timestamp, value)
+        return len(fresh)
+
+    def timestamps(self) -> array:
+        """Sample timestamps, oldest first."""
+        return array("d", (timestamp for timestamp, _ in self))
+
+    def values(self) -> array:
+        """Sample values, oldest first."""
+        return array("f", (value for _, value in self))
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._start = 0
+        self._size = 0
+
+
+def window_start(hours: float, now: Optional[datetime] = None) -> datetime:
+    """Start of a history window of the given length ending now (UTC)."""
+    return (now or datetime.now(timezone.utc)) - timedelta(hours=hours)
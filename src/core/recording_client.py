@@ -0,0 +1,335 @@
+"""Record HASS responses to a file and replay them offline.
+
+The recording is a JSON-lines file (gzip-compressed when the path ends in
+'.gz'), one compact record per call:
+
+    {"t": 1730462400.0, "lat": 0.0123, "call": "entity", "args": ["sun.sun"],
+     "result": {"entity_id": "sun.sun", "state": "above_horizon", "attributes": {...}}}
+
+'call' is one of 'entity', 'entities', 'all_states', 'forecast' or
+'history'. History records carry [entity IDs, attribute] as args and
+{entity ID: [[timestamp, value], ...]} as result; the requested period is
+not part of the lookup key, since it moves with the clock.
+"""
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.hass_client import Entity, HASSClient
+from core.history import HistoryPoint
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a recording, transparently compressed when it ends in '.gz'."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _entity_to_json(entity: Optional[Entity]) -> Optional[Dict[str, Any]]:
+    if entity is None:
+        return None
+    return {"entity_id": entity.entity_id, "state": entity.state, "attributes": entity.attributes}
+
+
+def _entity_from_json(data: Optional[Dict[str, Any]]) -> Optional[Entity]:
+    if data is None:
+        return None
+    return Entity(entity_id=data["entity_id"], state=data["state"], attributes=data["attributes"])
+
+
+def _call_key(call: str, args: List[Any]) -> Tuple[Any, ...]:
+    """Lookup key for a call; entity sets are order-independent."""
+    if call == "entities":
+        return (call, tuple(sorted(set(args))))
+    if call == "history":
+        entity_ids, attribute = args
+        return (call, tuple(sorted(set(entity_ids))), attribute)
+    return (call, *args)
+
+
+def _history_to_json(history: Dict[str, List[HistoryPoint]]) -> Dict[str, List[List[float]]]:
+    return {entity_id: [list(point) for point in points] for entity_id, points in history.items()}
+
+
+def _history_from_json(data: Dict[str, List[List[float]]]) -> Dict[str, List[HistoryPoint]]:
+    return {entity_id: [(t, value) for t, value in points] for entity_id, points in data.items()}
+
+
+class RecordingHASSClient(HASSClient):
+    """HASSClient wrapper that writes every response to a recording file.
+
+    Each record carries the wall-clock time of the call and how long the
+    wrapped client took, so ReplayHASSClient can reproduce both the payloads
+    and the timing of a real Home Assistant:
+
+        with RecordingHASSClient(RealHASSClient(url, token), "hass.jsonl.gz") as hass:
+            dashboard = build_dashboard(hass)
+            dashboard.run()
+    """
+
+    def __init__(
+        self,
+        client: HASSClient,
+        path: str,
+        append: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Initialize recording client.
+
+        Args:
+            client: Client whose responses are recorded
+            path: Recording file ('.gz' suffix = gzip-compressed)
+            append: Add to an existing recording instead of replacing it
+            clock: Timer used to measure call latency (injectable for tests)
+        """
+        self.client = client
+        self.path = path
+        self.record_count = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = _open(path, "a" if append else "w")
+
+    def _record(
+        self,
+        call: str,
+        args: List[Any],
+        fetch: Callable[[], Any],
+        encode: Callable[[Any], Any],
+    ) -> Any:
+        """Run fetch, append its encoded result to the recording and return it."""
+        timestamp = time.time()
+        started = self._clock()
+        result = fetch()
+        latency = self._clock() - started
+
+        record = {
+            "t": round(timestamp, 3),
+            "lat": round(latency, 6),
+            "call": call,
+            "args": args,
+            "result": encode(result),
+        }
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.record_count += 1
+        return result
+
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get an entity from the wrapped client and record it."""
+        return self._record(
+            "entity", [entity_id], lambda: self.client.get_entity(entity_id), _entity_to_json
+        )
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get several entities from the wrapped client and record them."""
+        wanted = list(dict.fromkeys(entity_ids))
+        return self._record(
+            "entities",
+            wanted,
+            lambda: self.client.get_entities(wanted),
+            lambda entities: [_entity_to_json(entity) for entity in entities.values()],
+        )
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get all states from the wrapped client and record them."""
+        return self._record(
+            "all_states",
+            [],
+            self.client.get_all_states,
+            lambda entities: [_entity_to_json(entity) for entity in entities.values()],
+        )
+
+    def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get a forecast from the wrapped client and record it."""
+        return self._record(
+            "forecast",
+            [device_id, forecast_type],
+            lambda: self.client.get_forecast(device_id, forecast_type),
+            lambda forecast: forecast,
+        )
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get history from the wrapped client and record it."""
+        wanted = list(dict.fromkeys(entity_ids))
+        return self._record(
+            "history",
+            [wanted, attribute],
+            lambda: self.client.get_history(wanted, start, end, attribute),
+            _history_to_json,
+        )
+
+    def is_available(self) -> bool:
+        """Report the wrapped client's availability."""
+        return self.client.is_available()
+
+    def close(self) -> None:
+        """Close the recording file and the wrapped client."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.client.close()
+
+    def __enter__(self) -> "RecordingHASSClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ReplayHASSClient(HASSClient):
+    """HASSClient that serves a recording made by RecordingHASSClient.
+
+    Identical calls are answered with their recorded responses in order;
+    once a call's responses are used up the last one is repeated, so a short
+    recording can drive any number of dashboard cycles. Entity lookups that
+    were never recorded directly fall back to the latest state of that entity
+    seen anywhere in the recording, and history for a batch that was never
+    recorded as such is served from every sample recorded for its entities.
+    With replay_latency the original call durations are reproduced (scaled
+    by latency_scale).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        replay_latency: bool = False,
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Load a recording.
+
+        Args:
+            path: Recording file written by RecordingHASSClient
+            replay_latency: Sleep for each response's recorded latency
+            latency_scale: Factor applied to recorded latencies (e.g. 0.5 = twice as fast)
+            sleep: Function used to wait (injectable for tests)
+        """
+        self.path = path
+        self.replay_latency = replay_latency
+        self.latency_scale = latency_scale
+        self.request_count = 0
+        self.miss_count = 0
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._responses: Dict[Tuple[Any, ...], List[Tuple[float, Any]]] = {}
+        self._cursors: Dict[Tuple[Any, ...], int] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        # (entity ID, attribute) -> timestamp -> value, over all history records
+        self._history: Dict[Tuple[str, Optional[str]], Dict[float, float]] = {}
+
+        with _open(path, "r") as recording:
+            for line in recording:
+                if line.strip():
+                    self._load(json.loads(line))
+
+    def _load(self, record: Dict[str, Any]) -> None:
+        call, result = record["call"], record["result"]
+        key = _call_key(call, record["args"])
+        self._responses.setdefault(key, []).append((record["lat"], result))
+
+        if call == "history":
+            attribute = record["args"][1]
+            for entity_id, points in result.items():
+                samples = self._history.setdefault((entity_id, attribute), {})
+                samples.update((t, value) for t, value in points)
+            return
+
+        if call == "entity":
+            entities = [result] if result is not None else []
+        elif call in ("entities", "all_states"):
+            entities = result
+        else:
+            entities = []
+        for entity in entities:
+            self._latest[entity["entity_id"]] = entity
+
+    def _replay(self, key: Tuple[Any, ...]) -> Tuple[bool, Any]:
+        """Return (found, recorded result) for the next response to a call."""
+        with self._lock:
+            self.request_count += 1
+            responses = self._responses.get(key)
+            if not responses:
+                self.miss_count += 1
+                return False, None
+
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            latency, result = responses[min(cursor, len(responses) - 1)]
+
+        if self.replay_latency and latency > 0:
+            self._sleep(latency * self.latency_scale)
+        return True, result
+
+    def rewind(self) -> None:
+        """Start serving every call's responses from the beginning again."""
+        with self._lock:
+            self._cursors.clear()
+
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
+        """Get the recorded state of an entity."""
+        found, result = self._replay(_call_key("entity", [entity_id]))
+        if not found:
+            result = self._latest.get(entity_id)
+        return _entity_from_json(result)
+
+    def get_entities(self, entity_ids: Iterable[str]) -> Dict[str, Entity]:
+        """Get the recorded states of several entities."""
+        wanted = list(dict.fromkeys(entity_ids))
+        if not wanted:
+            return {}
+
+        found, result = self._replay(_call_key("entities", wanted))
+        if not found:
+            result = [self._latest[entity_id] for entity_id in wanted if entity_id in self._latest]
+        return {data["entity_id"]: _entity_from_json(data) for data in result}
+
+    def get_all_states(self) -> Dict[str, Entity]:
+        """Get the recorded state dump (or every entity seen in the recording)."""
+        found, result = self._replay(_call_key("all_states", []))
+        if not found:
+            result = list(self._latest.values())
+        return {data["entity_id"]: _entity_from_json(data) for data in result}
+
+    def get_forecast(self, device_id: str, forecast_type: str = "hourly") -> list:
+        """Get the recorded forecast for a device."""
+        found, result = self._replay(_call_key("forecast", [device_id, forecast_type]))
+        return result if found else []
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        attribute: Optional[str] = None,
+    ) -> Dict[str, List[HistoryPoint]]:
+        """Get the recorded history of several entities.
+
+        The recorded responses are served in order, like every other call,
+        regardless of the period asked for.
+        """
+        wanted = list(dict.fromkeys(entity_ids))
+        if not wanted:
+            return {}
+
+        found, result = self._replay(_call_key("history", [wanted, attribute]))
+        if found:
+            return _history_from_json(result)
+
+        history: Dict[str, List[HistoryPoint]] = {}
+        for entity_id in wanted:
+            samples = self._history.get((entity_id, attribute))
+            if samples:
+                history[entity_id] = sorted(samples.items())
+        return history
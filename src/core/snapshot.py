@@ -0,0 +1,86 @@
+"""Versioned on-disk snapshot of the dashboard's last known widget data."""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Bump when the layout of the file or of any widget's snapshot data changes;
+# snapshots with another version are ignored rather than misread.
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class Snapshot:
+    """The last data each widget fetched successfully."""
+
+    saved_at: float
+    widgets: Dict[str, Any] = field(default_factory=dict)
+    version: int = SNAPSHOT_VERSION
+    # When individual widgets' data was fetched, for entries carried over
+    # from an earlier snapshot (missing = saved_at).
+    widget_saved_at: Dict[str, float] = field(default_factory=dict)
+
+    def saved_at_of(self, key: str) -> float:
+        """Get the Unix timestamp of one widget's data."""
+        return self.widget_saved_at.get(key, self.saved_at)
+
+
+def save_snapshot(
+    path: str,
+    widgets: Dict[str, Any],
+    saved_at: Optional[float] = None,
+    widget_saved_at: Optional[Dict[str, float]] = None,
+) -> None:
+    """Write a snapshot atomically.
+
+    The data goes to a temporary file that then replaces the snapshot, so a
+    power cut mid-write leaves the previous snapshot intact.
+
+    Args:
+        path: Snapshot file
+        widgets: JSON-serializable data per widget key
+        saved_at: Unix timestamp of the data (default: now)
+        widget_saved_at: Timestamps of widget entries older than saved_at
+    """
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time() if saved_at is None else saved_at,
+        "widgets": widgets,
+    }
+    if widget_saved_at:
+        payload["widget_saved_at"] = widget_saved_at
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Optional[Snapshot]:
+    """Read a snapshot.
+
+    Returns:
+        The snapshot, or None if it is missing, unreadable or of another version
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading snapshot {path}: {e}")
+        return None
+
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        version = payload.get("version") if isinstance(payload, dict) else None
+        print(f"Ignoring snapshot {path} with unsupported version {version}")
+        return None
+
+    return Snapshot(
+        saved_at=float(payload.get("saved_at") or 0.0),
+        widgets=dict(payload.get("widgets") or {}),
+        widget_saved_at={
+            key: float(saved_at)
+            for key, saved_at in (payload.get("widget_saved_at") or {}).items()
+        },
+    )
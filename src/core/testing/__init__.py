@@ -0,0 +1,12 @@
+"""Local stand-ins for Home Assistant, for tests and load tests.
+
+Not imported by the core package, so production code does not load
+http.server or websockets' server side.
+"""
+from core.testing.fake_hass_server import FakeHASSServer
+from core.testing.fake_hass_websocket import FakeHASSWebSocketServer
+
+__all__ = [
+    "FakeHASSServer",
+    "FakeHASSWebSocketServer",
+]
@@ -0,0 +1,290 @@
+"""In-process stand-in for the Home Assistant REST API.
+
+Serves the endpoints RealHASSClient talks to from an in-memory state table,
+so the real HTTP client can be exercised without a Home Assistant instance.
+Latency, jitter and an error rate can be injected for load tests.
+"""
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+class _FakeHASSRequestHandler(BaseHTTPRequestHandler):
+    """Request handler answering the subset of the HA REST API we use."""
+
+    # Keep-alive needs HTTP/1.1; the default HTTP/1.0 closes after each request.
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+    server: "_FakeHASSHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence the default per-request stderr logging."""
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.owner._record_connection()
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body) if body else {}
+
+    def _simulate(self) -> bool:
+        """Apply injected latency; return False (after answering 500) to fail the request."""
+        fake = self.server.owner
+        fake._record_request()
+        delay = fake._next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        if fake._next_is_error():
+            self._send_json(500, {"message": "Injected server error."})
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        fake = self.server.owner
+        if not self._simulate():
+            return
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/")
+
+        if path == "/api":
+            self._send_json(200, {"message": "API running."})
+        elif path == "/api/states":
+            self._send_json(200, list(fake.states.values()))
+        elif path.startswith("/api/states/"):
+            state = fake.states.get(path[len("/api/states/"):])
+            if state is None:
+                self._send_json(404, {"message": "Entity not found."})
+            else:
+                self._send_json(200, state)
+        elif path.startswith("/api/history/period"):
+            start = unquote(path[len("/api/history/period"):].lstrip("/"))
+            query = parse_qs(url.query, keep_blank_values=True)
+            self._send_json(200, fake._history_response(start, query))
+        else:
+            self._send_json(404, {"message": "Not found."})
+
+    def do_POST(self) -> None:
+        fake = self.server.owner
+        data = self._read_json()
+        if not self._simulate():
+            return
+        path = urlsplit(self.path).path.rstrip("/")
+
+        if path == "/api/services/weather/get_forecasts":
+            target = data.get("device_id") or data.get("entity_id") or "weather.home"
+            forecast = fake.forecasts.get(data.get("type", "hourly"), [])
+            self._send_json(
+                200,
+                {"changed_states": [], "service_response": {target: {"forecast": forecast}}},
+            )
+        else:
+            self._send_json(404, {"message": "Service not found."})
+
+
+class _FakeHASSHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, owner: "FakeHASSServer", address):
+        self.owner = owner
+        super().__init__(address, _FakeHASSRequestHandler)
+
+
+class FakeHASSServer:
+    """Local HTTP server that mimics the Home Assistant REST API.
+
+    Use as a context manager; the server runs on a background thread and
+    listens on an ephemeral localhost port:
+
+        with FakeHASSServer(latency=0.02, jitter=0.01, error_rate=0.01) as server:
+            client = RealHASSClient(server.url, "token")
+
+    Every request waits latency +/- jitter seconds (requests are served
+    concurrently, one thread each) and fails with a 500 at error_rate.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        entity_count: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the fake server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+            latency: Mean delay in seconds before each response
+            jitter: Maximum random deviation from latency, in seconds
+            error_rate: Probability (0-1) that a request fails with HTTP 500
+            entity_count: Number of filler sensor entities to serve
+            seed: Seed for the latency/error random generator (reproducible runs)
+        """
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self.forecasts: Dict[str, list] = {}
+        self.history: Dict[str, List[Dict[str, Any]]] = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self.connection_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _FakeHASSHTTPServer(self, (host, port))
+        self._thread: Optional[threading.Thread] = None
+        self.add_filler_entities(entity_count)
+
+    @property
+    def url(self) -> str:
+        """Base API URL to hand to RealHASSClient."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def set_state(
+        self, entity_id: str, state: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Set the state served for an entity."""
+        timestamp = "2025-11-01T12:00:00+00:00"
+        self.states[entity_id] = {
+            "entity_id": entity_id,
+            "state": state,
+            "attributes": attributes or {},
+            "last_changed": timestamp,
+            "last_updated": timestamp,
+            "context": {"id": "fake", "parent_id": None, "user_id": None},
+        }
+
+    def add_filler_entities(self, count: int, prefix: str = "sensor.filler") -> None:
+        """Add count synthetic sensor entities, to size the /api/states payload."""
+        for index in range(count):
+            self.set_state(
+                f"{prefix}_{index}",
+                str(20 + index % 10),
+                {"unit_of_measurement": "°C", "friendly_name": f"Filler {index}"},
+            )
+
+    def add_history(
+        self,
+        entity_id: str,
+        when: datetime,
+        state: str,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add a past state change served by /api/history/period."""
+        timestamp = when.isoformat()
+        self.history.setdefault(entity_id, []).append(
+            {
+                "entity_id": entity_id,
+                "state": state,
+                "attributes": attributes or {},
+                "last_changed": timestamp,
+                "last_updated": timestamp,
+            }
+        )
+        self.history[entity_id].sort(key=lambda change: change["last_updated"])
+
+    def _history_response(self, start: str, query: Dict[str, List[str]]) -> list:
+        """Answer a history request the way Home Assistant shapes it."""
+        now = datetime.now(timezone.utc)
+        first = datetime.fromisoformat(start) if start else now - timedelta(days=1)
+        end = query.get("end_time")
+        last = datetime.fromisoformat(end[0]) if end else now
+        entity_ids = [
+            entity_id
+            for value in query.get("filter_entity_id", [])
+            for entity_id in value.split(",")
+            if entity_id
+        ]
+        minimal = "minimal_response" in query
+        no_attributes = "no_attributes" in query
+
+        response = []
+        for entity_id in entity_ids:
+            changes = [
+                dict(change)
+                for change in self.history.get(entity_id, [])
+                if first <= datetime.fromisoformat(change["last_updated"]) <= last
+            ]
+            if not changes:
+                continue
+            for index, change in enumerate(changes):
+                if no_attributes:
+                    change["attributes"] = {}
+                if minimal and index > 0:
+                    changes[index] = {
+                        "state": change["state"],
+                        "last_changed": change["last_changed"],
+                    }
+            response.append(changes)
+        return response
+
+    def set_forecast(self, forecast_data: list, forecast_type: str = "hourly") -> None:
+        """Set the forecast returned by the weather.get_forecasts service."""
+        self.forecasts[forecast_type] = forecast_data
+
+    def _next_delay(self) -> float:
+        with self._lock:
+            offset = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + offset)
+
+    def _next_is_error(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return failed
+
+    def _record_request(self) -> None:
+        with self._lock:
+            self.request_count += 1
+
+    def _record_connection(self) -> None:
+        with self._lock:
+            self.connection_count += 1
+
+    def start(self) -> "FakeHASSServer":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving (if started) and release the socket."""
+        # shutdown() waits for serve_forever() to exit, so it would block
+        # forever on a server that was never started.
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeHASSServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
@@ -0,0 +1,177 @@
+"""In-process stand-in for the Home Assistant WebSocket API.
+
+Implements the handshake, 'subscribe_entities' and 'call_service' commands
+used by WebSocketHASSClient, and lets tests push state changes or drop
+connections to exercise reconnect and resync.
+"""
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeHASSWebSocketServer:
+    """Local WebSocket server that mimics the Home Assistant WebSocket API.
+
+        with FakeHASSWebSocketServer(token="secret") as server:
+            client = WebSocketHASSClient(server.url, "secret")
+    """
+
+    def __init__(self, token: str = "token", host: str = "127.0.0.1", port: int = 0):
+        """Initialize the fake server.
+
+        Args:
+            token: Access token accepted during the auth handshake
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+        """
+        from websockets.sync.server import serve
+
+        self.token = token
+        self.states: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.forecast_data: list = []
+        self.connection_count = 0
+        self.subscribed_entity_ids: List[List[str]] = []
+        self._lock = threading.Lock()
+        # connection -> list of (subscription id, entity ids)
+        self._subscribers: Dict[Any, List[Tuple[int, List[str]]]] = {}
+        self._server = serve(self._handle_connection, host, port, compression=None)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """WebSocket URL to hand to WebSocketHASSClient."""
+        host, port = self._server.socket.getsockname()[:2]
+        return f"ws://{host}:{port}/api/websocket"
+
+    def start(self) -> "FakeHASSWebSocketServer":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Close client connections and stop serving (if started)."""
+        self.drop_connections()
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        else:
+            self._server.socket.close()
+
+    def __enter__(self) -> "FakeHASSWebSocketServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def set_forecast(self, forecast_data: list) -> None:
+        """Set the forecast returned by weather.get_forecasts."""
+        self.forecast_data = forecast_data
+
+    def set_state(
+        self, entity_id: str, state: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Set an entity state and push the change to subscribed clients."""
+        attributes = dict(attributes or {})
+        with self._lock:
+            previous = self.states.get(entity_id)
+            self.states[entity_id] = (state, attributes)
+            subscribers = [
+                (connection, subscription_id)
+                for connection, subscriptions in self._subscribers.items()
+                for subscription_id, entity_ids in subscriptions
+                if entity_id in entity_ids
+            ]
+
+        if previous is None:
+            event = {"a": {entity_id: {"s": state, "a": attributes}}}
+        else:
+            removed = [name for name in previous[1] if name not in attributes]
+            changed = {
+                name: value
+                for name, value in attributes.items()
+                if previous[1].get(name) != value
+            }
+            diff: Dict[str, Any] = {"+": {"s": state, "a": changed}}
+            if removed:
+                diff["-"] = {"a": removed}
+            event = {"c": {entity_id: diff}}
+
+        for connection, subscription_id in subscribers:
+            self._send(connection, {"id": subscription_id, "type": "event", "event": event})
+
+    def remove_state(self, entity_id: str) -> None:
+        """Remove an entity and notify subscribed clients."""
+        with self._lock:
+            self.states.pop(entity_id, None)
+            subscribers = [
+                (connection, subscription_id)
+                for connection, subscriptions in self._subscribers.items()
+                for subscription_id, entity_ids in subscriptions
+                if entity_id in entity_ids
+            ]
+
+        for connection, subscription_id in subscribers:
+            self._send(connection, {"id": subscription_id, "type": "event", "event": {"r": [entity_id]}})
+
+    def drop_connections(self) -> None:
+        """Abruptly close every client connection (simulates a HA restart)."""
+        with self._lock:
+            connections = list(self._subscribers)
+        for connection in connections:
+            connection.close()
+
+    def _send(self, connection: Any, message: Dict[str, Any]) -> None:
+        try:
+            connection.send(json.dumps(message))
+        except Exception:
+            pass
+
+    def _handle_connection(self, connection: Any) -> None:
+        """Serve one client: handshake, then answer commands until it closes."""
+        with self._lock:
+            self.connection_count += 1
+            self._subscribers[connection] = []
+
+        try:
+            connection.send(json.dumps({"type": "auth_required", "ha_version": "2025.11.0"}))
+            auth = json.loads(connection.recv())
+            if auth.get("access_token") != self.token:
+                connection.send(json.dumps({"type": "auth_invalid", "message": "Invalid access token"}))
+                return
+            connection.send(json.dumps({"type": "auth_ok", "ha_version": "2025.11.0"}))
+
+            for raw in connection:
+                self._handle_command(connection, json.loads(raw))
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._subscribers.pop(connection, None)
+
+    def _handle_command(self, connection: Any, message: Dict[str, Any]) -> None:
+        message_id = message.get("id")
+        command = message.get("type")
+
+        if command == "subscribe_entities":
+            entity_ids = list(message.get("entity_ids") or [])
+            with self._lock:
+                self.subscribed_entity_ids.append(entity_ids)
+                self._subscribers[connection].append((message_id, entity_ids))
+                initial = {
+                    entity_id: {"s": self.states[entity_id][0], "a": self.states[entity_id][1]}
+                    for entity_id in entity_ids
+                    if entity_id in self.states
+                }
+            self._send(connection, {"id": message_id, "type": "result", "success": True, "result": None})
+            self._send(connection, {"id": message_id, "type": "event", "event": {"a": initial}})
+        elif command == "call_service" and message.get("service") == "get_forecasts":
+            target = (message.get("target") or {}).get("device_id", "weather.home")
+            result = {"context": {"id": "fake"}, "response": {target: {"forecast": self.forecast_data}}}
+            self._send(connection, {"id": message_id, "type": "result", "success": True, "result": result})
+        elif command == "ping":
+            self._send(connection, {"id": message_id, "type": "pong"})
+        else:
+            error = {"code": "unknown_command", "message": f"Unknown command: {command}"}
+            self._send(connection, {"id": message_id, "type": "result", "success": False, "error": error})
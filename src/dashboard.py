@@ -1,20 +1,95 @@
 """Main orchestrator for the dashboard."""
-from typing import List
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from rendering.frame_server import FrameServer
 from rendering.renderer import Renderer
 from components.widget import Widget
+from core.async_hass_client import AnyHASSClient, AsyncHASSClient
+from core.hass_client import Entity
+from core.snapshot import load_snapshot, save_snapshot
+
+
+@dataclass
+class CycleMetrics:
+    """Timing and deadline statistics of the dashboard's run cycles."""
+
+    cycles: int = 0
+    # Cycles in which at least one widget missed its fetch deadline.
+    overrun_cycles: int = 0
+    # Cycles that took longer than the cycle budget overall.
+    budget_misses: int = 0
+    # Missed fetch deadlines per widget class name.
+    widget_overruns: Dict[str, int] = field(default_factory=dict)
+    last_fetch_seconds: float = 0.0
+    last_render_seconds: float = 0.0
+    last_cycle_seconds: float = 0.0
+
+    def record_overruns(self, widgets: List[Widget]) -> None:
+        """Count the widgets that missed this cycle's fetch deadline."""
+        if widgets:
+            self.overrun_cycles += 1
+        for widget in widgets:
+            name = type(widget).__name__
+            self.widget_overruns[name] = self.widget_overruns.get(name, 0) + 1
 
 
 class Dashboard:
     """Main orchestrator that manages widgets and rendering."""
 
-    def __init__(self, renderer: Renderer):
+    def __init__(
+        self,
+        renderer: Renderer,
+        snapshot_path: Optional[str] = None,
+        stale_marker_position: Tuple[int, int] = (10, 460),
+        max_workers: Optional[int] = None,
+        cycle_deadline: Optional[float] = None,
+        cycle_budget: Optional[float] = None,
+        render_reserve: Optional[float] = None,
+        frame_server: Optional[FrameServer] = None,
+    ):
         """Initialize dashboard.
         
         Args:
             renderer: Rendering backend (PIL, hardware, etc.)
+            snapshot_path: File for the last-known-state snapshot (None = disabled)
+            stale_marker_position: Where to note that snapshot data is shown
+            max_workers: Update widgets on a thread pool of this size
+                (None = serial updates)
+            cycle_deadline: In threaded mode, seconds update_all() waits
+                for widgets before leaving the rest stale (None = no deadline)
+            cycle_budget: Seconds run() may take from start to pushed frame;
+                fetches get what is left after reserving time for rendering.
+                Implies threaded mode (4 workers unless max_workers is set),
+                since a serial fetch cannot be cut short.
+            render_reserve: Seconds of the budget kept for render(); None uses
+                the duration of the previous render
+            frame_server: FrameServer to publish every rendered frame to, for
+                other screens (renderers without an image, e.g. NullRenderer,
+                publish nothing)
         """
+        if cycle_budget is not None and max_workers is None:
+            max_workers = 4
+
         self.renderer = renderer
         self.widgets: List[Widget] = []
+        self.snapshot_path = snapshot_path
+        self.stale_marker_position = stale_marker_position
+        self.snapshot_time: Optional[datetime] = None
+        # When the data restored into each widget was fetched.
+        self._snapshot_times: Dict[Widget, datetime] = {}
+        self.max_workers = max_workers
+        self.cycle_deadline = cycle_deadline
+        self.cycle_budget = cycle_budget
+        self.render_reserve = render_reserve
+        self.frame_server = frame_server
+        self.metrics = CycleMetrics()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Updates that missed a deadline and are still running.
+        self._in_flight: Dict[Widget, Future] = {}
 
     def add_widget(self, widget: Widget) -> None:
         """Add a widget to the dashboard.
@@ -23,22 +98,412 @@ class Dashboard:
             widget: Widget instance to add
         """
         self.widgets.append(widget)
+        if self.max_workers is not None:
+            widget.executor = self._get_executor()
 
-    def update_all(self) -> None:
-        """Update all widgets (fetch fresh data if needed)."""
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the bounded worker pool used in threaded mode."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="dashboard"
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the worker pool without waiting for straggling updates."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def entity_ids(self) -> List[str]:
+        """Get every HASS entity ID read by the dashboard's widgets."""
+        entity_ids: List[str] = []
         for widget in self.widgets:
-            widget.update()
+            entity_ids.extend(widget.entity_ids())
+        return list(dict.fromkeys(entity_ids))
+
+    def _entity_batches(self, widgets: List[Widget]) -> List[Tuple[AnyHASSClient, List[str]]]:
+        """Group the entity IDs of the widgets due for an update by HASS client."""
+        batches: Dict[int, Tuple[AnyHASSClient, List[str]]] = {}
+        for widget in widgets:
+            if not widget.needs_update():
+                continue
+            entity_ids = widget.prefetch_entity_ids()
+            if entity_ids:
+                client = widget.hass_client
+                batches.setdefault(id(client), (client, []))[1].extend(entity_ids)
+        return [(client, list(dict.fromkeys(ids))) for client, ids in batches.values()]
+
+    @staticmethod
+    def _prefetch(client: AnyHASSClient, entity_ids: List[str]) -> Optional[Dict[str, Entity]]:
+        """Fetch a batch of entities for the cycle.
+
+        Returns:
+            The entity states, or None if the request raised (the client's
+            widgets then fetch their own entities)
+        """
+        try:
+            return client.get_entities(entity_ids)
+        except Exception as e:
+            print(f"Error prefetching entities: {e}")
+            return None
+
+    @staticmethod
+    async def _prefetch_async(
+        client: AnyHASSClient, entity_ids: List[str]
+    ) -> Optional[Dict[str, Entity]]:
+        """Async counterpart of _prefetch; sync clients run in a worker thread."""
+        try:
+            if isinstance(client, AsyncHASSClient):
+                return await client.get_entities(entity_ids)
+            return await asyncio.to_thread(client.get_entities, entity_ids)
+        except Exception as e:
+            print(f"Error prefetching entities: {e}")
+            return None
+
+    def _available_widgets(self) -> List[Widget]:
+        """Get the widgets whose HASS client is currently reachable.
+
+        Widgets behind an unavailable client (e.g. an open circuit breaker)
+        are skipped for this cycle and render the data they already have.
+        """
+        available = [widget for widget in self.widgets if widget.hass_client.is_available()]
+        skipped = len(self.widgets) - len(available)
+        if skipped:
+            print(f"Home Assistant unavailable; rendering cached data for {skipped} widget(s)")
+        return available
+
+    def update_all(self, deadline: Optional[float] = None) -> List[Widget]:
+        """Update all widgets (fetch fresh data if needed).
+
+        Serial by default. With max_workers set the widgets update in
+        parallel on the thread pool. Either way the entities of all widgets
+        are fetched up front with one get_entities call per HASS client
+        (see Widget.prefetch_entity_ids).
+
+        Args:
+            deadline: Threaded mode only: seconds to wait for widget updates,
+                overriding cycle_deadline
+
+        Returns:
+            Widgets that missed the deadline and show stale data
+        """
+        widgets = self._available_widgets()
+        if self.max_workers is None:
+            prefetched = {
+                id(client): self._prefetch(client, entity_ids)
+                for client, entity_ids in self._entity_batches(widgets)
+                if not isinstance(client, AsyncHASSClient)
+            }
+            for widget in widgets:
+                widget.update(prefetched.get(id(widget.hass_client)))
+            return []
+
+        if deadline is None:
+            deadline = self.cycle_deadline
+        return self._update_all_threaded(widgets, deadline)
+
+    def _update_all_threaded(
+        self, widgets: List[Widget], deadline: Optional[float]
+    ) -> List[Widget]:
+        """Run widget updates on the pool and wait for them up to the deadline.
+
+        A widget that misses the deadline keeps its previous data and is
+        flagged stale; its update keeps running and is not restarted until it
+        finishes, at which point the widget picks up the fresh data. The
+        entity prefetch runs on the pool too, so the deadline covers it.
+        """
+        executor = self._get_executor()
+        futures: Dict[Widget, Future] = {}
+        starting: List[Widget] = []
+        for widget in widgets:
+            running = self._in_flight.get(widget)
+            if running is not None and not running.done():
+                futures[widget] = running
+            else:
+                starting.append(widget)
+
+        # Submitted first, so workers pick them up before any widget waits on them.
+        prefetches = {
+            id(client): executor.submit(self._prefetch, client, entity_ids)
+            for client, entity_ids in self._entity_batches(starting)
+            if not isinstance(client, AsyncHASSClient)
+        }
+        for widget in starting:
+            prefetch = prefetches.get(id(widget.hass_client))
+            futures[widget] = executor.submit(self._update_prefetched, widget, prefetch)
+
+        wait(futures.values(), timeout=deadline)
+
+        missed = []
+        for widget, future in futures.items():
+            name = type(widget).__name__
+            if not future.done():
+                widget.stale = True
+                self._in_flight[widget] = future
+                missed.append(widget)
+                print(f"{name} missed the {deadline}s update deadline; keeping cached data")
+                continue
+
+            self._in_flight.pop(widget, None)
+            error = future.exception()
+            if error is not None:
+                print(f"Error updating {name}: {error}")
+
+        return missed
+
+    @staticmethod
+    def _update_prefetched(widget: Widget, prefetch: Optional[Future]) -> None:
+        """Update a widget once its client's entity prefetch is done."""
+        widget.update(prefetch.result() if prefetch is not None else None)
+
+    async def update_all_async(
+        self, timeout: Optional[float] = None, deadline: Optional[float] = None
+    ) -> List[Widget]:
+        """Update all widgets concurrently.
+
+        Widgets fetch in parallel, so the update takes roughly as long as the
+        slowest fetch instead of the sum of all of them. A widget that exceeds
+        its timeout keeps its previously cached data and is flagged stale.
+        The entities of all widgets are fetched once per HASS client,
+        concurrently with the widgets' other requests, and count towards each
+        widget's timeout.
+
+        Args:
+            timeout: Default per-widget timeout in seconds; a widget's own
+                fetch_timeout takes precedence (None = wait indefinitely)
+            deadline: Upper bound in seconds for every widget's timeout,
+                including its own fetch_timeout (None = no bound)
+
+        Returns:
+            Widgets that timed out and show stale data
+        """
+        widgets = self._available_widgets()
+        prefetches = {
+            id(client): asyncio.ensure_future(self._prefetch_async(client, entity_ids))
+            for client, entity_ids in self._entity_batches(widgets)
+        }
+        finished = await asyncio.gather(
+            *(
+                self._update_widget_async(
+                    widget, timeout, deadline, prefetches.get(id(widget.hass_client))
+                )
+                for widget in widgets
+            )
+        )
+        # Nobody is left waiting for a prefetch that outlived every timeout.
+        for prefetch in prefetches.values():
+            prefetch.cancel()
+        return [widget for widget, ok in zip(widgets, finished) if not ok]
+
+    async def _update_widget_async(
+        self,
+        widget: Widget,
+        timeout: Optional[float],
+        deadline: Optional[float] = None,
+        prefetch: Optional[asyncio.Future] = None,
+    ) -> bool:
+        """Update one widget, isolating its timeout and errors from the others.
+
+        Returns:
+            False if the widget timed out
+        """
+        widget_timeout = widget.fetch_timeout if widget.fetch_timeout is not None else timeout
+        if deadline is not None:
+            widget_timeout = deadline if widget_timeout is None else min(widget_timeout, deadline)
+        name = type(widget).__name__
+
+        try:
+            await asyncio.wait_for(self._update_prefetched_async(widget, prefetch), widget_timeout)
+        except asyncio.TimeoutError:
+            widget.stale = True
+            print(f"Timed out updating {name} after {widget_timeout}s; keeping cached data")
+            return False
+        except Exception as e:
+            print(f"Error updating {name}: {e}")
+        return True
+
+    @staticmethod
+    async def _update_prefetched_async(
+        widget: Widget, prefetch: Optional[asyncio.Future]
+    ) -> None:
+        """Update a widget once its client's entity prefetch is done."""
+        entities = None
+        if prefetch is not None:
+            # Shielded: one widget timing out must not cancel the shared prefetch.
+            entities = await asyncio.shield(prefetch)
+        await widget.update_async(entities)
+
+    def _widget_keys(self) -> List[str]:
+        """Stable key per widget: its position and type."""
+        return [f"{index}:{type(widget).__name__}" for index, widget in enumerate(self.widgets)]
+
+    def save_snapshot(self) -> bool:
+        """Persist the data of every widget showing fresh data.
+
+        The fresh data is merged into the existing snapshot: a widget whose
+        fetch failed, timed out or returned nothing keeps its entry (and that
+        entry's timestamp) from the last cycle in which it did fetch data.
+        A cycle without any fresh data leaves the file alone.
+
+        Returns:
+            True if a snapshot was written
+        """
+        if self.snapshot_path is None:
+            return False
+
+        widgets: Dict[str, Any] = {}
+        carried: List[str] = []
+        for key, widget in zip(self._widget_keys(), self.widgets):
+            fresh = not widget.stale and widget.last_update is not None
+            data = widget.to_snapshot() if fresh else None
+            if data is not None:
+                widgets[key] = data
+            else:
+                carried.append(key)
+        if not widgets:
+            return False
+
+        now = time.time()
+        widget_saved_at: Dict[str, float] = {}
+        previous = load_snapshot(self.snapshot_path) if carried else None
+        if previous is not None:
+            for key in carried:
+                if key in previous.widgets:
+                    widgets[key] = previous.widgets[key]
+                    widget_saved_at[key] = previous.saved_at_of(key)
+
+        try:
+            save_snapshot(self.snapshot_path, widgets, now, widget_saved_at)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving snapshot {self.snapshot_path}: {e}")
+            return False
+        return True
+
+    def restore_snapshot(self) -> bool:
+        """Load the last snapshot into the widgets, marking them stale.
+
+        Widgets keep needing an update, so the next update_all() replaces the
+        restored data.
+
+        Returns:
+            True if at least one widget was restored
+        """
+        if self.snapshot_path is None:
+            return False
+
+        snapshot = load_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return False
+
+        restored = False
+        for key, widget in zip(self._widget_keys(), self.widgets):
+            data = snapshot.widgets.get(key)
+            if data is None:
+                continue
+            try:
+                widget.restore_snapshot(data)
+                restored = True
+            except Exception as e:
+                print(f"Error restoring {key} from snapshot: {e}")
+                continue
+            self._snapshot_times[widget] = datetime.fromtimestamp(snapshot.saved_at_of(key))
+
+        if restored:
+            self.snapshot_time = min(self._snapshot_times.values())
+        return restored
+
+    def warm_start(self) -> bool:
+        """Render the last snapshot immediately, before any network fetch.
+
+        Returns:
+            True if snapshot data was rendered
+        """
+        if not self.restore_snapshot():
+            return False
+
+        self.render()
+        return True
 
     def render(self) -> None:
         """Render all widgets to the output."""
         self.renderer.clear()
 
-        for widget in self.widgets:
+        for key, widget in zip(self._widget_keys(), self.widgets):
+            self.renderer.begin_widget(key)
             widget.render()
+            if widget.stale:
+                widget.render_stale_marker()
+
+        self.renderer.begin_widget("dashboard")
+        stale_since = self._stale_since()
+        if stale_since is not None:
+            self.renderer.draw_text(
+                self.stale_marker_position,
+                f"Cached: {stale_since:%Y-%m-%d %H:%M:%S}",
+                style="small",
+                fill=0,
+            )
 
         self.renderer.render()
+        if self.frame_server is not None:
+            image = self.renderer.get_image()
+            if image is not None:
+                self.frame_server.publish(image)
 
-    def run(self) -> None:
-        """Main run loop: update and render."""
-        self.update_all()
+    def _stale_since(self) -> Optional[datetime]:
+        """Get when the oldest data shown by a stale widget was fetched."""
+        times = [
+            widget.last_update or self._snapshot_times.get(widget, self.snapshot_time)
+            for widget in self.widgets
+            if widget.stale
+        ]
+        times = [fetched for fetched in times if fetched is not None]
+        return min(times) if times else None
+
+    def _fetch_budget(self, started: float, budget: Optional[float]) -> Optional[float]:
+        """Seconds left for fetching once time for rendering is set aside."""
+        if budget is None:
+            return None
+
+        reserve = self.render_reserve
+        if reserve is None:
+            reserve = self.metrics.last_render_seconds
+        return max(0.0, budget - (time.monotonic() - started) - reserve)
+
+    def _finish_cycle(self, started: float, fetched: float, missed: List[Widget]) -> None:
+        """Render and persist the frame, then record the cycle's metrics."""
         self.render()
+        rendered = time.monotonic()
+        self.save_snapshot()
+
+        metrics = self.metrics
+        metrics.cycles += 1
+        metrics.record_overruns(missed)
+        metrics.last_fetch_seconds = fetched - started
+        metrics.last_render_seconds = rendered - fetched
+        metrics.last_cycle_seconds = rendered - started
+        if self.cycle_budget is not None and metrics.last_cycle_seconds > self.cycle_budget:
+            metrics.budget_misses += 1
+
+    def run(self) -> None:
+        """Main run loop: update, render and persist the snapshot.
+
+        With a cycle_budget, fetching stops when the budget minus the render
+        reserve is used up; widgets still fetching render their cached data
+        with a stale marker, so the frame goes out on schedule.
+        """
+        started = time.monotonic()
+        missed = self.update_all(deadline=self._fetch_budget(started, self.cycle_budget))
+        self._finish_cycle(started, time.monotonic(), missed)
+
+    async def run_async(self, timeout: Optional[float] = None) -> None:
+        """Async run loop: update all widgets concurrently, render, persist the snapshot.
+
+        A cycle_budget bounds every widget's fetch like in run().
+        """
+        started = time.monotonic()
+        missed = await self.update_all_async(
+            timeout, deadline=self._fetch_budget(started, self.cycle_budget)
+        )
+        self._finish_cycle(started, time.monotonic(), missed)
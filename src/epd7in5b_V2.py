@@ -219,6 +219,19 @@ class EPD:
         epdconfig.delay_ms(100)
         self.ReadBusy()
 
+    def display_raw(self, black, red):
+        # Buffers already in panel order (see rendering.framebuffer.FrameBuffer):
+        # black as PIL packs it (1 = white), red inverted (1 = red). Sent as is.
+        self.send_command(0x10)
+        self.send_data2(black)
+
+        self.send_command(0x13)
+        self.send_data2(red)
+
+        self.send_command(0x12)
+        epdconfig.delay_ms(100)
+        self.ReadBusy()
+
     def display_Base_color(self, color):
         if(self.width % 8 == 0):
             Width = self.width // 8
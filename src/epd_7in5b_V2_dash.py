@@ -3,6 +3,8 @@ import epd7in5b_V2
 import time
 from pathlib import Path
 from PIL import Image,ImageDraw
+from rendering.background import BackgroundTemplate
+from rendering.framebuffer import FrameBuffer
 
 _ASSETS = Path(__file__).parent.parent / "assets"
 
@@ -25,7 +27,9 @@ logging.basicConfig(level=logging.INFO)
 def create_image_for_display() -> Image.Image:
     client = get_hass_client()
 
-    im = Image.open(_ASSETS / "hass-dash-house.bmp")
+    background_path = _ASSETS / "hass-dash-house.bmp"
+    with BackgroundTemplate.load(background_path, (800, 480), cache=True) as background:
+        im = background.to_image()
     draw = ImageDraw.Draw(im)
     
     hass_sun = HassSun(client)
@@ -64,7 +68,7 @@ def main() -> None:
         logging.info(f"epd.Clear() took {elapsed_clear:.2f} seconds")
 
         start_clear = time.time()
-        Other = Image.new('1', (epd.width, epd.height), 255)  # 255: clear the frame  
+        frame = FrameBuffer(epd.width, epd.height)
         elapsed_clear = (time.time() - start_clear)
         logging.info(f"Drawing in buffer took {elapsed_clear:.2f} seconds")
         
@@ -73,7 +77,7 @@ def main() -> None:
         
         im_black = create_image_for_display()
 
-        epd.display(epd.getbuffer(im_black), epd.getbuffer(Other))
+        epd.display_raw(frame.pack_black(im_black), frame.clear_red())
         
         elapsed_clear = (time.time() - start_clear)
         logging.info(f"Display buffer took {elapsed_clear:.2f} seconds")
@@ -1,4 +1,14 @@
 """Rendering implementations."""
 from rendering.renderer import Renderer, PILRenderer
+from rendering.layers import LayeredPILRenderer
+from rendering.epd_renderer import EPDRenderer
+from rendering.recording import NullRenderer, RecordingRenderer
 
-__all__ = ["Renderer", "PILRenderer"]
+__all__ = [
+    "Renderer",
+    "PILRenderer",
+    "LayeredPILRenderer",
+    "EPDRenderer",
+    "NullRenderer",
+    "RecordingRenderer",
+]
@@ -0,0 +1,181 @@
+"""Background image kept as a packed 1-bit template.
+
+Decoding hass-dash-house.bmp (and converting and resizing it) is done
+once; the result is kept as packed mode "1" bytes, the panel's own
+layout. The template can be cached as a raw file next to the BMP, which
+later startups map with mmap instead of decoding the BMP:
+
+    with BackgroundTemplate.load("assets/hass-dash-house.bmp", (800, 480), cache=True) as template:
+        image = template.to_image()
+
+Raw file layout: MAGIC, width and height as 2-byte big-endian integers,
+then the packed rows (8 pixels per byte, 1 = white). The file is replaced
+atomically, so processes that have the old one mapped keep reading it.
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from PIL import Image
+
+MAGIC = b"HDBGRND1"
+HEADER = struct.Struct(">HH")
+
+
+def raw_cache_path(path: Union[str, Path]) -> Path:
+    """Path of the raw template cached next to a background BMP."""
+    return Path(path).with_suffix(".1bpp")
+
+
+class BackgroundTemplate:
+    """A frame-sized background as packed 1-bit bytes."""
+
+    def __init__(self, size: Tuple[int, int], data: Union[bytes, memoryview]):
+        """Initialize template.
+
+        Args:
+            size: Frame size as (width, height)
+            data: Packed mode "1" rows, ((width + 7) // 8) * height bytes
+
+        Raises:
+            ValueError: If data does not match the size
+        """
+        width, height = size
+        expected = (width + 7) // 8 * height
+        if len(data) != expected:
+            raise ValueError(f"Background data is {len(data)} bytes, expected {expected}")
+        self.size = size
+        self.data = data
+        # Set by map(); released by close()
+        self._mapping: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def from_image(cls, image: Any, size: Tuple[int, int]) -> "BackgroundTemplate":
+        """Pack an image, converted to mode "1" and resized to the frame."""
+        if image.mode != "1":
+            image = image.convert("1")
+        if image.size != size:
+            image = image.resize(size)
+        return cls(size, image.tobytes())
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        size: Tuple[int, int],
+        cache: bool = False,
+    ) -> "BackgroundTemplate":
+        """Load a background BMP, through its raw cache file when enabled.
+
+        The cache is used when it is at least as new as the BMP and of the
+        right size; otherwise the BMP is decoded and the cache rewritten.
+
+        Raises:
+            OSError: If the BMP cannot be read
+        """
+        cache_path = raw_cache_path(path)
+        if cache and _is_fresh(cache_path, Path(path)):
+            try:
+                template = cls.map(cache_path)
+                if template.size == size:
+                    return template
+            except (OSError, ValueError) as e:
+                print(f"Error loading background cache {cache_path}: {e}")
+
+        with Image.open(path) as loaded:
+            template = cls.from_image(loaded, size)
+        if cache:
+            try:
+                template.save(cache_path)
+            except OSError as e:
+                print(f"Error writing background cache {cache_path}: {e}")
+        return template
+
+    @classmethod
+    def map(cls, path: Union[str, Path]) -> "BackgroundTemplate":
+        """Map a raw template file written by save() into memory.
+
+        Raises:
+            ValueError: If the file is not a raw background template
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[: len(MAGIC)] != MAGIC:
+            mapped.close()
+            raise ValueError(f"Not a background template: {path}")
+        size = HEADER.unpack_from(mapped, len(MAGIC))
+        view = memoryview(mapped)
+        try:
+            template = cls(size, view[len(MAGIC) + HEADER.size:])
+        except ValueError:
+            view.release()
+            mapped.close()
+            raise
+        template._mapping, template._view = mapped, view
+        return template
+
+    def close(self) -> None:
+        """Unmap the file behind a mapped template; data is unusable afterwards."""
+        if self._mapping is None:
+            return
+        if isinstance(self.data, memoryview):
+            self.data.release()
+        self._view.release()
+        self._mapping.close()
+        self._mapping = self._view = None
+
+    def __enter__(self) -> "BackgroundTemplate":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the template as a raw file.
+
+        The data goes to a temporary file in the same directory that then
+        replaces the target. Rewriting a mapped file in place would make the
+        processes mapping it fault (SIGBUS) on the truncated pages.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC)
+                f.write(HEADER.pack(*self.size))
+                f.write(self.data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def to_image(self) -> Any:
+        """Unpack the template into a new mode "1" image."""
+        return Image.frombytes("1", self.size, bytes(self.data))
+
+
+def _is_fresh(cache_path: Path, source: Path) -> bool:
+    """Check whether a cache file exists and is not older than its source."""
+    try:
+        return cache_path.stat().st_mtime >= source.stat().st_mtime
+    except OSError:
+        return False
+
+
+def load_background(
+    path: Union[str, Path], size: Tuple[int, int], cache: bool = False
+) -> Optional[BackgroundTemplate]:
+    """Load a background template, or None if the BMP cannot be read."""
+    try:
+        return BackgroundTemplate.load(path, size, cache=cache)
+    except OSError:
+        return None
@@ -0,0 +1,50 @@
+"""Display lists: recorded draw commands compared between frames."""
+from dataclasses import dataclass
+from typing import Collection, Dict, List, NamedTuple, Optional, Tuple
+
+from rendering.rects import Rect
+
+
+class DrawCommand(NamedTuple):
+    """One draw call, with the area it covers.
+
+    kind is "text" (arg = text, option = style) or "icon" (arg = icon
+    name, option = size). Two frames drawing equal commands produce equal
+    pixels, which is what lets a retained renderer skip them.
+    """
+
+    kind: str
+    position: Tuple[int, int]
+    arg: str
+    option: object
+    fill: int
+    bbox: Optional[Rect]
+
+
+# Draw commands per widget (or other group), in drawing order.
+DisplayLists = Dict[str, List[DrawCommand]]
+
+
+@dataclass
+class RetainedStats:
+    """Counters describing how much of each frame was redrawn."""
+
+    frames: int = 0
+    full_redraws: int = 0
+    groups_redrawn: int = 0
+    groups_reused: int = 0
+    # Pixels re-rasterized in the last frame
+    last_redrawn_pixels: int = 0
+
+
+def changed_groups(previous: DisplayLists, current: DisplayLists) -> List[str]:
+    """Names of the groups whose commands differ, including added and removed groups."""
+    changed = [key for key, commands in current.items() if previous.get(key) != commands]
+    changed.extend(key for key in previous if key not in current)
+    return changed
+
+
+def group_order_changed(previous: Collection[str], current: Collection[str]) -> bool:
+    """Check whether the groups both frames share are drawn in a different order."""
+    shared = [key for key in current if key in previous]
+    return shared != [key for key in previous if key in current]
@@ -0,0 +1,101 @@
+"""Renderer for the Waveshare 7.5" black/red e-paper panel."""
+from typing import Any, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from rendering.framebuffer import FrameBuffer
+from rendering.renderer import PILRenderer
+
+# draw_text fill value that draws on the red plane instead of the black one
+RED = -1
+
+
+class EPDRenderer(PILRenderer):
+    """Renderer that sends each frame to the e-paper panel.
+
+    The black plane is drawn like PILRenderer does (so the text cache and
+    retained mode apply); text drawn with fill=RED goes to a second image
+    for the red plane. render() packs both with the renderer's FrameBuffer
+    and sends them with EPD.display_raw; a frame without red reuses the
+    blank red plane without packing it.
+
+        renderer = EPDRenderer()
+        dashboard = Dashboard(renderer)
+        dashboard.render()
+        renderer.sleep()
+    """
+
+    def __init__(self, *args: Any, epd: Optional[Any] = None, **kwargs: Any):
+        """Initialize e-paper renderer.
+
+        Args:
+            epd: Panel driver (an epd7in5b_V2.EPD); created on the first
+                render when not given, which needs the Pi's GPIO and SPI
+            *args, **kwargs: PILRenderer arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.epd = epd
+        self.frame = FrameBuffer(*self.size)
+        self.red_image = Image.new("1", self.size, color=255)
+        self.red_draw = ImageDraw.Draw(self.red_image)
+        self._has_red = False
+        self._initialized = False
+
+    def draw_text(
+        self,
+        position: Tuple[int, int],
+        text: str,
+        style: str = "normal",
+        fill: int = 0,
+    ) -> None:
+        """Draw text on the black plane, or on the red plane when fill is RED."""
+        if fill != RED:
+            super().draw_text(position, text, style, fill)
+            return
+
+        bbox = self._paint_text(self.red_draw, position, text, style, 0)
+        if bbox is not None:
+            self._has_red = True
+            self._mark_dirty(bbox)
+
+    def clear(self) -> None:
+        """Clear both planes."""
+        super().clear()
+        if self._has_red:
+            self.red_draw.rectangle((0, 0, *self.size), fill=255)
+            self._has_red = False
+
+    def pack(self) -> Tuple[bytes, bytes]:
+        """Pack the frame into the panel's black and red buffers."""
+        black = self.frame.pack_black(self.get_image())
+        if self._has_red:
+            red = self.frame.pack_red(self.red_image)
+        else:
+            red = self.frame.clear_red()
+        return black, red
+
+    def _panel(self) -> Any:
+        """Get the panel driver, initialized."""
+        if self.epd is None:
+            import epd7in5b_V2
+
+            self.epd = epd7in5b_V2.EPD()
+        if not self._initialized:
+            if self.epd.init() != 0:
+                raise IOError("Failed to initialize the e-paper panel")
+            self._initialized = True
+        return self.epd
+
+    def render(self) -> None:
+        """Send the frame to the panel (a full refresh)."""
+        black, red = self.pack()
+        try:
+            self._panel().display_raw(black, red)
+        except IOError as e:
+            print(f"Error updating e-paper display: {e}")
+
+    def sleep(self) -> None:
+        """Put the panel into deep sleep; the next render wakes it up again."""
+        if self.epd is not None and self._initialized:
+            self.epd.sleep()
+            self._initialized = False
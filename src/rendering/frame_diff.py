@@ -0,0 +1,306 @@
+"""Minimal update rectangles between two packed 1-bit frames.
+
+Frames are the packed buffers produced for EPD.getbuffer: one bit per
+pixel, 8 horizontal pixels per byte, rows stored top to bottom. All
+comparisons run on whole byte strings (memcmp-backed ==, int XOR,
+strip/find): the changed region is located by binary search and XORed in
+one operation, and each band of changed rows is reduced to column spans
+by OR-ing its rows as integers.
+
+    for update in partial_updates(previous, current, 800, 480):
+        epd.display_Partial(update.data, *update.rect)
+"""
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from rendering.rects import Rect, union
+
+# Extra cost of sending one more rectangle, in bytes of frame data. A panel
+# refresh per rectangle is far more expensive than a few more bytes, so
+# nearby rectangles are merged unless that wastes more than this.
+DEFAULT_RECT_OVERHEAD = 2048
+
+# Rectangles that follow each one in top-to-bottom and in left-to-right
+# order, which are its initial merge candidates.
+MERGE_NEIGHBOURS = 3
+
+# Bounds on the candidates handed to merge_update_rects, which keep the worst
+# case (e.g. a change on every other row) from costing thousands of spans:
+# bands of changed rows beyond MAX_BANDS are joined across their smallest
+# gaps, and so are column spans beyond MAX_SPANS_PER_BAND within a band.
+MAX_BANDS = 16
+MAX_SPANS_PER_BAND = 4
+
+
+@dataclass(frozen=True)
+class PartialUpdate:
+    """One rectangle of a frame, ready for EPD.display_Partial."""
+
+    rect: Rect
+    data: bytes
+
+    @property
+    def x_start(self) -> int:
+        return self.rect[0]
+
+    @property
+    def y_start(self) -> int:
+        return self.rect[1]
+
+    @property
+    def x_end(self) -> int:
+        return self.rect[2]
+
+    @property
+    def y_end(self) -> int:
+        return self.rect[3]
+
+
+def _changed_spans(xor_row: bytes, gap: int) -> List[Tuple[int, int]]:
+    """Byte ranges [start, end) of non-zero runs, joining runs closer than gap bytes."""
+    if gap <= 0:
+        start = len(xor_row) - len(xor_row.lstrip(b"\x00"))
+        end = len(xor_row.rstrip(b"\x00"))
+        return [(start, end)] if start < end else []
+    # A run is a non-zero byte followed by more, each after fewer than gap zeros.
+    runs = re.compile(b"[^\x00](?:\x00{0,%d}[^\x00])*" % (gap - 1))
+    return [match.span() for match in runs.finditer(xor_row)]
+
+
+def _join_closest(ranges: List[Tuple[int, int]], limit: int) -> List[Tuple[int, int]]:
+    """Join sorted [start, end) ranges across their smallest gaps until at most limit remain."""
+    if len(ranges) <= limit:
+        return ranges
+    by_gap = sorted(range(1, len(ranges)), key=lambda i: ranges[i][0] - ranges[i - 1][1])
+    cuts = sorted(by_gap[len(ranges) - limit:]) + [len(ranges)]
+    joined = []
+    first = 0
+    for cut in cuts:
+        joined.append((ranges[first][0], ranges[cut - 1][1]))
+        first = cut
+    return joined
+
+
+def _or_rows(band: bytes, stride: int) -> bytes:
+    """OR all rows of a band together by folding it in halves as one integer."""
+    rows = len(band) // stride
+    value = int.from_bytes(band, "big")
+    while rows > 1:
+        low_rows = rows // 2
+        shift = low_rows * stride * 8
+        value = (value >> shift) | (value & ((1 << shift) - 1))
+        rows -= low_rows
+    return value.to_bytes(stride, "big")
+
+
+def _first_changed_row(previous: bytes, current: bytes, stride: int, rows: int) -> int:
+    """Binary search for the first differing row using prefix comparisons (memcmp)."""
+    low, high = 0, rows - 1
+    while low < high:
+        middle = (low + high) // 2
+        end = (middle + 1) * stride
+        if previous[:end] == current[:end]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _last_changed_row(previous: bytes, current: bytes, stride: int, rows: int) -> int:
+    """Binary search for the last differing row using suffix comparisons (memcmp)."""
+    low, high = 0, rows - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        start = middle * stride
+        if previous[start:] == current[start:]:
+            high = middle - 1
+        else:
+            low = middle
+    return low
+
+
+def _merge_cost(a: Rect, b: Rect, overhead: int) -> int:
+    """Bytes wasted by sending the union of a and b, minus the overhead saved."""
+    # area(union(a, b)) - area(a) - area(b), inlined: this is the merge's inner loop.
+    merged = (max(a[2], b[2]) - min(a[0], b[0])) * (max(a[3], b[3]) - min(a[1], b[1]))
+    separate = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1])
+    return (merged - separate) // 8 - overhead
+
+
+def merge_update_rects(
+    rects: List[Rect],
+    rect_overhead: int = DEFAULT_RECT_OVERHEAD,
+    max_rects: Optional[int] = None,
+) -> List[Rect]:
+    """Greedily merge rectangles while it is cheaper than sending them apart.
+
+    The candidate pair whose union wastes the fewest bytes is merged first.
+    Pairs are merged while the wasted bytes stay below rect_overhead, then
+    further (cheapest first) until at most max_rects remain.
+
+    Only neighbours are candidates: each rectangle is paired with the next
+    MERGE_NEIGHBOURS in top-to-bottom and in left-to-right order, and a
+    merged rectangle inherits the neighbours of both halves. The top-to-bottom
+    chain keeps every rectangle reachable, so max_rects can always be met.
+    With the candidates in a heap this is O(n log n) instead of comparing
+    all pairs after every merge.
+    """
+    alive: Dict[int, Rect] = dict(enumerate(rects))
+    neighbours: Dict[int, Set[int]] = {index: set() for index in alive}
+    for order in (
+        sorted(alive, key=lambda index: (alive[index][1], alive[index][0])),
+        sorted(alive, key=lambda index: (alive[index][0], alive[index][1])),
+    ):
+        for position, i in enumerate(order):
+            for j in order[position + 1:position + 1 + MERGE_NEIGHBOURS]:
+                neighbours[i].add(j)
+                neighbours[j].add(i)
+
+    heap = [
+        (_merge_cost(alive[i], alive[j], rect_overhead), i, j)
+        for i in alive
+        for j in neighbours[i]
+        if i < j
+    ]
+    heapq.heapify(heap)
+    next_index = len(alive)
+    while heap and len(alive) > 1:
+        cost, i, j = heapq.heappop(heap)
+        if i not in alive or j not in alive:
+            continue  # One of the pair was merged since it was pushed.
+        if cost > 0 and (max_rects is None or len(alive) <= max_rects):
+            break
+
+        merged = union(alive.pop(i), alive.pop(j))
+        around = (neighbours.pop(i) | neighbours.pop(j)) - {i, j}
+        alive[next_index] = merged
+        neighbours[next_index] = around
+        for k in around:
+            neighbours[k].difference_update((i, j))
+            neighbours[k].add(next_index)
+            heapq.heappush(heap, (_merge_cost(alive[k], merged, rect_overhead), k, next_index))
+        next_index += 1
+
+    return sorted(alive.values(), key=lambda rect: (rect[1], rect[0]))
+
+
+def diff_frames(
+    previous: bytes,
+    current: bytes,
+    width: int,
+    height: int,
+    rect_overhead: int = DEFAULT_RECT_OVERHEAD,
+    max_rects: Optional[int] = None,
+    column_gap: int = 2,
+) -> List[Rect]:
+    """Find 8-pixel-aligned rectangles covering every pixel that differs.
+
+    Args:
+        previous: Packed frame currently on the panel
+        current: Packed frame to show
+        width: Frame width in pixels (multiple of 8)
+        height: Frame height in pixels
+        rect_overhead: Bytes one extra rectangle is worth (see merge_update_rects)
+        max_rects: Upper bound on the number of rectangles returned
+        column_gap: Unchanged bytes in a row needed to split it into two spans
+
+    Returns:
+        (left, top, right, bottom) rectangles, right/bottom exclusive
+    """
+    stride = width // 8
+    size = stride * height
+    if len(previous) != size or len(current) != size:
+        raise ValueError(f"Frames must be {size} bytes for {width}x{height}")
+    if previous == current:
+        return []
+
+    previous, current = bytes(previous), bytes(current)
+    first_row = _first_changed_row(previous, current, stride, height)
+    last_row = _last_changed_row(previous, current, stride, height)
+
+    # One bulk XOR over the changed band, then per-row slices of it.
+    band_start, band_end = first_row * stride, (last_row + 1) * stride
+    xor = int.from_bytes(previous[band_start:band_end], "big") ^ int.from_bytes(
+        current[band_start:band_end], "big"
+    )
+    xor = xor.to_bytes(band_end - band_start, "big")
+    unchanged_row = bytes(stride)
+
+    def row(y: int) -> bytes:
+        offset = (y - first_row) * stride
+        return xor[offset:offset + stride]
+
+    def close_band(top: int, bottom: int) -> None:
+        # Spans are found once per band from the OR of its rows; with
+        # several spans each one's top and bottom are trimmed separately.
+        # Neighbouring spans that are cheaper to send together are merged
+        # right away, which leaves merge_update_rects far fewer candidates.
+        offset = (top - first_row) * stride
+        columns = _or_rows(xor[offset:offset + (bottom - top) * stride], stride)
+        spans = _join_closest(_changed_spans(columns, column_gap), MAX_SPANS_PER_BAND)
+        band: List[Rect] = []
+        for start, end in spans:
+            span_top, span_bottom = top, bottom
+            if len(spans) > 1:
+                unchanged = unchanged_row[start:end]
+                while row(span_top)[start:end] == unchanged:
+                    span_top += 1
+                while row(span_bottom - 1)[start:end] == unchanged:
+                    span_bottom -= 1
+            rect = (start * 8, span_top, end * 8, span_bottom)
+            if band and _merge_cost(band[-1], rect, rect_overhead) <= 0:
+                band[-1] = union(band[-1], rect)
+            else:
+                band.append(rect)
+        rects.extend(band)
+
+    # Bands of consecutive changed rows; an unchanged row closes the band.
+    bands: List[Tuple[int, int]] = []
+    band_top: Optional[int] = None
+    for y in range(first_row, last_row + 1):
+        offset = (y - first_row) * stride
+        if xor[offset:offset + stride] == unchanged_row:
+            if band_top is not None:
+                bands.append((band_top, y))
+                band_top = None
+        elif band_top is None:
+            band_top = y
+    if band_top is not None:
+        bands.append((band_top, last_row + 1))
+
+    rects: List[Rect] = []
+    for top, bottom in _join_closest(bands, MAX_BANDS):
+        close_band(top, bottom)
+    return merge_update_rects(rects, rect_overhead, max_rects)
+
+
+def crop_packed(frame: bytes, width: int, rect: Rect) -> bytes:
+    """Copy a byte-aligned rectangle out of a packed frame, row by row."""
+    stride = width // 8
+    left, top, right, bottom = rect
+    x0, x1 = left // 8, right // 8
+    if x0 == 0 and x1 == stride:
+        return bytes(frame[top * stride:bottom * stride])
+    view = memoryview(frame)
+    return b"".join(view[y * stride + x0:y * stride + x1] for y in range(top, bottom))
+
+
+def partial_updates(
+    previous: bytes,
+    current: bytes,
+    width: int,
+    height: int,
+    rect_overhead: int = DEFAULT_RECT_OVERHEAD,
+    max_rects: Optional[int] = None,
+) -> List[PartialUpdate]:
+    """Diff two packed frames and cut the changed regions out of the current one.
+
+    Each update's data and rect are the Image and Xstart, Ystart, Xend, Yend
+    arguments of EPD.display_Partial.
+    """
+    return [
+        PartialUpdate(rect, crop_packed(current, width, rect))
+        for rect in diff_frames(previous, current, width, height, rect_overhead, max_rects)
+    ]
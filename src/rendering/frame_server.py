@@ -0,0 +1,240 @@
+"""HTTP server handing the latest dashboard frame to extra screens.
+
+Frames are published once per dashboard render (see Dashboard's
+frame_server argument); clients never cause a render or a HASS request.
+Each frame is encoded at most once per format, on the first request for
+it, and served with a content-hash ETag:
+
+    GET /frame.bmp   1-bit BMP
+    GET /frame.png   1-bit PNG
+    GET /frame.raw   packed rows, 8 pixels per byte, 1 = white (the
+                     e-paper black plane); X-Frame-Width/Height give the size
+
+A request with If-None-Match equal to the current ETag gets 304. Adding
+?wait=<seconds> turns it into a long poll: the response is held until a
+different frame is published (200) or the wait runs out (304).
+
+    with FrameServer(port=8080) as server:
+        dashboard = Dashboard(renderer, frame_server=server)
+        dashboard.run()
+"""
+import hashlib
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+# Path suffix -> Content-Type
+FORMATS = {
+    "bmp": "image/bmp",
+    "png": "image/png",
+    "raw": "application/octet-stream",
+}
+
+
+class Frame:
+    """One published frame and its encodings, made on first use."""
+
+    def __init__(self, sequence: int, size: Tuple[int, int], packed: bytes):
+        """Initialize frame.
+
+        Args:
+            sequence: Number of the frame since the server started (from 1)
+            size: Frame size as (width, height)
+            packed: Mode "1" pixels as packed rows
+        """
+        self.sequence = sequence
+        self.size = size
+        self.packed = packed
+        self.digest = hashlib.blake2b(packed, digest_size=12).hexdigest()
+        self.encodings: Dict[str, bytes] = {"raw": packed}
+        self._lock = threading.Lock()
+
+    def etag(self, fmt: str) -> str:
+        """Quoted ETag of one encoding of the frame."""
+        return f'"{self.digest}-{fmt}"'
+
+    def encode(self, fmt: str) -> bytes:
+        """Get the frame in a format, encoding it only the first time."""
+        data = self.encodings.get(fmt)
+        if data is not None:
+            return data
+
+        with self._lock:
+            data = self.encodings.get(fmt)
+            if data is None:
+                buffer = io.BytesIO()
+                image = Image.frombytes("1", self.size, self.packed)
+                image.save(buffer, fmt.upper())
+                data = self.encodings[fmt] = buffer.getvalue()
+        return data
+
+
+class _FrameRequestHandler(BaseHTTPRequestHandler):
+    """Request handler serving the server's current frame."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_FrameHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence the default per-request stderr logging."""
+
+    def _send_empty(self, status: int, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        frames = self.server.owner
+        url = urlsplit(self.path)
+        name, _, fmt = url.path.rstrip("/").rpartition(".")
+        if name != "/frame" or fmt not in FORMATS:
+            self._send_empty(404)
+            return
+
+        query = parse_qs(url.query)
+        try:
+            wait = min(float(query.get("wait", ["0"])[0]), frames.max_wait)
+        except ValueError:
+            self._send_empty(400)
+            return
+
+        known = self.headers.get("If-None-Match")
+        frame = frames.current
+        if frame is not None and wait > 0 and known == frame.etag(fmt):
+            frame = frames.wait_for_frame(frame.sequence, wait)
+        if frame is None:
+            frames._record_request(not_modified=False)
+            self._send_empty(503)
+            return
+
+        etag = frame.etag(fmt)
+        if known == etag:
+            frames._record_request(not_modified=True)
+            self._send_empty(304, etag)
+            return
+
+        frames._record_request(not_modified=False)
+        body = frame.encode(fmt)
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATS[fmt])
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Frame-Width", str(frame.size[0]))
+        self.send_header("X-Frame-Height", str(frame.size[1]))
+        self.send_header("X-Frame-Sequence", str(frame.sequence))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _FrameHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, owner: "FrameServer", address):
+        self.owner = owner
+        super().__init__(address, _FrameRequestHandler)
+
+
+class FrameServer:
+    """HTTP server for the latest published frame.
+
+    Use as a context manager (or start()/stop()); it serves on a background
+    thread, one thread per connection. Until the first frame is published
+    every request gets 503.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, max_wait: float = 300.0):
+        """Initialize frame server.
+
+        Args:
+            host: Interface to bind ("0.0.0.0" to serve other devices)
+            port: Port to bind (0 = pick a free port)
+            max_wait: Longest long poll a client may ask for, in seconds
+        """
+        self.max_wait = max_wait
+        self.current: Optional[Frame] = None
+        self.request_count = 0
+        self.not_modified_count = 0
+        self._changed = threading.Condition()
+        self._httpd = _FrameHTTPServer(self, (host, port))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def publish(self, image: Any) -> bool:
+        """Make an image the current frame and wake long-polling clients.
+
+        Returns:
+            False if the image shows the same pixels as the current frame
+            (it is then not republished)
+        """
+        if image.mode != "1":
+            image = image.convert("1")
+        packed = image.tobytes()
+        current = self.current
+        if current is not None and current.size == image.size and current.packed == packed:
+            return False
+
+        sequence = current.sequence + 1 if current is not None else 1
+        with self._changed:
+            self.current = Frame(sequence, image.size, packed)
+            self._changed.notify_all()
+        return True
+
+    def wait_for_frame(self, sequence: int, timeout: float) -> Optional[Frame]:
+        """Wait until a frame newer than sequence is published, or the timeout.
+
+        Returns:
+            The current frame (still the old one after a timeout)
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while self.current is not None and self.current.sequence <= sequence:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return self.current
+
+    def _record_request(self, not_modified: bool) -> None:
+        with self._changed:
+            self.request_count += 1
+            if not_modified:
+                self.not_modified_count += 1
+
+    def start(self) -> "FrameServer":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving (if started) and release the socket."""
+        # shutdown() waits for serve_forever() to exit, so it would block
+        # forever on a server that was never started.
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FrameServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
@@ -0,0 +1,74 @@
+"""Panel-ready byte buffers for the 7.5" black/red e-paper display.
+
+The panel takes two packed 1-bit planes, 8 horizontal pixels per byte:
+
+- black (command 0x10): 1 = white, 0 = black, which is exactly PIL's
+  mode "1" layout, so the image bytes go out unchanged;
+- red (command 0x13): 1 = red, i.e. PIL's layout inverted.
+
+EPD.getbuffer inverts every byte in a Python loop and EPD.display loops
+again to invert the black plane back. FrameBuffer packs each plane with
+PIL's raw packers ("1" and the inverting "1;I") in one C pass; the bytes
+PIL returns are handed to EPD.display_raw as they are, without a further
+copy. The all-blank red plane is allocated once and shared by every frame
+without red.
+"""
+from typing import Any
+
+from PIL import Image
+
+
+class FrameBuffer:
+    """Black and red planes of one panel frame.
+
+        frame = FrameBuffer(epd.width, epd.height)
+        epd.display_raw(frame.pack_black(image), frame.clear_red())
+    """
+
+    def __init__(self, width: int = 800, height: int = 480):
+        """Initialize frame buffer with a white frame and no red.
+
+        Args:
+            width: Panel width in pixels
+            height: Panel height in pixels
+        """
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) // 8
+        self._no_red = bytes(self.stride * height)
+        self.black = b"\xff" * (self.stride * height)
+        self.red = self._no_red
+
+    def _fit(self, image: Any) -> Any:
+        """Bring an image to the panel's size and mode "1" (as EPD.getbuffer does)."""
+        if image.size == (self.height, self.width):
+            image = image.rotate(90, expand=True)
+        elif image.size != (self.width, self.height):
+            raise ValueError(
+                f"Wrong image dimensions {image.size}: must be {self.width}x{self.height}"
+            )
+        if image.mode != "1":
+            image = image.convert("1")
+        return image
+
+    def _pack(self, image: Any, rawmode: str) -> bytes:
+        return self._fit(image).tobytes("raw", rawmode)
+
+    def pack_black(self, image: Any) -> bytes:
+        """Pack an image into the black plane (black pixels = 0)."""
+        self.black = self._pack(image, "1")
+        return self.black
+
+    def pack_red(self, image: Any) -> bytes:
+        """Pack an image into the red plane; its black pixels are shown red."""
+        self.red = self._pack(image, "1;I")
+        return self.red
+
+    def clear_red(self) -> bytes:
+        """Set the red plane to the shared blank plane (no red pixels)."""
+        self.red = self._no_red
+        return self.red
+
+    def to_image(self) -> Any:
+        """Black plane as a mode "1" image (for inspection in tests)."""
+        return Image.frombytes("1", (self.width, self.height), self.black)
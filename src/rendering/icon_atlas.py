@@ -0,0 +1,151 @@
+"""Weather icons decoded once and kept ready to blit.
+
+The renderer used to open, decode and invert an icon BMP on every
+draw_icon call. IconAtlas does that once per (name, size) pair and keeps
+the inverted mode "1" bitmap in memory. An atlas can also be saved as a
+single packed file, so a device can load every icon with one read at
+startup:
+
+    python src/rendering/icon_atlas.py assets/weather-icons assets/weather-icons.atlas
+
+Packed file layout: MAGIC, a 4-byte big-endian index length, a JSON index
+of [name, size, width, height, offset, length] entries and the raw mode "1"
+pixel data the offsets point into.
+"""
+import argparse
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+MAGIC = b"HDICONS1"
+
+DEFAULT_ICONS_DIR = Path(__file__).parent.parent.parent / "assets" / "weather-icons"
+
+
+class IconAtlas:
+    """Inverted mode "1" icon bitmaps keyed by (name, size)."""
+
+    def __init__(self, icons_dir: Optional[str] = None):
+        """Initialize an atlas that loads icons from disk on first use.
+
+        Args:
+            icons_dir: Directory holding '<name>-<size>x<size>.bmp' files
+        """
+        self.icons_dir = Path(icons_dir) if icons_dir else DEFAULT_ICONS_DIR
+        self.disk_loads = 0
+        self._icons: Dict[Tuple[str, int], Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self._icons
+
+    def _icon_path(self, name: str, size: int) -> Path:
+        return self.icons_dir / f"{name}-{size}x{size}.bmp"
+
+    def _load_icon(self, path: Path) -> Any:
+        """Decode and invert one icon BMP."""
+        with Image.open(path) as icon_im:
+            icon = ImageOps.invert(icon_im)
+        if icon.mode != "1":
+            icon = icon.convert("1")
+        self.disk_loads += 1
+        return icon
+
+    def get(self, name: str, size: int = 100) -> Any:
+        """Get the inverted bitmap of an icon, reading it from disk on first use.
+
+        Raises:
+            FileNotFoundError: If the icon is neither in the atlas nor on disk
+        """
+        icon = self._icons.get((name, size))
+        if icon is not None:
+            return icon
+
+        path = self._icon_path(name, size)
+        if not path.exists():
+            raise FileNotFoundError(f"Icon file not found: {path}")
+
+        icon = self._icons[(name, size)] = self._load_icon(path)
+        return icon
+
+    def preload(self) -> int:
+        """Load every icon BMP in icons_dir.
+
+        Returns:
+            Number of icons in the atlas
+        """
+        for path in sorted(self.icons_dir.glob("*-*x*.bmp")):
+            name, _, dimensions = path.stem.rpartition("-")
+            width, _, height = dimensions.partition("x")
+            if not (width.isdigit() and width == height):
+                continue
+            key = (name, int(width))
+            if key not in self._icons:
+                self._icons[key] = self._load_icon(path)
+        return len(self._icons)
+
+    def save(self, path: str) -> None:
+        """Write every loaded icon to a single packed atlas file."""
+        index = []
+        chunks = []
+        offset = 0
+        for (name, size), icon in sorted(self._icons.items()):
+            data = icon.tobytes()
+            index.append([name, size, icon.width, icon.height, offset, len(data)])
+            chunks.append(data)
+            offset += len(data)
+
+        header = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack(">I", len(header)))
+            f.write(header)
+            f.write(b"".join(chunks))
+
+    @classmethod
+    def load(cls, path: str, icons_dir: Optional[str] = None) -> "IconAtlas":
+        """Read a packed atlas file written by save().
+
+        Icons missing from the file are still loaded from icons_dir on demand.
+
+        Raises:
+            ValueError: If the file is not a packed icon atlas
+        """
+        with open(path, "rb") as f:
+            payload = f.read()
+
+        if payload[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not an icon atlas: {path}")
+        (header_length,) = struct.unpack_from(">I", payload, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        data_start = header_start + header_length
+        index = json.loads(payload[header_start:data_start].decode("utf-8"))
+
+        atlas = cls(icons_dir)
+        for name, size, width, height, offset, length in index:
+            start = data_start + offset
+            atlas._icons[(name, size)] = Image.frombytes(
+                "1", (width, height), payload[start:start + length]
+            )
+        return atlas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pack weather icon BMPs into one atlas file")
+    parser.add_argument("icons_dir", help="directory with <name>-<size>x<size>.bmp icons")
+    parser.add_argument("output", help="atlas file to write")
+    args = parser.parse_args()
+
+    atlas = IconAtlas(args.icons_dir)
+    count = atlas.preload()
+    atlas.save(args.output)
+    print(f"Packed {count} icons into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
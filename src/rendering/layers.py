@@ -0,0 +1,156 @@
+"""Per-widget layers composited over the static background."""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from rendering.display_list import DisplayLists, DrawCommand, group_order_changed
+from rendering.rects import BYTE_ALIGNMENT, Rect, intersects, merge_rects, union
+from rendering.renderer import PILRenderer
+
+
+@dataclass
+class Layer:
+    """One widget's pixels, cut to the area its commands cover.
+
+    mask marks the pixels the widget painted, so compositing the layer
+    over the frame changes nothing else.
+    """
+
+    commands: List[DrawCommand]
+    bbox: Rect
+    image: Any
+    mask: Any
+
+
+class LayeredPILRenderer(PILRenderer):
+    """PILRenderer that keeps every widget's output as a cached layer.
+
+    Draw calls are recorded per widget like in retained mode. When a frame
+    is needed, only widgets whose commands changed are rasterized, each into
+    its own layer clipped to its bounding box (in parallel with
+    layer_workers > 0, since layers are independent). The regions the
+    changed layers cover, before and after, are then recomposited from the
+    background and every cached layer overlapping them, in widget order.
+
+        renderer = LayeredPILRenderer(layer_workers=4)
+        dashboard = Dashboard(renderer)
+    """
+
+    def __init__(self, *args: Any, layer_workers: int = 0, **kwargs: Any):
+        """Initialize layered renderer.
+
+        Args:
+            layer_workers: Threads rasterizing changed layers (0 = render
+                them on the calling thread)
+            *args, **kwargs: PILRenderer arguments (retained is implied)
+        """
+        kwargs["retained"] = True
+        super().__init__(*args, **kwargs)
+        self.layer_workers = layer_workers
+        self.layers: Dict[str, Layer] = {}
+        self._layer_order: List[str] = []
+        self._layer_executor: Optional[ThreadPoolExecutor] = None
+
+    def _rasterize_layer(self, commands: List[DrawCommand]) -> Optional[Layer]:
+        """Draw a widget's commands into a layer image and its coverage mask."""
+        boxes = [command.bbox for command in commands if command.bbox is not None]
+        if not boxes:
+            return None
+
+        bbox = boxes[0]
+        for box in boxes[1:]:
+            bbox = union(bbox, box)
+        width, height = self.size
+        bbox = (max(0, bbox[0]), max(0, bbox[1]), min(width, bbox[2]), min(height, bbox[3]))
+        if bbox[0] >= bbox[2] or bbox[1] >= bbox[3]:
+            return None
+
+        size = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+        image = Image.new("1", size, color=255)
+        mask = Image.new("1", size, color=0)
+        image_draw, mask_draw = ImageDraw.Draw(image), ImageDraw.Draw(mask)
+        for command in commands:
+            self._paint_command(image_draw, command, bbox[:2])
+            self._paint_command(mask_draw, command, bbox[:2], fill=1)
+        return Layer(commands=list(commands), bbox=bbox, image=image, mask=mask)
+
+    def _render_layers(self, keys: List[str], current: DisplayLists) -> List[Optional[Layer]]:
+        """Rasterize the layers of the given widgets, on the worker pool if enabled."""
+        if self.layer_workers and len(keys) > 1:
+            if self._layer_executor is None:
+                self._layer_executor = ThreadPoolExecutor(
+                    max_workers=self.layer_workers, thread_name_prefix="layer"
+                )
+            layers = self._layer_executor.map(
+                lambda key: self._rasterize_layer(current[key]), keys
+            )
+            return list(layers)
+        return [self._rasterize_layer(current[key]) for key in keys]
+
+    def _flush(self) -> None:
+        """Re-render changed layers and recomposite the regions they cover."""
+        if self._flushed:
+            return
+        self._flushed = True
+
+        current = self._display_lists
+        stats = self.retained_stats
+        stats.frames += 1
+
+        changed = [
+            key
+            for key, commands in current.items()
+            if key not in self.layers or self.layers[key].commands != commands
+        ]
+        removed = [key for key in self.layers if key not in current]
+        boxes = [self.layers[key].bbox for key in changed + removed if key in self.layers]
+
+        for key, layer in zip(changed, self._render_layers(changed, current)):
+            if layer is None:
+                self.layers.pop(key, None)
+            else:
+                self.layers[key] = layer
+                boxes.append(layer.bbox)
+        for key in removed:
+            del self.layers[key]
+
+        order = [key for key in current if key in self.layers]
+        if not self._layer_order or group_order_changed(self._layer_order, order):
+            regions = [(0, 0, *self.size)]
+            stats.full_redraws += 1
+        else:
+            regions = merge_rects(boxes, BYTE_ALIGNMENT, self.size)
+        self._layer_order = order
+
+        stats.groups_redrawn += len(changed)
+        stats.groups_reused += len(current) - len(changed)
+        stats.last_redrawn_pixels = sum(
+            (right - left) * (bottom - top) for left, top, right, bottom in regions
+        )
+        for region in regions:
+            self._composite_region(region)
+
+    def _composite_region(self, region: Rect) -> None:
+        """Rebuild one region of the frame from the background and the layers over it."""
+        left, top, right, bottom = region
+        if self._background_image is not None:
+            tile = self._background_image.crop(region)
+        else:
+            tile = Image.new("1", (right - left, bottom - top), color=255)
+
+        for key in self._layer_order:
+            layer = self.layers[key]
+            if intersects(layer.bbox, region):
+                offset: Tuple[int, int] = (layer.bbox[0] - left, layer.bbox[1] - top)
+                tile.paste(layer.image, offset, layer.mask)
+
+        self.image.paste(tile, (left, top))
+
+    def close(self) -> None:
+        """Stop the layer worker threads and unmap the background cache."""
+        if self._layer_executor is not None:
+            self._layer_executor.shutdown(wait=True)
+            self._layer_executor = None
+        super().close()
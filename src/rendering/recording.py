@@ -0,0 +1,176 @@
+"""Renderers that draw nothing, for measuring widget logic on its own.
+
+NullRenderer drops every draw call, so timing a widget's render() against
+it measures the widget's own work (formatting, layout, cache lookups)
+without Pillow. RecordingRenderer logs every call with its arguments and,
+when it wraps another renderer, the time that renderer spent on it:
+
+    recorder = RecordingRenderer(PILRenderer())
+    widget = RoomsWidget(hass, recorder)
+    widget.render()
+    print(recorder.time_by_widget())
+"""
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from rendering.renderer import Renderer
+
+
+class NullRenderer(Renderer):
+    """Renderer that accepts draw calls and does nothing."""
+
+    def __init__(self, size: Tuple[int, int] = (800, 480)):
+        """Initialize null renderer.
+
+        Args:
+            size: Display size reported to widgets, as (width, height)
+        """
+        self.size = size
+        self._draw: Optional[ImageDraw.ImageDraw] = None
+
+    def get_draw(self) -> ImageDraw.ImageDraw:
+        """Get a draw context on a 1x1 scratch image (nothing is kept)."""
+        if self._draw is None:
+            self._draw = ImageDraw.Draw(Image.new("1", (1, 1), color=255))
+        return self._draw
+
+    def draw_text(
+        self,
+        position: Tuple[int, int],
+        text: str,
+        style: str = "normal",
+        fill: int = 0,
+    ) -> None:
+        """Ignore a text draw call."""
+
+    def render(self) -> None:
+        """Do nothing."""
+
+    def get_size(self) -> Tuple[int, int]:
+        """Get display size."""
+        return self.size
+
+    def clear(self) -> None:
+        """Do nothing."""
+
+    def draw_icon(self, position: Tuple[int, int], name: str, size: int = 100) -> None:
+        """Ignore an icon draw call."""
+
+
+class DrawCall(NamedTuple):
+    """One draw call seen by RecordingRenderer.
+
+    kind is "text" (arg = text, option = style) or "icon" (arg = icon name,
+    option = size); duration is the seconds the wrapped renderer took.
+    """
+
+    frame: int
+    widget: str
+    kind: str
+    position: Tuple[int, int]
+    arg: str
+    option: Any
+    fill: int
+    duration: float
+
+
+class RecordingRenderer(Renderer):
+    """Renderer that logs draw calls, optionally passing them on to another renderer."""
+
+    def __init__(self, renderer: Optional[Renderer] = None):
+        """Initialize recording renderer.
+
+        Args:
+            renderer: Renderer to forward every call to and time (a
+                NullRenderer when not given, so only the calls are logged)
+        """
+        self.renderer = renderer or NullRenderer()
+        self.calls: List[DrawCall] = []
+        self.frame = 0
+        self._widget = ""
+
+    def _timed(
+        self,
+        kind: str,
+        position: Tuple[int, int],
+        arg: str,
+        option: Any,
+        fill: int,
+        call: Callable[[], None],
+    ) -> None:
+        """Run a forwarded draw call and log it with its duration."""
+        started = time.perf_counter()
+        try:
+            call()
+        finally:
+            duration = time.perf_counter() - started
+            self.calls.append(
+                DrawCall(self.frame, self._widget, kind, position, arg, option, fill, duration)
+            )
+
+    def get_draw(self) -> ImageDraw.ImageDraw:
+        """Get the wrapped renderer's draw context (calls through it are not logged)."""
+        return self.renderer.get_draw()
+
+    def draw_text(
+        self,
+        position: Tuple[int, int],
+        text: str,
+        style: str = "normal",
+        fill: int = 0,
+    ) -> None:
+        """Log and forward a text draw call."""
+        self._timed(
+            "text", position, text, style, fill,
+            lambda: self.renderer.draw_text(position, text, style, fill),
+        )
+
+    def draw_icon(self, position: Tuple[int, int], name: str, size: int = 100) -> None:
+        """Log and forward an icon draw call."""
+        self._timed(
+            "icon", position, name, size, 0,
+            lambda: self.renderer.draw_icon(position, name, size),
+        )
+
+    def begin_widget(self, key: str) -> None:
+        """Attribute the following calls to a widget."""
+        self._widget = key
+        self.renderer.begin_widget(key)
+
+    def render(self) -> None:
+        """Forward to the wrapped renderer."""
+        self.renderer.render()
+
+    def get_size(self) -> Tuple[int, int]:
+        """Get the wrapped renderer's display size."""
+        return self.renderer.get_size()
+
+    def get_image(self) -> Optional[Any]:
+        """Get the wrapped renderer's frame (None if it keeps no image)."""
+        return self.renderer.get_image()
+
+    def clear(self) -> None:
+        """Start a new frame (the log is kept; see reset())."""
+        self.frame += 1
+        self._widget = ""
+        self.renderer.clear()
+
+    def reset(self) -> None:
+        """Drop every logged call."""
+        self.calls = []
+
+    def calls_by_widget(self) -> Dict[str, int]:
+        """Number of logged calls per widget key."""
+        counts: Dict[str, int] = {}
+        for call in self.calls:
+            counts[call.widget] = counts.get(call.widget, 0) + 1
+        return counts
+
+    def time_by_widget(self) -> Dict[str, float]:
+        """Seconds the wrapped renderer spent on each widget's calls."""
+        totals: Dict[str, float] = {}
+        for call in self.calls:
+            totals[call.widget] = totals.get(call.widget, 0.0) + call.duration
+        return totals
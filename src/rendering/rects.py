@@ -0,0 +1,88 @@
+"""Rectangle helpers for tracking which parts of a frame changed.
+
+Rectangles are (left, top, right, bottom) tuples with exclusive right and
+bottom edges, the same convention as PIL bounding boxes.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+# Packed 1-bit frames store 8 horizontal pixels per byte.
+BYTE_ALIGNMENT = 8
+
+
+def align_rect(
+    rect: Rect,
+    alignment: int = BYTE_ALIGNMENT,
+    bounds: Optional[Tuple[int, int]] = None,
+) -> Optional[Rect]:
+    """Widen a rectangle horizontally to whole bytes and clip it to the frame.
+
+    Args:
+        rect: Rectangle to align
+        alignment: Pixel multiple for the left and right edges
+        bounds: Frame size as (width, height) to clip to
+
+    Returns:
+        The aligned rectangle, or None if nothing of it is inside the frame
+    """
+    left, top, right, bottom = rect
+    left = (left // alignment) * alignment
+    right = -(-right // alignment) * alignment
+    if bounds is not None:
+        width, height = bounds
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(width, right), min(height, bottom)
+    if left >= right or top >= bottom:
+        return None
+    return left, top, right, bottom
+
+
+def union(a: Rect, b: Rect) -> Rect:
+    """Smallest rectangle covering both rectangles."""
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def touches(a: Rect, b: Rect) -> bool:
+    """Check whether two rectangles overlap or share an edge."""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def intersects(a: Rect, b: Rect) -> bool:
+    """Check whether two rectangles share at least one pixel."""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def area(rect: Rect) -> int:
+    """Number of pixels in a rectangle."""
+    return max(0, rect[2] - rect[0]) * max(0, rect[3] - rect[1])
+
+
+def merge_rects(
+    rects: Iterable[Rect],
+    alignment: int = BYTE_ALIGNMENT,
+    bounds: Optional[Tuple[int, int]] = None,
+) -> List[Rect]:
+    """Align rectangles to whole bytes and merge the ones that touch.
+
+    Merging repeats until no two rectangles touch, so the result covers
+    every input pixel with non-overlapping rectangles, sorted top to bottom.
+    """
+    merged: List[Rect] = []
+    for rect in rects:
+        aligned = align_rect(rect, alignment, bounds)
+        if aligned is None:
+            continue
+        # Absorb every rectangle the new one touches; the grown rectangle may
+        # now touch others, so keep going until it stands alone.
+        changed = True
+        while changed:
+            changed = False
+            for index, other in enumerate(merged):
+                if touches(aligned, other):
+                    aligned = union(aligned, merged.pop(index))
+                    changed = True
+                    break
+        merged.append(aligned)
+
+    return sorted(merged, key=lambda rect: (rect[1], rect[0]))
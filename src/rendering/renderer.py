@@ -1,11 +1,24 @@
 """Abstract interface for rendering to different outputs."""
 from abc import ABC, abstractmethod
 import os
+import threading
 from pathlib import Path
-from typing import Any, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from PIL import ImageDraw, ImageFont
 
+from rendering.background import BackgroundTemplate, load_background
+from rendering.display_list import (
+    DisplayLists,
+    DrawCommand,
+    RetainedStats,
+    changed_groups,
+    group_order_changed,
+)
+from rendering.icon_atlas import IconAtlas
+from rendering.rects import BYTE_ALIGNMENT, Rect, intersects, merge_rects
+from rendering.text_cache import TextMask, TextMaskCache
+
 
 class Renderer(ABC):
     """Abstract base class for rendering to different outputs.
@@ -73,15 +86,53 @@ class Renderer(ABC):
         """
         pass
 
+    def begin_widget(self, key: str) -> None:
+        """Attribute the following draw calls to a widget (until the next call).
+
+        Renderers that keep per-widget state between frames use this to tell
+        which widget's output changed; the default does nothing.
+
+        Args:
+            key: Stable identifier of the widget within the dashboard
+        """
+        pass
+
+    def get_image(self) -> Optional[Any]:
+        """Get the current frame as a PIL Image.
+
+        Returns:
+            The frame, or None for renderers that keep no image (the
+            default)
+        """
+        return None
+
 
 class PILRenderer(Renderer):
-    """Renderer that outputs to PIL Image (for testing/debugging)."""
+    """Renderer that outputs to PIL Image (for testing/debugging).
+
+    Every draw_text/draw_icon call records the bounding box it touched, so
+    after a frame dirty_rects() tells which byte-aligned regions changed
+    since clear(). Drawing through get_draw() directly is not tracked.
+
+    In retained mode draw calls only append to a display list per widget
+    (see Renderer.begin_widget). When the frame is needed (render(),
+    get_image()) the lists are compared with the previous frame's, and only
+    the regions covered by changed widgets are re-rasterized from the
+    background and every command overlapping them; the rest of the image
+    is kept from the previous frame. The result is pixel-identical to
+    drawing everything, as long as nothing draws through get_draw().
+    """
 
     def __init__(
         self,
         size: Tuple[int, int] = (800, 480),
         output_path: Optional[str] = None,
         background_path: Optional[str] = None,
+        icon_atlas: Optional[IconAtlas] = None,
+        icon_atlas_path: Optional[str] = None,
+        text_cache_bytes: int = 512 * 1024,
+        retained: bool = False,
+        background_cache: bool = False,
     ):
         """Initialize PIL renderer.
         
@@ -89,6 +140,15 @@ class PILRenderer(Renderer):
             size: Display size as (width, height)
             output_path: Optional path to save output BMP file
             background_path: Optional path to background BMP file
+            icon_atlas: Icon atlas to draw from (shared between renderers)
+            icon_atlas_path: Packed atlas file to load the icons from; when
+                neither is given, icons are loaded from assets on first use
+            text_cache_bytes: Memory for rasterized text reused across
+                frames, keyed by (text, style, fill) (0 = rasterize every call)
+            retained: Record draw calls and redraw only what changed between
+                frames (see class docstring)
+            background_cache: Keep the decoded background as a raw file next
+                to the BMP and map it on later startups
         """
         self.size = size
         self.output_path = output_path or "output.bmp"
@@ -98,26 +158,40 @@ class PILRenderer(Renderer):
         self.background_path = background_path or default_background
         self._font_sizes = {"small": 14, "normal": 18, "big": 54}
         self._font_cache: dict[str, Any] = {}
+        # FreeType faces are not thread-safe; layers may rasterize in parallel.
+        self._font_lock = threading.Lock()
         self._font_bold_path, self._font_regular_path = self._resolve_font_paths()
-        self._background_image = self._load_background_image()
+        self.background: Optional[BackgroundTemplate] = load_background(
+            self.background_path, size, cache=background_cache
+        )
+        self._background_image = self.background.to_image() if self.background else None
+        self.icons = (
+            icon_atlas if icon_atlas is not None else self._load_icon_atlas(icon_atlas_path)
+        )
+        self.text_cache = TextMaskCache(text_cache_bytes)
         self.image = self._create_base_image()
         self.draw = ImageDraw.Draw(self.image)
-
-    def _load_background_image(self) -> Optional[Any]:
-        """Load background image if present and convert to renderer mode."""
-        from PIL import Image
-
-        try:
-            with Image.open(self.background_path) as loaded:
-                image = loaded.convert("1")
-                if image.size != self.size:
-                    image = image.resize(self.size)
-                return image
-        except OSError:
-            return None
+        # Bounding boxes of this frame's draw calls and the previous frame's
+        self._dirty: List[Rect] = []
+        self._previous_dirty: List[Rect] = []
+        self.retained = retained
+        self.retained_stats = RetainedStats()
+        self._display_lists: DisplayLists = {}
+        self._drawn_lists: Optional[DisplayLists] = None
+        self._group = ""
+        self._flushed = True
+
+    def _load_icon_atlas(self, path: Optional[str]) -> IconAtlas:
+        """Load a packed icon atlas, falling back to loading icons on demand."""
+        if path is not None:
+            try:
+                return IconAtlas.load(path)
+            except (OSError, ValueError) as e:
+                print(f"Error loading icon atlas {path}: {e}")
+        return IconAtlas()
 
     def _create_base_image(self) -> Any:
-        """Create a fresh image for a render pass."""
+        """Create the working image, showing the background."""
         from PIL import Image
 
         if self._background_image is not None:
@@ -170,12 +244,200 @@ class PILRenderer(Renderer):
         style: str = "normal",
         fill: int = 0,
     ) -> None:
-        """Draw text to the image using renderer-managed fonts."""
-        font = self._get_font(style)
-        self.draw.text(position, text, font=font, fill=fill)
+        """Draw text to the image using renderer-managed fonts.
+
+        Single-line strings are rasterized once into a mask that is pasted on
+        later calls with the same text, style and fill.
+        """
+        if self.retained:
+            bbox = self._text_bbox(position, text, style, fill)
+            self._record(DrawCommand("text", position, text, style, fill, bbox))
+        else:
+            bbox = self._paint_text(self.draw, position, text, style, fill)
+        if bbox is not None:
+            self._mark_dirty(bbox)
+
+    def _text_mask(self, text: str, style: str, fill: int) -> Optional[TextMask]:
+        """Get the cached mask of a single-line string (None when not cacheable)."""
+        if "\n" in text or not self.text_cache.max_bytes:
+            return None
+
+        key = (text, style, fill)
+        mask = self.text_cache.get(key)
+        if mask is None:
+            mask = self._rasterize_text(text, self._get_font(style))
+            self.text_cache.put(key, mask)
+        return mask
+
+    def _text_bbox(
+        self, position: Tuple[int, int], text: str, style: str, fill: int
+    ) -> Optional[Rect]:
+        """Area a draw_text call covers, without drawing it."""
+        mask = self._text_mask(text, style, fill)
+        if mask is None:
+            return self.draw.textbbox(position, text, font=self._get_font(style))
+        if mask.image is None:
+            return None
+
+        left, top = position[0] + mask.left, position[1] + mask.top
+        width, height = mask.image.size
+        return left, top, left + width, top + height
+
+    def _paint_text(
+        self,
+        draw: ImageDraw.ImageDraw,
+        position: Tuple[int, int],
+        text: str,
+        style: str,
+        fill: int,
+    ) -> Optional[Rect]:
+        """Draw text onto a draw context and return the area it covers."""
+        mask = self._text_mask(text, style, fill)
+        if mask is None:
+            font = self._get_font(style)
+            draw.text(position, text, font=font, fill=fill)
+            return draw.textbbox(position, text, font=font)
+        if mask.image is None:
+            return None
+
+        left, top = position[0] + mask.left, position[1] + mask.top
+        draw.bitmap((left, top), mask.image, fill=fill)
+        width, height = mask.image.size
+        return left, top, left + width, top + height
+
+    def _rasterize_text(self, text: str, font: Any) -> TextMask:
+        """Render text into a tight mode "1" mask the way ImageDraw.text would."""
+        from PIL import Image
+
+        with self._font_lock:
+            left, top, right, bottom = font.getbbox(text, mode=self.draw.fontmode)
+            if right <= left or bottom <= top:
+                return TextMask(None, left, top)
+
+            image = Image.new("1", (right - left, bottom - top), 0)
+            mask_draw = ImageDraw.Draw(image)
+            mask_draw.fontmode = self.draw.fontmode
+            mask_draw.text((-left, -top), text, font=font, fill=1)
+        return TextMask(image, left, top)
+
+    def _mark_dirty(self, rect: Rect) -> None:
+        """Record a region touched by the current frame."""
+        if rect[0] < rect[2] and rect[1] < rect[3]:
+            self._dirty.append(rect)
+
+    def dirty_rects(
+        self, include_previous: bool = False, alignment: int = BYTE_ALIGNMENT
+    ) -> List[Rect]:
+        """Get the regions drawn on since the last clear(), merged and byte aligned.
+
+        Args:
+            include_previous: Also cover what the previous frame drew, i.e.
+                every region that may differ from the previous frame
+            alignment: Pixel multiple for left and right edges (8 = whole
+                bytes of a packed 1-bit frame)
+
+        Returns:
+            Non-overlapping (left, top, right, bottom) rectangles clipped to
+            the display, sorted top to bottom
+        """
+        rects = self._dirty + self._previous_dirty if include_previous else self._dirty
+        return merge_rects(rects, alignment, self.size)
+
+    def begin_widget(self, key: str) -> None:
+        """Attribute the following draw calls to a widget's display list."""
+        self._group = key
+
+    def _record(self, command: DrawCommand) -> None:
+        """Append a command to the current widget's display list."""
+        self._display_lists.setdefault(self._group, []).append(command)
+        self._flushed = False
+
+    def _flush(self) -> None:
+        """Bring the image up to date with the recorded display lists (retained mode)."""
+        if not self.retained or self._flushed:
+            return
+        self._flushed = True
+
+        current = self._display_lists
+        previous = self._drawn_lists
+        stats = self.retained_stats
+        stats.frames += 1
+        if previous is None or group_order_changed(previous, current):
+            changed = list(current)
+            regions = [(0, 0, *self.size)]
+            stats.full_redraws += 1
+        else:
+            changed = changed_groups(previous, current)
+            boxes = [
+                command.bbox
+                for key in changed
+                for command in previous.get(key, []) + current.get(key, [])
+                if command.bbox is not None
+            ]
+            regions = merge_rects(boxes, BYTE_ALIGNMENT, self.size)
+
+        stats.groups_redrawn += sum(1 for key in changed if key in current)
+        stats.groups_reused += sum(1 for key in current if key not in changed)
+        stats.last_redrawn_pixels = sum(
+            (right - left) * (bottom - top) for left, top, right, bottom in regions
+        )
+
+        commands = [command for group in current.values() for command in group]
+        for region in regions:
+            self._redraw_region(region, commands)
+        self._drawn_lists = {key: list(group) for key, group in current.items()}
+
+    def _redraw_region(self, region: Rect, commands: List[DrawCommand]) -> None:
+        """Re-rasterize one region from the background and the commands overlapping it."""
+        from PIL import Image
+
+        left, top, right, bottom = region
+        if self._background_image is not None:
+            tile = self._background_image.crop(region)
+        else:
+            tile = Image.new("1", (right - left, bottom - top), color=255)
+        draw = ImageDraw.Draw(tile)
+
+        for command in commands:
+            if command.bbox is not None and intersects(command.bbox, region):
+                self._paint_command(draw, command, (left, top))
+
+        self.image.paste(tile, (left, top))
+
+    def _paint_command(
+        self,
+        draw: ImageDraw.ImageDraw,
+        command: DrawCommand,
+        origin: Tuple[int, int] = (0, 0),
+        fill: Optional[int] = None,
+    ) -> None:
+        """Replay a recorded command onto a draw context whose (0, 0) is origin.
+
+        Args:
+            draw: Target draw context
+            command: Command to replay
+            origin: Frame position of the target's top-left corner
+            fill: Paint with this value instead of the command's own (e.g. 1
+                to draw a coverage mask)
+        """
+        position = (command.position[0] - origin[0], command.position[1] - origin[1])
+        if command.kind == "text":
+            mask = self._text_mask(command.arg, command.option, command.fill)
+            ink = command.fill if fill is None else fill
+            if mask is None:
+                font = self._get_font(command.option)
+                with self._font_lock:
+                    draw.text(position, command.arg, font=font, fill=ink)
+            elif mask.image is not None:
+                draw.bitmap(
+                    (position[0] + mask.left, position[1] + mask.top), mask.image, fill=ink
+                )
+        else:
+            draw.bitmap(position, self.icons.get(command.arg, command.option), fill=fill)
 
     def render(self) -> None:
         """Save rendered image to file."""
+        self._flush()
         self.image.save(self.output_path, "BMP")
         print(f"Rendered to {self.output_path}")
 
@@ -185,23 +447,44 @@ class PILRenderer(Renderer):
 
     def clear(self) -> None:
         """Clear the display."""
-        self.image = self._create_base_image()
-        self.draw = ImageDraw.Draw(self.image)
+        self._previous_dirty = self._dirty
+        self._dirty = []
+        if self.retained:
+            # The image keeps the previous frame; the next flush redraws
+            # only what the new display lists change.
+            self._display_lists = {}
+            self._group = ""
+            self._flushed = False
+            return
+
+        # Reset the working image in place: one copy of the background's
+        # pixels, no new image or draw context per frame.
+        if self._background_image is not None:
+            self.image.paste(self._background_image)
+        else:
+            self.image.paste(255, (0, 0, *self.size))
 
     def draw_icon(self, position: Tuple[int, int], name: str, size: int = 100) -> None:
-        """Draw a weather icon from assets at the given position."""
-        from PIL import Image, ImageOps
-
-        assets_dir = Path(__file__).parent.parent.parent / "assets" / "weather-icons"
-        icon_path = assets_dir / f"{name}-{size}x{size}.bmp"
-
-        if not icon_path.exists():
-            raise FileNotFoundError(f"Icon file not found: {icon_path}")
-
-        with Image.open(icon_path) as icon_im:
-            inverted = ImageOps.invert(icon_im)
-            self.draw.bitmap(position, inverted)
+        """Draw a weather icon from the icon atlas at the given position."""
+        icon = self.icons.get(name, size)
+        x, y = position
+        width, height = icon.size
+        bbox = (x, y, x + width, y + height)
+        if self.retained:
+            self._record(DrawCommand("icon", position, name, size, 0, bbox))
+        else:
+            self.draw.bitmap(position, icon)
+        self._mark_dirty(bbox)
 
     def get_image(self):
-        """Get the underlying PIL Image (for inspection in tests)."""
+        """Get the underlying PIL Image (for inspection in tests).
+
+        The same image is redrawn every frame; copy it to keep a frame.
+        """
+        self._flush()
         return self.image
+
+    def close(self) -> None:
+        """Unmap the background's raw cache file, if it was mapped."""
+        if self.background is not None:
+            self.background.close()
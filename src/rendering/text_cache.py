@@ -0,0 +1,99 @@
+"""LRU cache of rasterized text masks."""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+
+@dataclass
+class TextCacheStats:
+    """Counters describing text cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class TextMask:
+    """A string rendered once as a mode "1" mask.
+
+    left/top place the mask relative to the text origin; image is None for
+    strings that draw nothing (empty or whitespace only).
+    """
+
+    image: Any
+    left: int
+    top: int
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the mask (PIL keeps one byte per mode "1" pixel)."""
+        if self.image is None:
+            return 0
+        width, height = self.image.size
+        return width * height
+
+
+class TextMaskCache:
+    """Least-recently-used text masks, bounded by their total size in bytes.
+
+    Keys are whatever identifies a rendering, e.g. (text, style, fill). When
+    adding a mask would exceed max_bytes the least recently used masks are
+    evicted; a mask larger than max_bytes on its own is not cached.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024):
+        """Initialize text mask cache.
+
+        Args:
+            max_bytes: Upper bound on the memory held by cached masks (0 = disabled)
+        """
+        self.max_bytes = max_bytes
+        self.stats = TextCacheStats()
+        self.nbytes = 0
+        self._masks: "OrderedDict[Hashable, TextMask]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def get(self, key: Hashable) -> Optional[TextMask]:
+        """Look up a mask, marking it most recently used."""
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is None:
+                self.stats.misses += 1
+                return None
+            self._masks.move_to_end(key)
+            self.stats.hits += 1
+            return mask
+
+    def put(self, key: Hashable, mask: TextMask) -> None:
+        """Store a mask, evicting least recently used masks to stay under max_bytes."""
+        size = mask.nbytes
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._masks.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            while self._masks and self.nbytes + size > self.max_bytes:
+                _, evicted = self._masks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.stats.evictions += 1
+            self._masks[key] = mask
+            self.nbytes += size
+
+    def clear(self) -> None:
+        """Drop every cached mask (the stats are kept)."""
+        with self._lock:
+            self._masks.clear()
+            self.nbytes = 0
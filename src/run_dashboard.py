@@ -0,0 +1,117 @@
+"""Run the dashboard against Home Assistant, a recording or a replay.
+
+Builds the production widget set (weather, forecast, sun and the
+rooms.widget.yml rooms), runs Dashboard.run() for the requested number of
+cycles and writes each frame to a BMP.
+
+    python src/run_dashboard.py                              # live (HASS_URL, HASS_TOKEN)
+    python src/run_dashboard.py --record hass.jsonl.gz       # live, recording responses
+    python src/run_dashboard.py --replay hass.jsonl.gz --replay-latency --cycles 10
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from components.rooms_widget import RoomsWidget
+from components.sun_widget import SunWidget
+from components.weather_forecast_widget import WeatherForecastWidget
+from components.weather_widget import WeatherWidget
+from core.forecast_cache import StaleWhileRevalidateHASSClient
+from core.hass_client import HASSClient, RealHASSClient
+from core.recording_client import RecordingHASSClient, ReplayHASSClient
+from dashboard import Dashboard
+from rendering.renderer import PILRenderer, Renderer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Device of the weather.home integration, whose forecasts the dashboard shows
+FORECAST_DEVICE_ID = "c8e8bb619ae918a8ed095ab1889f5a07"
+
+
+def build_dashboard(
+    hass: HASSClient,
+    renderer: Renderer,
+    config_path: str = str(ROOT / "rooms.widget.yml"),
+    **dashboard_options,
+) -> Dashboard:
+    """Dashboard with the production widget set."""
+    dashboard = Dashboard(renderer, **dashboard_options)
+    dashboard.add_widget(WeatherWidget(hass, renderer))
+    dashboard.add_widget(WeatherForecastWidget(hass, renderer, device_id=FORECAST_DEVICE_ID))
+    dashboard.add_widget(SunWidget(hass, renderer))
+    dashboard.add_widget(RoomsWidget(hass, renderer, config_path=config_path))
+    return dashboard
+
+
+def live_client() -> RealHASSClient:
+    """Client for the Home Assistant named by HASS_URL and HASS_TOKEN (or .env)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    url, token = os.getenv("HASS_URL"), os.getenv("HASS_TOKEN")
+    if url is None or token is None:
+        raise RuntimeError("HASS_URL and HASS_TOKEN environment variables must be set")
+    return RealHASSClient(url, token)
+
+
+def make_client(
+    replay: Optional[str] = None,
+    record: Optional[str] = None,
+    replay_latency: bool = False,
+) -> HASSClient:
+    """Client for a replay file, or the live Home Assistant (optionally recorded).
+
+    Forecasts are served stale-while-revalidate, so a slow weather service
+    call never holds up a dashboard cycle once the first forecast is in.
+    """
+    client: HASSClient
+    if replay is not None:
+        client = ReplayHASSClient(replay, replay_latency=replay_latency)
+    else:
+        client = live_client()
+        if record is not None:
+            client = RecordingHASSClient(client, record)
+    return StaleWhileRevalidateHASSClient(client)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", help="serve HASS responses from a recording")
+    source.add_argument("--record", help="record live HASS responses to this file")
+    parser.add_argument(
+        "--replay-latency", action="store_true", help="reproduce recorded response times"
+    )
+    parser.add_argument("--cycles", type=int, default=1, help="dashboard cycles to run")
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds between cycles")
+    parser.add_argument("--output", default="output.bmp", help="BMP file for each frame")
+    parser.add_argument("--config", default=str(ROOT / "rooms.widget.yml"), help="rooms config")
+    parser.add_argument("--snapshot", help="last-known-state snapshot file")
+    args = parser.parse_args()
+
+    client = make_client(args.replay, args.record, args.replay_latency)
+    renderer = PILRenderer(output_path=args.output)
+    dashboard = build_dashboard(
+        client, renderer, config_path=args.config, snapshot_path=args.snapshot
+    )
+    dashboard.warm_start()
+    try:
+        for cycle in range(args.cycles):
+            if cycle and args.interval:
+                time.sleep(args.interval)
+            dashboard.run()
+            metrics = dashboard.metrics
+            print(
+                f"cycle {metrics.cycles}: fetch {metrics.last_fetch_seconds * 1000:.1f} ms, "
+                f"render {metrics.last_render_seconds * 1000:.1f} ms"
+            )
+    finally:
+        dashboard.close()
+        renderer.close()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,49 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.hass_mock import MockHASSClient
+from rendering.renderer import PILRenderer
+
+
+@pytest.fixture
+def mock_hass():
+    """Fixture: Mock HASS client with test data."""
+    client = MockHASSClient()
+
+    room_entities = {
+        "climate.0x5cc7c1fffede1ef5_5": ("heat", {"current_temperature": 23.5}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_5": ("55", {}),
+        "climate.0x5cc7c1fffede1ef5_1": ("heat", {"current_temperature": 21.8}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_1": ("42", {}),
+        "climate.0x5cc7c1fffede1ef5_2": ("heat", {"current_temperature": 22.1}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_2": ("44", {}),
+        "climate.0x5cc7c1fffede1ef5_6": ("heat", {"current_temperature": 24.0}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_6": ("38", {}),
+        "climate.0x5cc7c1fffede1ef5_7": ("heat", {"current_temperature": 23.0}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_8": ("50", {}),
+        "climate.0x5cc7c1fffede1ef5_4": ("heat", {"current_temperature": 21.0}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_4": ("41", {}),
+        "climate.0x5cc7c1fffede1ef5_8": ("heat", {"current_temperature": 20.5}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_9": ("43", {}),
+        "climate.0x5cc7c1fffede1ef5_3": ("heat", {"current_temperature": 21.2}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_3": ("40", {}),
+        "climate.0x5cc7c1fffede1ef5_9": ("heat", {"current_temperature": 19.8}),
+        "sensor.0x5cc7c1fffede1ef5_humidity_10": ("52", {}),
+        "climate.0x5cc7c1fffede1ef5_10": ("heat", {"current_temperature": 18.0}),
+    }
+
+    for entity_id, (state, attributes) in room_entities.items():
+        client.set_entity(entity_id, state, attributes)
+
+    return client
+
+
+@pytest.fixture
+def pil_renderer():
+    """Fixture: PIL renderer for testing."""
+    return PILRenderer(size=(800, 480), output_path="test_output.bmp")
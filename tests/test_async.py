@@ -0,0 +1,174 @@
+"""Tests for the asyncio HASS client and concurrent dashboard updates."""
+import asyncio
+import time
+
+from components.rooms_widget import RoomsWidget
+from components.sun_widget import SunWidget
+from components.weather_forecast_widget import WeatherForecastWidget
+from components.weather_widget import WeatherWidget
+from core.async_hass_client import RealAsyncHASSClient
+from core.coalescing_client import CoalescingAsyncHASSClient
+from core.hass_mock import AsyncMockHASSClient
+from core.testing.fake_hass_server import FakeHASSServer
+from dashboard import Dashboard
+
+
+FORECAST = [
+    {"datetime": "2025-11-01T16:00:00+00:00", "temperature": 12.0, "condition": "sunny"},
+    {"datetime": "2025-11-01T17:00:00+00:00", "temperature": 11.5, "condition": "cloudy"},
+]
+
+
+class TestAsyncDashboard:
+    """Tests for Dashboard.update_all_async."""
+
+    def test_widgets_fetch_concurrently(self, mock_hass, pil_renderer):
+        """Update time tracks the slowest fetch, not the sum of all fetches."""
+        mock_hass.set_forecast(FORECAST)
+        async_hass = AsyncMockHASSClient(mock_hass, latency=0.2)
+
+        dashboard = Dashboard(pil_renderer)
+        dashboard.add_widget(WeatherWidget(async_hass, pil_renderer))
+        dashboard.add_widget(WeatherForecastWidget(async_hass, pil_renderer, device_id="test"))
+        dashboard.add_widget(SunWidget(async_hass, pil_renderer))
+        dashboard.add_widget(RoomsWidget(async_hass, pil_renderer))
+
+        start = time.perf_counter()
+        asyncio.run(dashboard.update_all_async())
+        elapsed = time.perf_counter() - start
+
+        # One prefetch for the three entity widgets, overlapping the forecast.
+        assert async_hass.request_count == 2
+        assert elapsed < 0.6  # serial would be 4 x 0.2s
+        weather, forecast, sun, rooms = dashboard.widgets
+        assert weather.get_temperature() == 22.5
+        assert forecast.items[0].condition == "sunny"
+        assert sun.sunrise is not None
+        assert rooms.rooms[0].temperature == 23.5
+
+    def test_timeout_keeps_cached_data(self, mock_hass, pil_renderer):
+        """A widget that overruns its timeout keeps its previous data."""
+        fast = AsyncMockHASSClient(mock_hass)
+        slow = AsyncMockHASSClient(mock_hass, latency=1.0)
+
+        weather = WeatherWidget(fast, pil_renderer, cache_ttl=0)
+        asyncio.run(weather.update_async())
+        assert weather.get_temperature() == 22.5
+
+        mock_hass.set_entity("weather.home", "rainy", {"temperature": 9.0, "condition": "rainy"})
+        weather.hass_client = slow
+        weather.fetch_timeout = 0.05
+        sun = SunWidget(fast, pil_renderer)
+
+        dashboard = Dashboard(pil_renderer)
+        dashboard.add_widget(weather)
+        dashboard.add_widget(sun)
+
+        start = time.perf_counter()
+        asyncio.run(dashboard.update_all_async(timeout=5.0))
+
+        assert time.perf_counter() - start < 0.5
+        assert weather.get_temperature() == 22.5
+        assert sun.sunrise is not None
+
+    def test_sync_client_runs_in_threads(self, mock_hass, pil_renderer):
+        """Widgets with a synchronous client still update through the async path."""
+        dashboard = Dashboard(pil_renderer)
+        dashboard.add_widget(WeatherWidget(mock_hass, pil_renderer))
+        dashboard.add_widget(RoomsWidget(mock_hass, pil_renderer))
+
+        asyncio.run(dashboard.run_async())
+
+        assert mock_hass.request_count == 1
+        assert dashboard.widgets[0].get_temperature() == 22.5
+        assert len(dashboard.widgets[1].rooms) == 10
+
+    def test_cycle_budget_bounds_fetches(self, mock_hass, pil_renderer):
+        """run_async cuts fetches off at the cycle budget and records the overrun."""
+        fast = AsyncMockHASSClient(mock_hass)
+        slow = AsyncMockHASSClient(mock_hass, latency=1.0)
+        dashboard = Dashboard(pil_renderer, cycle_budget=0.2, render_reserve=0.05)
+        dashboard.add_widget(WeatherWidget(fast, pil_renderer))
+        dashboard.add_widget(SunWidget(slow, pil_renderer))
+
+        start = time.perf_counter()
+        asyncio.run(dashboard.run_async())
+        elapsed = time.perf_counter() - start
+
+        weather, sun = dashboard.widgets
+        assert elapsed < 0.5
+        assert not weather.stale
+        assert sun.stale
+        assert dashboard.metrics.widget_overruns == {"SunWidget": 1}
+
+
+class TestCoalescingAsyncHASSClient:
+    """Tests for async single-flight request coalescing."""
+
+    def test_dashboards_share_in_flight_requests(self, mock_hass, pil_renderer):
+        """Two dashboards updating at once fetch each entity and forecast once."""
+        mock_hass.set_forecast(FORECAST)
+        inner = AsyncMockHASSClient(mock_hass, latency=0.1)
+        client = CoalescingAsyncHASSClient(inner)
+
+        dashboards = []
+        for _ in range(2):
+            dashboard = Dashboard(pil_renderer)
+            dashboard.add_widget(WeatherWidget(client, pil_renderer))
+            dashboard.add_widget(WeatherForecastWidget(client, pil_renderer, device_id="test"))
+            dashboard.add_widget(SunWidget(client, pil_renderer))
+            dashboards.append(dashboard)
+
+        async def update_both():
+            await asyncio.gather(*(dashboard.update_all_async() for dashboard in dashboards))
+
+        asyncio.run(update_both())
+
+        # Each dashboard prefetches its entities and fetches the forecast.
+        assert inner.request_count == 2
+        assert client.stats.saved_requests == 2
+        assert all(dashboard.widgets[0].get_temperature() == 22.5 for dashboard in dashboards)
+
+
+class TestRealAsyncHASSClient:
+    """Tests for the aiohttp-backed client against the fake REST server."""
+
+    def test_bulk_and_single_lookups(self):
+        """Entities come back as Entity objects; unknown IDs are omitted."""
+        async def fetch(url):
+            client = RealAsyncHASSClient(url, "token")
+            try:
+                single = await client.get_entities(["sun.sun"])
+                bulk = await client.get_entities(["sun.sun", "weather.home", "sensor.missing"])
+                return single, bulk
+            finally:
+                await client.close()
+
+        with FakeHASSServer() as server:
+            server.set_state("sun.sun", "above_horizon")
+            server.set_state("weather.home", "cloudy", {"temperature": 12.5})
+            single, bulk = asyncio.run(fetch(server.url))
+
+        assert single["sun.sun"].state == "above_horizon"
+        assert set(bulk) == {"sun.sun", "weather.home"}
+        assert bulk["weather.home"].attributes["temperature"] == 12.5
+        assert server.request_count == 2
+
+    def test_read_timeout_and_errors_are_logged(self, caplog):
+        """A slow server hits the read timeout; failures are logged, not raised."""
+        async def fetch(url):
+            client = RealAsyncHASSClient(url, "token", read_timeout=0.1)
+            try:
+                started = time.perf_counter()
+                entity = await client.get_entity("sun.sun")
+                return entity, time.perf_counter() - started
+            finally:
+                await client.close()
+
+        with FakeHASSServer(latency=1.0) as server:
+            server.set_state("sun.sun", "above_horizon")
+            entity, elapsed = asyncio.run(fetch(server.url))
+
+        assert entity is None
+        assert elapsed < 0.9
+        assert "Error fetching entity sun.sun" in caplog.text
@@ -0,0 +1,807 @@
+"""Tests for HASS client implementations."""
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from components.rooms_widget import RoomsWidget
+from components.sun_widget import SunWidget
+from components.weather_forecast_widget import WeatherForecastWidget
+from components.weather_widget import WeatherWidget
+from core.caching_client import CachingHASSClient
+from core.circuit_breaker import CircuitBreaker
+from core.coalescing_client import CoalescingHASSClient
+from core.forecast_cache import StaleWhileRevalidateHASSClient
+from core.hass_client import RealHASSClient
+from core.hass_mock import MockHASSClient
+from core.hass_websocket import WebSocketHASSClient
+from core.history import HistoryBuffer, lttb
+from core.recording_client import RecordingHASSClient, ReplayHASSClient
+from core.testing.fake_hass_server import FakeHASSServer
+from core.testing.fake_hass_websocket import FakeHASSWebSocketServer
+from dashboard import Dashboard
+
+
+class FakeHassApi:
+    """Stand-in for homeassistant_api.Client that counts REST calls."""
+
+    def __init__(self, states):
+        self.states = states
+        self.calls = []
+
+    def get_states(self):
+        self.calls.append("states")
+        return tuple(self.states.values())
+
+    def get_state(self, entity_id):
+        self.calls.append(f"states/{entity_id}")
+        if entity_id not in self.states:
+            raise LookupError(entity_id)
+        return self.states[entity_id]
+
+
+@pytest.fixture
+def real_client():
+    """Fixture: RealHASSClient backed by a fake REST API."""
+    states = {
+        entity_id: SimpleNamespace(entity_id=entity_id, state=state, attributes=attributes)
+        for entity_id, state, attributes in [
+            ("sun.sun", "above_horizon", {"next_rising": "2025-11-01T06:23:08+00:00"}),
+            ("weather.home", "cloudy", {"temperature": 12.5}),
+            ("climate.living_room", "heat", {"current_temperature": 21.5}),
+            ("sensor.living_room_humidity", "44", {}),
+        ]
+    }
+    client = RealHASSClient("http://localhost:8123/api", "token")
+    client._client = FakeHassApi(states)
+    return client
+
+
+class TestBulkStates:
+    """Tests for the bulk state API."""
+
+    def test_get_all_states(self, real_client):
+        """All states come back as Entity objects from one request."""
+        states = real_client.get_all_states()
+
+        assert real_client._client.calls == ["states"]
+        assert set(states) == {
+            "sun.sun",
+            "weather.home",
+            "climate.living_room",
+            "sensor.living_room_humidity",
+        }
+        assert states["weather.home"].attributes["temperature"] == 12.5
+
+    def test_get_entities_single_request(self, real_client):
+        """Several entities are fetched with one /api/states call; unknown IDs are omitted."""
+        entities = real_client.get_entities(
+            ["climate.living_room", "sensor.living_room_humidity", "sensor.missing"]
+        )
+
+        assert real_client._client.calls == ["states"]
+        assert set(entities) == {"climate.living_room", "sensor.living_room_humidity"}
+        assert entities["sensor.living_room_humidity"].state == "44"
+
+    def test_get_entities_single_id_uses_entity_endpoint(self, real_client):
+        """A lone entity avoids downloading the full state dump."""
+        entities = real_client.get_entities(["sun.sun"])
+
+        assert real_client._client.calls == ["states/sun.sun"]
+        assert entities["sun.sun"].state == "above_horizon"
+
+    def test_mock_get_entities(self):
+        """The mock serves bulk lookups with one counted request."""
+        client = MockHASSClient()
+
+        entities = client.get_entities(["sun.sun", "weather.home", "sensor.missing"])
+
+        assert set(entities) == {"sun.sun", "weather.home"}
+        assert client.request_count == 1
+        assert client.get_entities([]) == {}
+        assert client.request_count == 1
+
+
+class TestConnectionReuse:
+    """Tests for the persistent pooled HTTP session."""
+
+    def test_requests_share_one_connection(self):
+        """Many lookups reuse a single keep-alive connection."""
+        with FakeHASSServer() as server:
+            server.set_state("sun.sun", "above_horizon", {"elevation": 12.0})
+            server.set_state("weather.home", "cloudy", {"temperature": 12.5})
+
+            with RealHASSClient(server.url, "token", cache_expire_after=0) as client:
+                for _ in range(10):
+                    assert client.get_entity("sun.sun").state == "above_horizon"
+                assert set(client.get_entities(["sun.sun", "weather.home"])) == {
+                    "sun.sun",
+                    "weather.home",
+                }
+
+            assert server.request_count == 11
+            assert server.connection_count == 1
+
+    def test_http_cache_serves_repeated_lookups(self):
+        """By default repeated GETs are answered from the in-memory HTTP cache."""
+        with FakeHASSServer() as server:
+            server.set_state("sun.sun", "above_horizon")
+
+            with RealHASSClient(server.url, "token") as client:
+                for _ in range(5):
+                    assert client.get_entity("sun.sun").state == "above_horizon"
+
+            assert server.request_count == 1
+
+    def test_missing_entity_returns_none(self):
+        """A 404 from Home Assistant maps to None without breaking the session."""
+        with FakeHASSServer() as server:
+            server.set_state("sun.sun", "above_horizon")
+
+            with RealHASSClient(server.url, "token") as client:
+                assert client.get_entity("sensor.missing") is None
+                assert client.get_entity("sun.sun") is not None
+
+            assert server.connection_count == 1
+
+
+class TestFakeHASSServer:
+    """Tests for the fake server's forecast service and fault injection."""
+
+    FORECAST = [{"datetime": "2025-11-01T16:00:00+00:00", "temperature": 12.0}]
+
+    def test_forecast_service_single_request(self):
+        """Forecasts come from one POST to the get_forecasts service."""
+        with FakeHASSServer() as server:
+            server.set_forecast(self.FORECAST)
+
+            with RealHASSClient(server.url, "token") as client:
+                assert client.get_forecast("device-1") == self.FORECAST
+                assert client.get_forecast("device-1", "daily") == []
+
+            assert server.request_count == 2
+
+    def test_injected_errors_are_retried(self):
+        """500s from the error rate go through the client's retry path."""
+        with FakeHASSServer(error_rate=1.0, seed=1) as server:
+            server.set_state("sun.sun", "above_horizon")
+
+            with RealHASSClient(server.url, "token", sleep=lambda _: None) as client:
+                assert client.get_entity("sun.sun") is None
+                assert server.request_count == 3
+                assert server.error_count == 3
+
+                server.error_rate = 0.0
+                assert client.get_entity("sun.sun").state == "above_horizon"
+
+    def test_latency_and_entity_count(self):
+        """Responses are delayed and the state dump includes filler entities."""
+        with FakeHASSServer(latency=0.05, jitter=0.01, entity_count=200, seed=1) as server:
+            with RealHASSClient(server.url, "token") as client:
+                started = time.perf_counter()
+                states = client.get_all_states()
+                elapsed = time.perf_counter() - started
+
+        assert len(states) == 200
+        assert states["sensor.filler_7"].state == "27"
+        assert elapsed >= 0.04
+
+    @pytest.mark.parametrize("server_class", [FakeHASSServer, FakeHASSWebSocketServer])
+    def test_stop_without_start(self, server_class):
+        """A fake that never started stops at once."""
+        server = server_class()
+        stopper = threading.Thread(target=server.stop)
+        stopper.start()
+        stopper.join(2)
+        assert not stopper.is_alive()
+
+    def test_core_does_not_load_fakes(self):
+        """Importing the core package leaves the test servers unloaded."""
+        code = "import sys, core; print(any(m.startswith('core.testing') for m in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent.parent / "src",
+        )
+        assert result.stdout.strip() == "False"
+
+
+def wait_for(predicate, timeout=5.0):
+    """Poll until predicate() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestWebSocketHASSClient:
+    """Tests for the WebSocket subscription client against a fake HA server."""
+
+    @pytest.fixture
+    def ws_server(self):
+        with FakeHASSWebSocketServer(token="secret") as server:
+            server.set_state("sun.sun", "above_horizon", {"next_rising": "2025-11-01T06:23:08+00:00"})
+            server.set_state("weather.home", "cloudy", {"temperature": 12.5, "condition": "cloudy"})
+            server.set_state("light.unrelated", "on")
+            yield server
+
+    def test_subscribes_to_dashboard_entities(self, ws_server, pil_renderer):
+        """Only the entities the widgets use are subscribed and mirrored."""
+        dashboard = Dashboard(pil_renderer)
+        with WebSocketHASSClient(ws_server.url, "secret") as client:
+            dashboard.add_widget(WeatherWidget(client, pil_renderer))
+            dashboard.add_widget(SunWidget(client, pil_renderer))
+            client.subscribe(dashboard.entity_ids())
+
+            assert client.wait_until_synced(timeout=5)
+            assert ws_server.subscribed_entity_ids == [["weather.home", "sun.sun"]]
+            assert set(client.get_all_states()) == {"weather.home", "sun.sun"}
+
+            dashboard.update_all()
+            assert dashboard.widgets[0].get_temperature() == 12.5
+
+    def test_pushed_changes_update_state_table(self, ws_server):
+        """State and attribute diffs are applied without any request."""
+        with WebSocketHASSClient(ws_server.url, "secret", entity_ids=["weather.home"]) as client:
+            assert client.wait_until_synced(timeout=5)
+
+            ws_server.set_state("weather.home", "rainy", {"temperature": 9.0})
+
+            assert wait_for(lambda: client.get_entity("weather.home").state == "rainy")
+            weather = client.get_entity("weather.home")
+            assert weather.attributes == {"temperature": 9.0}
+
+            ws_server.remove_state("weather.home")
+            assert wait_for(lambda: client.get_entity("weather.home") is None)
+
+    def test_reconnect_resyncs(self, ws_server):
+        """After a dropped connection the client reconnects and resyncs changes and removals."""
+        client = WebSocketHASSClient(
+            ws_server.url, "secret", entity_ids=["sun.sun", "weather.home"], reconnect_delay=0.05
+        )
+        with client:
+            assert client.wait_until_synced(timeout=5)
+            assert client.get_entity("weather.home") is not None
+
+            ws_server.drop_connections()
+            assert wait_for(lambda: not client.is_connected())
+            ws_server.states["sun.sun"] = ("below_horizon", {})
+            del ws_server.states["weather.home"]
+
+            assert wait_for(lambda: client.get_entity("sun.sun").state == "below_horizon")
+            assert client.get_entity("weather.home") is None
+            assert client.reconnect_count >= 1
+            assert ws_server.connection_count >= 2
+
+    def test_bad_token_keeps_table_empty(self, ws_server):
+        """Authentication failures never populate the table."""
+        with WebSocketHASSClient(ws_server.url, "wrong", entity_ids=["sun.sun"]) as client:
+            assert not client.wait_until_synced(timeout=0.3)
+            assert client.get_entity("sun.sun") is None
+
+    def test_forecast_over_websocket(self, ws_server):
+        """Forecasts are fetched with a call_service command."""
+        ws_server.set_forecast([{"datetime": "2025-11-01T16:00:00+00:00", "temperature": 12.0}])
+
+        with WebSocketHASSClient(ws_server.url, "secret") as client:
+            assert client.wait_until_synced(timeout=5)
+            forecast = client.get_forecast("device-1")
+
+        assert forecast == [{"datetime": "2025-11-01T16:00:00+00:00", "temperature": 12.0}]
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachingHASSClient:
+    """Tests for the caching decorator."""
+
+    def test_shared_cache_across_widgets(self, mock_hass, pil_renderer):
+        """Two widgets reading the same entity cost one request."""
+        cached = CachingHASSClient(mock_hass)
+
+        WeatherWidget(cached, pil_renderer).update()
+        WeatherWidget(cached, pil_renderer).update()
+
+        assert mock_hass.request_count == 1
+        assert cached.stats.hits == 1
+        assert cached.stats.misses == 1
+
+    def test_per_domain_and_entity_ttls(self, mock_hass):
+        """Entity TTLs override domain TTLs, which override the default."""
+        clock = FakeClock()
+        cached = CachingHASSClient(
+            mock_hass,
+            default_ttl=10,
+            domain_ttls={"sun": 300},
+            entity_ttls={"weather.home": 60},
+            clock=clock,
+        )
+        assert cached.ttl_for("sensor.any") == 10
+        assert cached.ttl_for("sun.sun") == 300
+        assert cached.ttl_for("weather.home") == 60
+
+        cached.get_entities(["sun.sun", "weather.home"])
+        clock.now += 61
+        cached.get_entities(["sun.sun", "weather.home"])
+
+        # sun.sun still fresh; weather.home expired and refetched on its own.
+        assert mock_hass.request_count == 2
+        assert cached.stats.hits == 1
+        assert cached.stats.misses == 3
+
+    def test_get_all_states_only_refreshes_cached_entities(self, mock_hass):
+        """A full state dump refreshes cached entities without adding new ones."""
+        clock = FakeClock()
+        cached = CachingHASSClient(mock_hass, default_ttl=10, max_entries=2, clock=clock)
+        cached.get_entity("sun.sun")
+        clock.now += 8
+
+        states = cached.get_all_states()
+
+        assert len(states) > 2
+        assert len(cached) == 1
+        clock.now += 8
+        cached.get_entity("sun.sun")
+        assert cached.stats.hits == 1
+        assert cached.stats.evictions == 0
+
+    def test_lru_eviction(self, mock_hass):
+        """The least recently used entry is evicted once the bound is reached."""
+        cached = CachingHASSClient(mock_hass, max_entries=2)
+
+        cached.get_entity("sun.sun")
+        cached.get_entity("weather.home")
+        cached.get_entity("sun.sun")
+        cached.get_entity("climate.0x5cc7c1fffede1ef5_1")
+
+        assert len(cached) == 2
+        assert cached.stats.evictions == 1
+        cached.get_entity("sun.sun")
+        assert cached.stats.hits == 2
+        cached.get_entity("weather.home")
+        assert cached.stats.misses == 4
+
+    def test_forecast_cached_and_failures_not_cached(self, mock_hass):
+        """Forecasts are cached by (device, type); empty results are retried."""
+        cached = CachingHASSClient(mock_hass)
+
+        assert cached.get_forecast("device-1") == []
+        mock_hass.set_forecast([{"datetime": "2025-11-01T16:00:00+00:00"}])
+        assert len(cached.get_forecast("device-1")) == 1
+        assert len(cached.get_forecast("device-1")) == 1
+        cached.get_forecast("device-1", "daily")
+
+        assert mock_hass.request_count == 3
+        assert cached.get_entity("sensor.missing") is None
+        assert cached.get_entity("sensor.missing") is None
+        assert mock_hass.request_count == 5
+
+
+class GatedForecastClient(MockHASSClient):
+    """Mock whose calls block until released, and whose forecasts can be made to fail."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def get_entity(self, entity_id):
+        self.release.wait(5)
+        return super().get_entity(entity_id)
+
+    def get_forecast(self, device_id, forecast_type="hourly"):
+        self.release.wait(5)
+        self.request_count += 1
+        if self.fail:
+            raise ConnectionError("Home Assistant is down")
+        return list(self.forecast_data)
+
+
+class TestStaleWhileRevalidate:
+    """Tests for the stale-while-revalidate forecast cache."""
+
+    @pytest.fixture
+    def setup(self):
+        inner = GatedForecastClient()
+        inner.set_forecast([{"datetime": "2025-11-01T16:00:00+00:00", "temperature": 12.0}])
+        clock = FakeClock()
+        cache = StaleWhileRevalidateHASSClient(inner, soft_ttl=300, hard_ttl=3600, clock=clock)
+        return inner, clock, cache
+
+    def test_stale_forecast_served_while_refreshing(self, setup):
+        """Past the soft TTL the old forecast comes back at once and refreshes in the background."""
+        inner, clock, cache = setup
+        assert cache.get_forecast("device-1")[0]["temperature"] == 12.0
+
+        inner.set_forecast([{"datetime": "2025-11-01T17:00:00+00:00", "temperature": 9.0}])
+        inner.release.clear()
+        clock.now += 301
+
+        start = time.perf_counter()
+        assert cache.get_forecast("device-1")[0]["temperature"] == 12.0
+        assert cache.get_forecast("device-1")[0]["temperature"] == 12.0
+        assert time.perf_counter() - start < 0.5
+
+        inner.release.set()
+        cache.wait_for_refresh(timeout=5)
+        assert cache.get_forecast("device-1")[0]["temperature"] == 9.0
+        assert inner.request_count == 2
+
+    def test_errors_served_from_cache_until_hard_ttl(self, setup):
+        """Failed refreshes keep the cached forecast until the hard TTL expires."""
+        inner, clock, cache = setup
+        cache.get_forecast("device-1")
+
+        inner.fail = True
+        clock.now += 301
+        assert len(cache.get_forecast("device-1")) == 1
+        cache.wait_for_refresh(timeout=5)
+        assert len(cache.get_forecast("device-1")) == 1
+        assert cache.refresh_failures >= 1
+
+        clock.now += 3600
+        assert cache.get_forecast("device-1") == []
+
+    def test_failed_refresh_waits_for_retry_interval(self, setup):
+        """After a failed refresh the next one waits for the retry interval."""
+        inner, clock, cache = setup
+        cache.get_forecast("device-1")
+
+        inner.fail = True
+        clock.now += 301
+        for _ in range(5):
+            cache.get_forecast("device-1")
+            cache.wait_for_refresh(timeout=5)
+        assert inner.request_count == 2
+
+        clock.now += cache.retry_interval
+        cache.get_forecast("device-1")
+        cache.wait_for_refresh(timeout=5)
+        assert inner.request_count == 3
+        assert cache.refresh_failures == 2
+
+
+class TestCoalescingHASSClient:
+    """Tests for single-flight request coalescing."""
+
+    def test_concurrent_lookups_share_one_request(self):
+        """Threads asking for the same entity while it is in flight share one request."""
+        inner = GatedForecastClient()
+        inner.release.clear()
+        client = CoalescingHASSClient(inner)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get_entity("weather.home")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        assert wait_for(lambda: client.stats.shared == 4)
+        inner.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert inner.request_count == 1
+        assert client.stats.executed == 1
+        assert client.stats.saved_requests == 4
+        assert [entity.state for entity in results] == ["cloudy"] * 5
+
+    def test_errors_propagate_and_flight_is_forgotten(self):
+        """An exception reaches the caller and the next call runs again."""
+        inner = GatedForecastClient()
+        inner.fail = True
+        client = CoalescingHASSClient(inner)
+
+        with pytest.raises(ConnectionError):
+            client.get_forecast("device-1")
+
+        inner.fail = False
+        assert client.get_forecast("device-1") == []
+        assert client.stats.executed == 2
+        assert client.stats.saved_requests == 0
+
+
+class FlakyHassApi(FakeHassApi):
+    """FakeHassApi whose next `failures` calls raise a connection error."""
+
+    def __init__(self, states, failures):
+        super().__init__(states)
+        self.failures = failures
+
+    def get_state(self, entity_id):
+        if self.failures:
+            self.failures -= 1
+            self.calls.append(f"failed/{entity_id}")
+            raise requests.exceptions.ConnectionError("connection refused")
+        return super().get_state(entity_id)
+
+
+class TestRetryAndCircuitBreaker:
+    """Tests for timeouts, retries and the circuit breaker in RealHASSClient."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def flaky_client(self, real_client, clock):
+        """real_client with recorded backoff sleeps and a fake-clock breaker."""
+        sleeps = []
+        real_client._client = FlakyHassApi(real_client._client.states, failures=0)
+        real_client.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+        real_client._sleep = sleeps.append
+        real_client.sleeps = sleeps
+        return real_client
+
+    def test_timeouts_passed_to_every_request(self):
+        """Connect/read timeouts are applied to all library requests."""
+        client = RealHASSClient(
+            "http://localhost:8123/api", "token", connect_timeout=1.5, read_timeout=4.0
+        )
+        assert client._client.global_request_kwargs["timeout"] == (1.5, 4.0)
+
+    def test_transient_errors_retried_with_backoff(self, flaky_client):
+        """Connection errors are retried with doubling delays until one succeeds."""
+        flaky_client._client.failures = 2
+
+        entity = flaky_client.get_entity("sun.sun")
+
+        assert entity.state == "above_horizon"
+        assert flaky_client.sleeps == [0.5, 1.0]
+        assert flaky_client.breaker.state == CircuitBreaker.CLOSED
+
+    def test_not_found_is_not_retried(self, flaky_client):
+        """An unknown entity fails once without retries or tripping the breaker."""
+        assert flaky_client.get_entity("sensor.missing") is None
+        assert flaky_client._client.calls == ["states/sensor.missing"]
+        assert flaky_client.breaker.failure_count == 0
+
+    def test_breaker_opens_and_fails_fast(self, flaky_client, clock, pil_renderer):
+        """After repeated failures requests short-circuit and widgets keep cached data."""
+        widget = WeatherWidget(flaky_client, pil_renderer, cache_ttl=0)
+        dashboard = Dashboard(pil_renderer)
+        dashboard.add_widget(widget)
+        dashboard.update_all()
+        assert widget.get_temperature() == 12.5
+
+        flaky_client._client.failures = 100
+        clock.now += 1
+        dashboard.update_all()
+        assert flaky_client.get_entity("sun.sun") is None
+        assert flaky_client.breaker.state == CircuitBreaker.OPEN
+        assert not flaky_client.is_available()
+
+        calls = len(flaky_client._client.calls)
+        clock.now += 1
+        dashboard.update_all()
+        assert flaky_client.get_entity("sun.sun") is None
+        assert len(flaky_client._client.calls) == calls
+        assert widget.get_temperature() == 12.5
+
+    def test_half_open_trial_closes_breaker(self, flaky_client, clock):
+        """After the cooldown one trial request goes out and closes the breaker."""
+        flaky_client._client.failures = 6
+        flaky_client.get_entity("sun.sun")
+        flaky_client.get_entity("sun.sun")
+        assert flaky_client.breaker.state == CircuitBreaker.OPEN
+        assert flaky_client.breaker.retry_after() == 30
+
+        clock.now += 30
+        assert flaky_client.breaker.state == CircuitBreaker.HALF_OPEN
+        assert flaky_client.get_entity("sun.sun").state == "above_horizon"
+        assert flaky_client.breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_trial_reopens(self, clock):
+        """A failed half-open trial reopens the breaker and blocks other callers meanwhile."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        assert not breaker.allow_request()
+
+        clock.now += 10
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.open_count == 2
+
+
+class TestRecordReplay:
+    """Tests for recording HASS responses and replaying them offline."""
+
+    FORECAST = [{"datetime": "2025-11-01T16:00:00+00:00", "temperature": 12.0}]
+
+    def build_dashboard(self, client, renderer):
+        dashboard = Dashboard(renderer)
+        dashboard.add_widget(WeatherWidget(client, renderer))
+        dashboard.add_widget(WeatherForecastWidget(client, renderer, device_id="device-1"))
+        dashboard.add_widget(SunWidget(client, renderer))
+        return dashboard
+
+    def test_dashboard_replays_offline(self, mock_hass, pil_renderer, tmp_path):
+        """A recorded dashboard cycle replays with the same data and no live client."""
+        path = str(tmp_path / "hass.jsonl.gz")
+        mock_hass.set_forecast(self.FORECAST)
+
+        with RecordingHASSClient(mock_hass, path) as recorder:
+            recorded = self.build_dashboard(recorder, pil_renderer)
+            recorded.run()
+        assert recorder.record_count == 2
+
+        replay = ReplayHASSClient(path)
+        replayed = self.build_dashboard(replay, pil_renderer)
+        replayed.run()
+
+        assert replay.request_count == 2
+        assert replay.miss_count == 0
+        for original, copy in zip(recorded.widgets, replayed.widgets):
+            assert copy.get_data() == original.get_data()
+
+    def test_production_client_caches_forecasts(self, mock_hass, pil_renderer, tmp_path):
+        """run_dashboard's client chain serves repeated forecasts from the cache."""
+        from run_dashboard import make_client
+
+        path = str(tmp_path / "hass.jsonl.gz")
+        mock_hass.set_forecast(self.FORECAST)
+        with RecordingHASSClient(mock_hass, path) as recorder:
+            self.build_dashboard(recorder, pil_renderer).run()
+
+        client = make_client(replay=path)
+        dashboard = self.build_dashboard(client, pil_renderer)
+        for _ in range(3):
+            dashboard.run()
+        client.close()
+
+        assert isinstance(client, StaleWhileRevalidateHASSClient)
+        assert client.refresh_count == 1
+
+    def test_responses_replay_in_order_with_latency(self, mock_hass, tmp_path):
+        """Repeated calls replay in recorded order, then repeat the last response."""
+        path = str(tmp_path / "hass.jsonl")
+        ticks = iter([0.0, 0.2, 1.0, 1.5])
+        with RecordingHASSClient(mock_hass, path, clock=lambda: next(ticks)) as recorder:
+            recorder.get_entity("weather.home")
+            mock_hass.set_entity("weather.home", "rainy", {"temperature": 9.0})
+            recorder.get_entity("weather.home")
+
+        sleeps = []
+        replay = ReplayHASSClient(path, replay_latency=True, latency_scale=0.5, sleep=sleeps.append)
+
+        states = [replay.get_entity("weather.home").state for _ in range(3)]
+
+        assert states == ["cloudy", "rainy", "rainy"]
+        assert sleeps == pytest.approx([0.1, 0.25, 0.25])
+        replay.rewind()
+        assert replay.get_entity("weather.home").state == "cloudy"
+
+    def test_unrecorded_lookups_fall_back_to_latest_state(self, mock_hass, tmp_path):
+        """Entities seen in any recorded response can be looked up individually."""
+        path = str(tmp_path / "hass.jsonl")
+        with RecordingHASSClient(mock_hass, path) as recorder:
+            recorder.get_entities(["weather.home", "sun.sun"])
+
+        replay = ReplayHASSClient(path)
+
+        assert replay.get_entity("sun.sun").state == "above_horizon"
+        assert set(replay.get_entities(["sun.sun", "weather.home"])) == {"sun.sun", "weather.home"}
+        assert replay.get_entity("sensor.missing") is None
+        assert replay.get_forecast("device-1") == []
+
+
+    def test_history_replays(self, mock_hass, pil_renderer, tmp_path):
+        """A rooms widget with history enabled replays its history offline."""
+        path = str(tmp_path / "hass.jsonl")
+        now = time.time()
+        entity_ids = RoomsWidget(mock_hass, pil_renderer).entity_ids()
+        for minute in range(120, 0, -10):
+            for entity_id in entity_ids:
+                mock_hass.add_history(
+                    entity_id, now - minute * 60, str(40 + minute % 7),
+                    {"current_temperature": 20 + minute % 5},
+                )
+
+        with RecordingHASSClient(mock_hass, path) as recorder:
+            recorded = RoomsWidget(recorder, pil_renderer, cache_ttl=0, history_hours=24)
+            recorded.update()
+
+        replay = ReplayHASSClient(path)
+        replayed = RoomsWidget(replay, pil_renderer, cache_ttl=0, history_hours=24)
+        replayed.update()
+
+        assert replay.miss_count == 0
+        for original, copy in zip(recorded.rooms, replayed.rooms):
+            assert list(copy.temperature_history.values()) == list(
+                original.temperature_history.values()
+            )
+            assert list(copy.humidity_history.timestamps()) == list(
+                original.humidity_history.timestamps()
+            )
+            assert len(copy.humidity_history) > 0
+
+        # A batch never recorded as such is answered from the recorded samples
+        humidity_id = entity_ids[1]
+        since = datetime.now() - timedelta(hours=3)
+        assert replay.get_history([humidity_id], since) == mock_hass.get_history(
+            [humidity_id], since
+        )
+
+
+class TestHistory:
+    """Tests for batched history, LTTB downsampling and the ring buffer."""
+
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        """LTTB returns the requested count, both endpoints and the spike."""
+        points = [(float(i), 10.0) for i in range(1000)]
+        points[500] = (500.0, 99.0)
+
+        sampled = lttb(points, 50)
+
+        assert len(sampled) == 50
+        assert sampled[0] == points[0]
+        assert sampled[-1] == points[-1]
+        assert (500.0, 99.0) in sampled
+        assert lttb(points[:10], 50) == points[:10]
+
+    def test_ring_buffer_overwrites_oldest(self):
+        """A full buffer drops its oldest samples and stores float32 values."""
+        buffer = HistoryBuffer(4)
+        for i in range(6):
+            buffer.append(float(i), i + 0.5)
+
+        assert len(buffer) == 4
+        assert list(buffer.timestamps()) == [2.0, 3.0, 4.0, 5.0]
+        assert list(buffer.values()) == [2.5, 3.5, 4.5, 5.5]
+        assert buffer.values().typecode == "f"
+        assert buffer.last_timestamp == 5.0
+
+    def test_extend_skips_known_samples(self):
+        """Overlapping batches only add samples newer than the buffer."""
+        buffer = HistoryBuffer(100)
+        assert buffer.extend_downsampled([(1.0, 1.0), (2.0, 2.0)], window=1) == 2
+        assert buffer.extend_downsampled([(2.0, 2.0), (3.0, 3.0)], window=1) == 1
+        assert list(buffer.timestamps()) == [1.0, 2.0, 3.0]
+
+    def test_real_client_batches_entities(self):
+        """Many entities' history comes back from one /api/history/period request."""
+        now = datetime.now(timezone.utc)
+        with FakeHASSServer() as server:
+            for minutes, temperature in ((30, 20.5), (20, "unavailable"), (10, 21.0)):
+                when = now - timedelta(minutes=minutes)
+                server.add_history("sensor.a", when, str(temperature))
+                server.add_history("sensor.b", when, "50")
+                server.add_history("climate.c", when, "heat", {"current_temperature": temperature})
+            server.add_history("sensor.a", now - timedelta(days=2), "1")
+
+            with RealHASSClient(server.url, "token") as client:
+                history = client.get_history(
+                    ["sensor.a", "sensor.b", "sensor.missing"], now - timedelta(hours=1)
+                )
+                assert server.request_count == 1
+                assert set(history) == {"sensor.a", "sensor.b"}
+                assert [value for _, value in history["sensor.a"]] == [20.5, 21.0]
+                assert len(history["sensor.b"]) == 3
+
+                climate = client.get_history(
+                    ["climate.c"], now - timedelta(hours=1), attribute="current_temperature"
+                )
+                assert [value for _, value in climate["climate.c"]] == [20.5, 21.0]
@@ -0,0 +1,759 @@
+"""Tests for rendering: diffs, icons, caches, retained/layered, buffers, EPD, recorders, serving."""
+import os
+import http.client
+import io
+import random
+import sys
+import shutil
+import threading
+import time
+import types
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw, ImageOps
+
+from components.rooms_widget import RoomsWidget
+from components.sun_widget import SunWidget
+from components.weather_widget import WeatherWidget
+from dashboard import Dashboard
+from rendering.background import BackgroundTemplate, raw_cache_path
+from rendering.epd_renderer import RED, EPDRenderer
+from rendering.frame_diff import (
+    MAX_BANDS,
+    MAX_SPANS_PER_BAND,
+    diff_frames,
+    merge_update_rects,
+    partial_updates,
+)
+from rendering.frame_server import Frame, FrameServer
+from rendering.framebuffer import FrameBuffer
+from rendering.icon_atlas import DEFAULT_ICONS_DIR, IconAtlas
+from rendering.layers import LayeredPILRenderer
+from rendering.recording import NullRenderer, RecordingRenderer
+from rendering.renderer import PILRenderer
+from rendering.text_cache import TextMask, TextMaskCache
+
+WIDTH, HEIGHT = 800, 480
+
+
+def packed(draw_ops):
+    """Packed 1-bit frame of a white image with the given draw calls applied."""
+    image = Image.new("1", (WIDTH, HEIGHT), color=255)
+    draw = ImageDraw.Draw(image)
+    for op in draw_ops:
+        op(draw)
+    return image.tobytes()
+
+
+def assert_covers(previous, current, rects):
+    """Every differing pixel lies inside one of the rects."""
+    diff = ImageChops.logical_xor(
+        Image.frombytes("1", (WIDTH, HEIGHT), previous),
+        Image.frombytes("1", (WIDTH, HEIGHT), current),
+    )
+    for rect in rects:
+        diff.paste(0, rect)
+    assert diff.getbbox() is None
+
+
+class TestFrameDiff:
+    """Tests for diffing packed 1-bit frames into partial update rectangles."""
+
+    def test_identical_frames(self):
+        """Identical frames need no update."""
+        frame = packed([])
+        assert diff_frames(frame, frame, WIDTH, HEIGHT) == []
+
+    def test_rects_cover_changes_and_are_byte_aligned(self):
+        """Random scribbles are fully covered by 8-pixel-aligned rectangles."""
+        rng = random.Random(7)
+        for _ in range(20):
+            boxes = []
+            for _ in range(rng.randint(1, 6)):
+                x, y = rng.randrange(WIDTH - 40), rng.randrange(HEIGHT - 20)
+                boxes.append((x, y, x + rng.randint(1, 40), y + rng.randint(1, 20)))
+            previous = packed([])
+            current = packed([lambda draw, box=box: draw.rectangle(box, fill=0) for box in boxes])
+
+            rects = diff_frames(previous, current, WIDTH, HEIGHT, rect_overhead=0)
+
+            assert_covers(previous, current, rects)
+            for left, top, right, bottom in rects:
+                assert left % 8 == 0 and right % 8 == 0
+                assert 0 <= left < right <= WIDTH and 0 <= top < bottom <= HEIGHT
+
+    def test_distant_changes_stay_separate_unless_capped(self):
+        """Far-apart changes get a rectangle each; max_rects forces a merge."""
+        previous = packed([])
+        current = packed(
+            [
+                lambda draw: draw.rectangle((10, 10, 40, 30), fill=0),
+                lambda draw: draw.rectangle((700, 400, 760, 440), fill=0),
+            ]
+        )
+
+        assert diff_frames(previous, current, WIDTH, HEIGHT) == [
+            (8, 10, 48, 31),
+            (696, 400, 768, 441),
+        ]
+        assert diff_frames(previous, current, WIDTH, HEIGHT, max_rects=1) == [(8, 10, 768, 441)]
+
+    def test_side_by_side_changes_are_trimmed_per_column(self):
+        """Changes sharing rows but not columns get their own heights."""
+        previous = packed([])
+        current = packed(
+            [
+                lambda draw: draw.rectangle((0, 100, 15, 110), fill=0),
+                lambda draw: draw.rectangle((400, 100, 415, 300), fill=0),
+            ]
+        )
+
+        assert diff_frames(previous, current, WIDTH, HEIGHT) == [
+            (0, 100, 16, 111),
+            (400, 100, 416, 301),
+        ]
+
+    def test_merge_prefers_cheap_unions(self):
+        """Overlapping or adjacent rectangles merge; distant ones only when forced."""
+        assert merge_update_rects([(0, 0, 8, 8), (8, 0, 16, 8)]) == [(0, 0, 16, 8)]
+        assert len(merge_update_rects([(0, 0, 8, 8), (792, 472, 800, 480)], 0)) == 2
+
+    def test_many_separated_changes(self):
+        """Hundreds of far-apart changes are covered and merged without comparing all pairs."""
+        boxes = [
+            (x, y, x + 9, y + 2) for x in range(0, WIDTH - 16, 32) for y in range(4, HEIGHT, 30)
+        ]
+        previous = packed([])
+        current = packed([lambda draw, box=box: draw.rectangle(box, fill=0) for box in boxes])
+
+        started = time.perf_counter()
+        rects = diff_frames(previous, current, WIDTH, HEIGHT)
+        assert time.perf_counter() - started < 1.0
+
+        assert len(boxes) == 400
+        assert_covers(previous, current, rects)
+        assert len(diff_frames(previous, current, WIDTH, HEIGHT, max_rects=3)) <= 3
+        # Without a merge incentive the candidates are still capped.
+        scattered = diff_frames(previous, current, WIDTH, HEIGHT, rect_overhead=0)
+        assert_covers(previous, current, scattered)
+        assert len(scattered) == MAX_BANDS * MAX_SPANS_PER_BAND
+
+    def test_every_other_row_is_bounded(self):
+        """A sparse change on every other row is coarsened instead of diffed span by span."""
+        stride = WIDTH // 8
+        previous = bytes(stride * HEIGHT)
+        changed = bytearray(previous)
+        for y in range(0, HEIGHT, 2):
+            changed[y * stride:(y + 1) * stride:4] = b"\xff" * (stride // 4)
+        current = bytes(changed)
+
+        started = time.perf_counter()
+        rects = diff_frames(previous, current, WIDTH, HEIGHT, rect_overhead=0)
+        assert time.perf_counter() - started < 0.05
+
+        assert_covers(previous, current, rects)
+        assert len(rects) <= MAX_BANDS * MAX_SPANS_PER_BAND
+        assert diff_frames(previous, current, WIDTH, HEIGHT) == [(0, 0, 776, 479)]
+
+    def test_partial_updates_feed_display_partial(self):
+        """Each update carries the rectangle's bytes cut from the current frame."""
+        previous = packed([])
+        current = packed([lambda draw: draw.rectangle((20, 50, 27, 51), fill=0)])
+
+        (update,) = partial_updates(previous, current, WIDTH, HEIGHT)
+
+        assert (update.x_start, update.y_start, update.x_end, update.y_end) == (16, 50, 32, 52)
+        assert update.data == bytes([0xF0, 0x0F, 0xF0, 0x0F])
+
+    def test_rejects_wrong_frame_size(self):
+        """Frames must match the given dimensions."""
+        with pytest.raises(ValueError):
+            diff_frames(bytes(10), bytes(10), WIDTH, HEIGHT)
+
+
+class TestIconAtlas:
+    """Tests for the preloaded, pre-inverted icon atlas."""
+
+    def test_draw_icon_matches_direct_bmp_blit(self, pil_renderer):
+        """Atlas icons draw pixel-identically to inverting the BMP per call."""
+        icon_path = DEFAULT_ICONS_DIR / "weather-rainy-50x50.bmp"
+        expected = PILRenderer(size=(WIDTH, HEIGHT)).get_image()
+        with Image.open(icon_path) as icon_im:
+            ImageDraw.Draw(expected).bitmap((57, 33), ImageOps.invert(icon_im))
+
+        pil_renderer.draw_icon((57, 33), "weather-rainy", 50)
+
+        assert pil_renderer.get_image().tobytes() == expected.tobytes()
+
+    def test_icons_are_read_from_disk_once(self, pil_renderer):
+        """Repeated draws of an icon/size pair reuse the decoded bitmap."""
+        for _ in range(5):
+            pil_renderer.draw_icon((0, 0), "weather-cloudy", 50)
+            pil_renderer.draw_icon((0, 100), "weather-cloudy", 100)
+
+        assert pil_renderer.icons.disk_loads == 2
+        with pytest.raises(FileNotFoundError):
+            pil_renderer.draw_icon((0, 0), "weather-missing", 50)
+
+    def test_packed_atlas_round_trip(self, tmp_path):
+        """A saved atlas loads every icon without touching the BMP files."""
+        atlas = IconAtlas()
+        count = atlas.preload()
+        assert count == len(list(DEFAULT_ICONS_DIR.glob("*.bmp")))
+        path = str(tmp_path / "icons.atlas")
+        atlas.save(path)
+
+        renderer = PILRenderer(size=(WIDTH, HEIGHT), icon_atlas_path=path)
+        renderer.draw_icon((10, 10), "weather-sunny", 100)
+
+        assert len(renderer.icons) == count
+        assert renderer.icons.disk_loads == 0
+        for key in [("weather-sunny", 100), ("weather-fog", 50)]:
+            assert renderer.icons.get(*key).tobytes() == atlas.get(*key).tobytes()
+
+    def test_empty_atlas_is_used(self, tmp_path):
+        """An atlas passed in is kept even while it holds no icons yet."""
+        shutil.copy(DEFAULT_ICONS_DIR / "weather-sunny-100x100.bmp", tmp_path)
+        atlas = IconAtlas(str(tmp_path))
+        assert len(atlas) == 0
+
+        renderer = PILRenderer(size=(WIDTH, HEIGHT), icon_atlas=atlas)
+        renderer.draw_icon((10, 10), "weather-sunny", 100)
+
+        assert renderer.icons is atlas
+        assert atlas.disk_loads == 1
+
+    def test_invalid_atlas_file(self, tmp_path):
+        """A file that is not an atlas is rejected; the renderer falls back to BMPs."""
+        path = tmp_path / "icons.atlas"
+        path.write_bytes(b"not an atlas")
+
+        with pytest.raises(ValueError):
+            IconAtlas.load(str(path))
+        renderer = PILRenderer(size=(WIDTH, HEIGHT), icon_atlas_path=str(path))
+        renderer.draw_icon((10, 10), "weather-sunny", 100)
+        assert renderer.icons.disk_loads == 1
+
+
+class TestTextMaskCache:
+    """Tests for the rasterized text cache behind PILRenderer.draw_text."""
+
+    STRINGS = [("21.5°C", "normal"), ("N/A", "normal"), ("12°C", "big"), ("07:45", "small")]
+
+    def test_cached_text_is_pixel_identical(self):
+        """Pasting cached masks gives the same frame as drawing text directly."""
+        direct = PILRenderer(size=(WIDTH, HEIGHT), text_cache_bytes=0)
+        cached = PILRenderer(size=(WIDTH, HEIGHT))
+
+        for frame in range(2):
+            for renderer in (direct, cached):
+                renderer.clear()
+                for index, (text, style) in enumerate(self.STRINGS):
+                    renderer.draw_text((13 + index * 150, 40 + frame), text, style=style)
+                renderer.draw_text((5, 300), "two\nlines")
+
+            assert cached.get_image().tobytes() == direct.get_image().tobytes()
+            assert cached.dirty_rects() == direct.dirty_rects()
+
+        stats = cached.text_cache.stats
+        assert (stats.hits, stats.misses) == (4, 4)
+        assert stats.hit_rate == 0.5
+
+    def test_lru_eviction_respects_memory_cap(self):
+        """Least recently used masks are evicted to stay under max_bytes."""
+        cache = TextMaskCache(max_bytes=300)
+        masks = {key: TextMask(Image.new("1", (10, 10)), 0, 0) for key in "abcd"}
+
+        cache.put("a", masks["a"])
+        cache.put("b", masks["b"])
+        cache.put("c", masks["c"])
+        assert cache.get("a") is masks["a"]
+        cache.put("d", masks["d"])
+
+        assert cache.get("b") is None
+        assert cache.get("a") is masks["a"]
+        assert len(cache) == 3 and cache.nbytes == 300
+        assert cache.stats.evictions == 1
+
+        cache.put("huge", TextMask(Image.new("1", (20, 20)), 0, 0))
+        assert cache.get("huge") is None
+        assert len(cache) == 3
+
+
+class TestRetainedRendering:
+    """Tests for the retained-mode display lists of PILRenderer."""
+
+    def build(self, hass, renderer):
+        dashboard = Dashboard(renderer)
+        dashboard.add_widget(WeatherWidget(hass, renderer, cache_ttl=0))
+        dashboard.add_widget(SunWidget(hass, renderer, cache_ttl=0))
+        dashboard.add_widget(RoomsWidget(hass, renderer, cache_ttl=0))
+        return dashboard
+
+    def test_frames_match_immediate_rendering(self, mock_hass, tmp_path):
+        """Each retained frame is pixel-identical to drawing every widget."""
+        immediate = PILRenderer(size=(WIDTH, HEIGHT), output_path=str(tmp_path / "a.bmp"))
+        retained = PILRenderer(
+            size=(WIDTH, HEIGHT), output_path=str(tmp_path / "b.bmp"), retained=True
+        )
+        dashboards = [self.build(mock_hass, immediate), self.build(mock_hass, retained)]
+
+        for temperature in (12.5, 12.5, 3.0, -4.5):
+            mock_hass.set_entity("weather.home", "rainy", {"temperature": temperature})
+            for dashboard in dashboards:
+                dashboard.update_all()
+                dashboard.render()
+            assert retained.get_image().tobytes() == immediate.get_image().tobytes()
+
+        stats = retained.retained_stats
+        assert stats.frames == 4
+        assert stats.full_redraws == 1
+        # The first frame draws all three widgets; later frames redraw only
+        # the weather widget, and only when its temperature changed.
+        assert stats.groups_redrawn == 3 + 0 + 1 + 1
+        assert stats.groups_reused == 0 + 3 + 2 + 2
+
+    def test_unchanged_frame_redraws_nothing(self, mock_hass, tmp_path):
+        """Only the changed widget's area is re-rasterized."""
+        renderer = PILRenderer(
+            size=(WIDTH, HEIGHT), output_path=str(tmp_path / "b.bmp"), retained=True
+        )
+        dashboard = self.build(mock_hass, renderer)
+        dashboard.update_all()
+        dashboard.render()
+        assert renderer.retained_stats.last_redrawn_pixels == WIDTH * HEIGHT
+
+        dashboard.render()
+        assert renderer.retained_stats.last_redrawn_pixels == 0
+
+        mock_hass.set_entity(
+            "sun.sun",
+            "below_horizon",
+            {
+                "next_rising": "2025-11-02T06:11:00+00:00",
+                "next_setting": "2025-11-02T16:01:00+00:00",
+            },
+        )
+        dashboard.update_all()
+        dashboard.render()
+        assert 0 < renderer.retained_stats.last_redrawn_pixels < WIDTH * HEIGHT // 10
+
+
+class TestLayeredRendering:
+    """Tests for per-widget layers composited over the background."""
+
+    def test_layers_match_immediate_rendering(self, mock_hass, tmp_path):
+        """Composited layers give the same frames as drawing every widget."""
+        immediate = PILRenderer(size=(WIDTH, HEIGHT), output_path=str(tmp_path / "a.bmp"))
+        layered = LayeredPILRenderer(
+            size=(WIDTH, HEIGHT), output_path=str(tmp_path / "b.bmp"), layer_workers=3
+        )
+        build = TestRetainedRendering().build
+        dashboards = [build(mock_hass, immediate), build(mock_hass, layered)]
+
+        for temperature in (12.5, 12.5, 3.0):
+            mock_hass.set_entity("weather.home", "rainy", {"temperature": temperature})
+            for dashboard in dashboards:
+                dashboard.update_all()
+                dashboard.render()
+            assert layered.get_image().tobytes() == immediate.get_image().tobytes()
+
+        layered.close()
+        assert set(layered.layers) == {"0:WeatherWidget", "1:SunWidget", "2:RoomsWidget"}
+        assert layered.retained_stats.groups_redrawn == 3 + 0 + 1
+
+    def test_overlapping_layers_keep_drawing_order(self):
+        """A later widget's pixels win where layers overlap, and removed layers disappear."""
+        immediate = PILRenderer(size=(WIDTH, HEIGHT))
+        layered = LayeredPILRenderer(size=(WIDTH, HEIGHT))
+
+        def frame(renderer, with_second):
+            renderer.clear()
+            renderer.begin_widget("first")
+            renderer.draw_icon((100, 100), "weather-cloudy", 100)
+            if with_second:
+                renderer.begin_widget("second")
+                renderer.draw_text((120, 130), "OVERLAP", style="big", fill=255)
+
+        for with_second in (True, False, True):
+            frame(immediate, with_second)
+            frame(layered, with_second)
+            assert layered.get_image().tobytes() == immediate.get_image().tobytes()
+
+        first = layered.layers["first"]
+        assert first.bbox == (100, 100, 200, 200)
+        assert first.mask.getbbox() is not None
+
+
+class TestFrameBuffer:
+    """Tests for FrameBuffer."""
+
+    @staticmethod
+    def legacy_planes(black, red):
+        """Bytes EPD.display sent for EPD.getbuffer output (inverted, then inverted back)."""
+        imageblack = bytearray(black.convert("1").tobytes("raw"))
+        imagered = bytearray(red.convert("1").tobytes("raw"))
+        for i in range(len(imageblack)):
+            imageblack[i] ^= 0xFF
+            imagered[i] ^= 0xFF
+        for i in range(len(imageblack)):
+            imageblack[i] ^= 0xFF
+        return bytes(imageblack), bytes(imagered)
+
+    def test_planes_match_legacy_buffers(self):
+        """Black and red planes are byte-identical to what getbuffer + display sent."""
+        black = Image.new("L", (WIDTH, HEIGHT), color=255)
+        ImageDraw.Draw(black).text((10, 10), "21.5°C", fill=0)
+        ImageDraw.Draw(black).rectangle((100, 100, 333, 201), fill=0)
+        red = Image.new("1", (WIDTH, HEIGHT), color=255)
+        ImageDraw.Draw(red).ellipse((400, 50, 480, 130), fill=0)
+
+        frame = FrameBuffer(WIDTH, HEIGHT)
+        planes = (bytes(frame.pack_black(black)), bytes(frame.pack_red(red)))
+        assert planes == self.legacy_planes(black, red)
+
+        blank = Image.new("1", (WIDTH, HEIGHT), color=255)
+        assert bytes(frame.clear_red()) == self.legacy_planes(blank, blank)[1]
+
+    def test_blank_red_is_shared_and_portrait_is_rotated(self):
+        """Frames without red share one blank plane; portrait images are rotated like getbuffer."""
+        frame = FrameBuffer(WIDTH, HEIGHT)
+        blank = frame.clear_red()
+
+        portrait = Image.new("1", (HEIGHT, WIDTH), color=255)
+        ImageDraw.Draw(portrait).rectangle((0, 0, 47, 9), fill=0)
+        assert frame.pack_black(portrait) is frame.black
+        assert frame.pack_red(portrait) is frame.red != blank
+        assert frame.clear_red() is blank
+        rotated = portrait.rotate(90, expand=True)
+        assert frame.to_image().tobytes() == rotated.tobytes()
+
+        with pytest.raises(ValueError):
+            frame.pack_black(Image.new("1", (10, 10)))
+
+
+class FakeEPDConfig:
+    """Stand-in for epdconfig.RaspberryPi recording what goes over SPI."""
+
+    RST_PIN = 17
+    DC_PIN = 25
+    CS_PIN = 8
+    BUSY_PIN = 24
+
+    def __init__(self):
+        self.dc = 0
+        # (dc level, bytes) per SPI write: dc 0 = command, 1 = data
+        self.writes = []
+        self.inits = 0
+        self.exits = 0
+
+    def digital_write(self, pin, value):
+        if pin == self.DC_PIN:
+            self.dc = value
+
+    def digital_read(self, pin):
+        return 1  # never busy
+
+    def delay_ms(self, delaytime):
+        pass
+
+    def spi_writebyte(self, data):
+        self.writes.append((self.dc, bytes(data)))
+
+    def spi_writebyte2(self, data):
+        self.writes.append((self.dc, bytes(data)))
+
+    def module_init(self, cleanup=False):
+        self.inits += 1
+        return 0
+
+    def module_exit(self, cleanup=False):
+        self.exits += 1
+
+    def sent(self, command):
+        """Data written after the last occurrence of a command."""
+        starts = [i for i, write in enumerate(self.writes) if write == (0, bytes([command]))]
+        data = b""
+        for dc, chunk in self.writes[starts[-1] + 1:]:
+            if dc == 0:
+                break
+            data += chunk
+        return data
+
+
+@pytest.fixture
+def fake_epd(monkeypatch):
+    """The real epd7in5b_V2 driver on top of FakeEPDConfig."""
+    config = FakeEPDConfig()
+    module = types.ModuleType("epdconfig")
+    module.RaspberryPi = lambda: config
+    monkeypatch.setitem(sys.modules, "epdconfig", module)
+    monkeypatch.delitem(sys.modules, "epd7in5b_V2", raising=False)
+    import epd7in5b_V2
+
+    return epd7in5b_V2.EPD(), config
+
+
+class TestEPDRenderer:
+    """Tests for EPDRenderer against a fake epdconfig."""
+
+    def test_render_sends_black_and_red_planes(self, fake_epd):
+        """The panel gets the PIL frame as the black plane and RED text on the red plane."""
+        epd, config = fake_epd
+        renderer = EPDRenderer(size=(WIDTH, HEIGHT), epd=epd)
+        blank_red = renderer.frame.red
+
+        renderer.clear()
+        renderer.draw_text((10, 10), "21.5°C", style="big", fill=0)
+        renderer.draw_text((10, 300), "ALERT", style="big", fill=RED)
+        renderer.render()
+
+        assert config.inits == 1
+        black_only = PILRenderer(size=(WIDTH, HEIGHT))
+        black_only.draw_text((10, 10), "21.5°C", style="big", fill=0)
+        red_only = PILRenderer(size=(WIDTH, HEIGHT), background_path="missing.bmp")
+        red_only.draw_text((10, 300), "ALERT", style="big", fill=0)
+        assert config.sent(0x10) == black_only.get_image().tobytes()
+        assert config.sent(0x13) == bytes(b ^ 0xFF for b in red_only.get_image().tobytes())
+
+        # Next frame without red: the shared blank red plane, no re-init
+        renderer.clear()
+        renderer.draw_text((10, 10), "22.0°C", style="big", fill=0)
+        renderer.render()
+        assert config.inits == 1
+        assert config.sent(0x13) == bytes(len(blank_red))
+        assert renderer.frame.red is blank_red
+
+    def test_dashboard_frame_and_sleep(self, mock_hass, fake_epd):
+        """A dashboard renders through the panel; sleep powers it down until the next render."""
+        epd, config = fake_epd
+        renderer = EPDRenderer(size=(WIDTH, HEIGHT), epd=epd)
+        dashboard = Dashboard(renderer)
+        dashboard.add_widget(WeatherWidget(mock_hass, renderer))
+        dashboard.update_all()
+        dashboard.render()
+
+        assert config.sent(0x10) == renderer.get_image().tobytes()
+        renderer.sleep()
+        assert config.exits == 1
+        renderer.render()
+        assert config.inits == 2
+
+
+class TestBackgroundTemplate:
+    """Tests for BackgroundTemplate and clearing to it."""
+
+    def test_raw_cache_is_mapped_and_refreshed(self, tmp_path):
+        """The raw cache is written once, mapped later and rebuilt when the BMP is newer."""
+        bmp = tmp_path / "background.bmp"
+        source = Image.new("1", (WIDTH, HEIGHT), color=255)
+        ImageDraw.Draw(source).rectangle((0, 0, 99, 49), fill=0)
+        source.save(bmp)
+
+        built = BackgroundTemplate.load(bmp, (WIDTH, HEIGHT), cache=True)
+        assert raw_cache_path(bmp).exists()
+        mapped = BackgroundTemplate.load(bmp, (WIDTH, HEIGHT), cache=True)
+        assert isinstance(mapped.data, memoryview)
+        assert bytes(mapped.data) == built.data == source.tobytes()
+        assert mapped.to_image().tobytes() == source.tobytes()
+
+        ImageDraw.Draw(source).rectangle((200, 200, 299, 249), fill=0)
+        source.save(bmp)
+        stamp = raw_cache_path(bmp).stat().st_mtime + 10
+        os.utime(bmp, (stamp, stamp))
+        assert bytes(BackgroundTemplate.load(bmp, (WIDTH, HEIGHT), cache=True).data) == (
+            source.tobytes()
+        )
+
+        raw_cache_path(bmp).write_bytes(b"garbage")
+        os.utime(bmp, (stamp - 20, stamp - 20))
+        assert bytes(BackgroundTemplate.load(bmp, (WIDTH, HEIGHT), cache=True).data) == (
+            source.tobytes()
+        )
+
+    def test_rewrite_keeps_mapped_copies_readable(self, tmp_path):
+        """Saving replaces the cache file, so an open mapping keeps its old data until closed."""
+        path = tmp_path / "background.1bpp"
+        white = Image.new("1", (WIDTH, HEIGHT), color=255)
+        BackgroundTemplate.from_image(white, (WIDTH, HEIGHT)).save(path)
+
+        with BackgroundTemplate.map(path) as mapped:
+            BackgroundTemplate.from_image(Image.new("1", (WIDTH, HEIGHT)), (WIDTH, HEIGHT)).save(
+                path
+            )
+            assert bytes(mapped.data) == white.tobytes()
+        with pytest.raises(ValueError):
+            bytes(mapped.data)
+        assert list(tmp_path.iterdir()) == [path]
+        with BackgroundTemplate.map(path) as remapped:
+            assert bytes(remapped.data) == bytes(len(white.tobytes()))
+
+    def test_clear_resets_the_same_image(self):
+        """clear() restores the background into the working image instead of replacing it."""
+        renderer = PILRenderer(size=(WIDTH, HEIGHT))
+        image = renderer.get_image()
+        background = image.tobytes()
+        renderer.draw_text((10, 10), "21.5°C", style="big")
+        assert image.tobytes() != background
+
+        renderer.clear()
+        assert renderer.get_image() is image
+        assert image.tobytes() == background == renderer.background.data
+
+
+class TestRecordingRenderer:
+    """Tests for NullRenderer and RecordingRenderer."""
+
+    def test_null_renderer_runs_the_dashboard(self, mock_hass):
+        """Widgets render against NullRenderer without drawing anything."""
+        renderer = NullRenderer()
+        dashboard = Dashboard(renderer)
+        dashboard.add_widget(WeatherWidget(mock_hass, renderer))
+        dashboard.add_widget(RoomsWidget(mock_hass, renderer))
+        dashboard.update_all()
+        dashboard.render()
+        assert renderer.get_size() == (WIDTH, HEIGHT)
+
+    def test_records_calls_per_widget_and_forwards_them(self, mock_hass, tmp_path):
+        """Every call is logged under its widget and the wrapped renderer draws the frame."""
+        pil = PILRenderer(size=(WIDTH, HEIGHT), output_path=str(tmp_path / "out.bmp"))
+        recorder = RecordingRenderer(pil)
+        direct = PILRenderer(size=(WIDTH, HEIGHT), output_path=str(tmp_path / "direct.bmp"))
+        for renderer in (recorder, direct):
+            dashboard = Dashboard(renderer)
+            dashboard.add_widget(WeatherWidget(mock_hass, renderer))
+            dashboard.add_widget(SunWidget(mock_hass, renderer))
+            dashboard.update_all()
+            dashboard.render()
+
+        assert pil.get_image().tobytes() == direct.get_image().tobytes()
+        assert recorder.frame == 1
+        assert set(recorder.calls_by_widget()) == {"0:WeatherWidget", "1:SunWidget"}
+        texts = [call.arg for call in recorder.calls if call.kind == "text"]
+        assert any(text.endswith("°C") for text in texts)
+        icons = [call for call in recorder.calls if call.kind == "icon"]
+        assert icons and icons[0].widget == "0:WeatherWidget"
+        assert all(call.duration >= 0 for call in recorder.calls)
+        assert sum(recorder.time_by_widget().values()) == pytest.approx(
+            sum(call.duration for call in recorder.calls)
+        )
+
+        recorder.reset()
+        assert recorder.calls == []
+
+
+def get(server, path, etag=None):
+    """GET a path from a FrameServer; returns (status, headers, body)."""
+    host, port = server.url.split("//")[1].split(":")
+    connection = http.client.HTTPConnection(host, int(port), timeout=10)
+    headers = {"If-None-Match": etag} if etag else {}
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    result = response.status, dict(response.getheaders()), response.read()
+    connection.close()
+    return result
+
+
+class TestFrameServer:
+    """Tests for FrameServer."""
+
+    def test_serves_dashboard_frames_with_etags(self, mock_hass, tmp_path, monkeypatch):
+        """Rendered frames are served in every format, encoded once, with 304 for known ETags."""
+        encodes = []
+        original_encode = Frame.encode
+
+        def counting_encode(frame, fmt):
+            if fmt not in frame.encodings:
+                encodes.append(fmt)
+            return original_encode(frame, fmt)
+
+        monkeypatch.setattr(Frame, "encode", counting_encode)
+        renderer = PILRenderer(size=(WIDTH, HEIGHT), output_path=str(tmp_path / "out.bmp"))
+        with FrameServer() as server:
+            assert get(server, "/frame.png")[0] == 503
+
+            dashboard = Dashboard(renderer, frame_server=server)
+            dashboard.add_widget(WeatherWidget(mock_hass, renderer, cache_ttl=0))
+            dashboard.update_all()
+            dashboard.render()
+
+            status, headers, body = get(server, "/frame.raw")
+            assert status == 200
+            assert body == renderer.get_image().tobytes()
+            assert (headers["X-Frame-Width"], headers["X-Frame-Height"]) == ("800", "480")
+
+            status, headers, body = get(server, "/frame.png")
+            assert status == 200 and headers["Content-Type"] == "image/png"
+            assert Image.open(io.BytesIO(body)).tobytes() == renderer.get_image().tobytes()
+            etag = headers["ETag"]
+            for _ in range(3):
+                assert get(server, "/frame.png")[2] == body
+                assert get(server, "/frame.png", etag)[0] == 304
+            assert get(server, "/frame.bmp")[0] == 200
+            assert get(server, "/frame.gif")[0] == 404
+            assert encodes == ["png", "bmp"]
+            assert server.not_modified_count == 3
+
+            # Same pixels: not republished, the ETag still holds
+            dashboard.render()
+            assert server.current.sequence == 1
+            assert get(server, "/frame.png", etag)[0] == 304
+
+            mock_hass.set_entity("weather.home", "rainy", {"temperature": -3})
+            dashboard.update_all()
+            dashboard.render()
+            status, headers, _ = get(server, "/frame.png", etag)
+            assert status == 200 and headers["ETag"] != etag
+            assert headers["X-Frame-Sequence"] == "2"
+
+    def test_long_poll_waits_for_the_next_frame(self):
+        """A conditional request with wait returns when a new frame is published."""
+        first = Image.new("1", (64, 32), color=255)
+        second = first.copy()
+        ImageDraw.Draw(second).rectangle((0, 0, 7, 7), fill=0)
+
+        with FrameServer() as server:
+            server.publish(first)
+            etag = get(server, "/frame.raw")[1]["ETag"]
+            assert get(server, "/frame.raw?wait=0.1", etag)[0] == 304
+            assert get(server, "/frame.raw?wait=soon", etag)[0] == 400
+
+            results = []
+            poller = threading.Thread(
+                target=lambda: results.append(get(server, "/frame.raw?wait=10", etag))
+            )
+            poller.start()
+            poller.join(0.2)
+            assert poller.is_alive()
+
+            assert server.publish(second)
+            poller.join(5)
+            status, headers, body = results[0]
+            assert status == 200
+            assert body == second.tobytes()
+            assert headers["X-Frame-Sequence"] == "2"
+
+    def test_renderers_without_an_image(self, mock_hass, tmp_path):
+        """NullRenderer publishes nothing; RecordingRenderer publishes its wrapped frame."""
+        with FrameServer() as server:
+            renderer = NullRenderer()
+            dashboard = Dashboard(renderer, frame_server=server)
+            dashboard.add_widget(WeatherWidget(mock_hass, renderer))
+            dashboard.run()
+            assert server.current is None
+
+            pil = PILRenderer(size=(WIDTH, HEIGHT), output_path=str(tmp_path / "out.bmp"))
+            recorder = RecordingRenderer(pil)
+            dashboard = Dashboard(recorder, frame_server=server)
+            dashboard.add_widget(WeatherWidget(mock_hass, recorder))
+            dashboard.run()
+            assert server.current.packed == pil.get_image().tobytes()
+
+    def test_stop_without_start(self):
+        """A server that never started stops at once and frees its port."""
+        server = FrameServer()
+        stopper = threading.Thread(target=server.stop)
+        stopper.start()
+        stopper.join(2)
+        assert not stopper.is_alive()
+        assert server._httpd.socket.fileno() == -1
@@ -1,54 +1,23 @@
 """Tests for dashboard widgets."""
+import json
+import threading
+import time
+from datetime import datetime
+
 import pytest
 from pathlib import Path
 from unittest.mock import patch
 
-from core.hass_mock import MockHASSClient
-from rendering.renderer import PILRenderer
+from PIL import ImageChops
+
 from components.weather_widget import WeatherWidget
 from components.weather_forecast_widget import WeatherForecastWidget
 from components.sun_widget import SunWidget
 from components.rooms_widget import RoomsWidget
+from core.hass_mock import MockHASSClient
+from core.snapshot import SNAPSHOT_VERSION
 from dashboard import Dashboard
-
-
-@pytest.fixture
-def mock_hass():
-    """Fixture: Mock HASS client with test data."""
-    client = MockHASSClient()
-
-    room_entities = {
-        "climate.0x5cc7c1fffede1ef5_5": ("heat", {"current_temperature": 23.5}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_5": ("55", {}),
-        "climate.0x5cc7c1fffede1ef5_1": ("heat", {"current_temperature": 21.8}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_1": ("42", {}),
-        "climate.0x5cc7c1fffede1ef5_2": ("heat", {"current_temperature": 22.1}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_2": ("44", {}),
-        "climate.0x5cc7c1fffede1ef5_6": ("heat", {"current_temperature": 24.0}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_6": ("38", {}),
-        "climate.0x5cc7c1fffede1ef5_7": ("heat", {"current_temperature": 23.0}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_8": ("50", {}),
-        "climate.0x5cc7c1fffede1ef5_4": ("heat", {"current_temperature": 21.0}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_4": ("41", {}),
-        "climate.0x5cc7c1fffede1ef5_8": ("heat", {"current_temperature": 20.5}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_9": ("43", {}),
-        "climate.0x5cc7c1fffede1ef5_3": ("heat", {"current_temperature": 21.2}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_3": ("40", {}),
-        "climate.0x5cc7c1fffede1ef5_9": ("heat", {"current_temperature": 19.8}),
-        "sensor.0x5cc7c1fffede1ef5_humidity_10": ("52", {}),
-        "climate.0x5cc7c1fffede1ef5_10": ("heat", {"current_temperature": 18.0}),
-    }
-
-    for entity_id, (state, attributes) in room_entities.items():
-        client.set_entity(entity_id, state, attributes)
-
-    return client
-
-
-@pytest.fixture
-def pil_renderer():
-    """Fixture: PIL renderer for testing."""
-    return PILRenderer(size=(800, 480), output_path="test_output.bmp")
+from rendering.renderer import PILRenderer
 
 
 class TestWeatherWidget:
@@ -282,6 +251,276 @@ class TestDashboard:
         # Should complete without errors
         assert len(dashboard.widgets) == 4
 
+    @pytest.mark.parametrize("max_workers", [None, 4])
+    def test_dashboard_cycle_request_count(self, mock_hass, pil_renderer, max_workers):
+        """A whole cycle fetches every widget's entities in one request, plus the forecast."""
+        mock_hass.set_forecast([{"datetime": "2025-11-01T10:00:00+00:00", "temperature": 9.0}])
+        dashboard = Dashboard(pil_renderer, max_workers=max_workers)
+        dashboard.add_widget(WeatherWidget(mock_hass, pil_renderer))
+        dashboard.add_widget(WeatherForecastWidget(mock_hass, pil_renderer, device_id="test-device"))
+        dashboard.add_widget(SunWidget(mock_hass, pil_renderer))
+        dashboard.add_widget(RoomsWidget(mock_hass, pil_renderer))
+
+        with patch.object(mock_hass, "get_entities", wraps=mock_hass.get_entities) as bulk:
+            dashboard.run()
+        assert mock_hass.request_count == 2
+        assert bulk.call_count == 1
+        assert set(bulk.call_args.args[0]) == set(dashboard.entity_ids())
+        assert not any(widget.stale for widget in dashboard.widgets)
+
+        # Cached widgets do not hit HASS again within their TTL.
+        dashboard.run()
+        dashboard.close()
+        assert mock_hass.request_count == 2
+
+
+class TestDashboardSnapshot:
+    """Tests for the persisted last-known-state snapshot."""
+
+    def build_dashboard(self, hass, renderer, snapshot_path):
+        dashboard = Dashboard(renderer, snapshot_path=snapshot_path)
+        dashboard.add_widget(WeatherWidget(hass, renderer))
+        dashboard.add_widget(WeatherForecastWidget(hass, renderer, device_id="test-device"))
+        dashboard.add_widget(SunWidget(hass, renderer))
+        dashboard.add_widget(RoomsWidget(hass, renderer))
+        return dashboard
+
+    @pytest.fixture
+    def saved(self, mock_hass, pil_renderer, tmp_path):
+        """A dashboard that completed one cycle and wrote its snapshot."""
+        mock_hass.set_forecast(
+            [
+                {"datetime": f"2025-11-01T{hour:02d}:00:00+00:00", "condition": "rainy",
+                 "temperature": 10.0 + hour}
+                for hour in range(10, 20)
+            ]
+        )
+        path = str(tmp_path / "snapshot.json")
+        dashboard = self.build_dashboard(mock_hass, pil_renderer, path)
+        dashboard.run()
+        return dashboard, path
+
+    def test_warm_start_restores_all_widgets(self, saved, pil_renderer):
+        """A new dashboard renders the snapshot before fetching anything."""
+        original, path = saved
+        offline = MockHASSClient()
+        dashboard = self.build_dashboard(offline, pil_renderer, path)
+
+        with patch.object(pil_renderer, "draw_text", wraps=pil_renderer.draw_text) as draw_text:
+            assert dashboard.warm_start() is True
+
+        assert offline.request_count == 0
+        assert all(widget.stale for widget in dashboard.widgets)
+        assert any("Cached" in call.args[1] for call in draw_text.call_args_list)
+
+        weather, forecast, sun, rooms = dashboard.widgets
+        assert weather.current_weather == original.widgets[0].current_weather
+        assert forecast.items == original.widgets[1].items
+        assert sun.sunrise == original.widgets[2].sunrise
+        assert rooms.get_rooms() == original.widgets[3].get_rooms()
+        assert len(rooms.get_rooms()) > 0
+
+        # The offline client has no forecast or room entities: those widgets
+        # keep the restored data and stay stale, the others show fresh data.
+        dashboard.update_all()
+        assert [widget.stale for widget in dashboard.widgets] == [False, True, False, True]
+        assert forecast.items == original.widgets[1].items
+        assert rooms.get_rooms() == original.widgets[3].get_rooms()
+
+    def test_failed_cycle_keeps_snapshot(self, saved, pil_renderer):
+        """Widgets without fresh data keep their snapshot entry and its time."""
+        original, path = saved
+        with open(path, encoding="utf-8") as f:
+            before = json.load(f)
+
+        offline = MockHASSClient()
+        offline.entities.clear()
+        dashboard = self.build_dashboard(offline, pil_renderer, path)
+        assert dashboard.warm_start() is True
+        dashboard.run()
+        assert all(widget.stale for widget in dashboard.widgets)
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == before
+
+        # Only the sun comes back; everything else is carried over.
+        offline.entities["sun.sun"] = original.widgets[2].hass_client.get_entity("sun.sun")
+        dashboard.run()
+        with open(path, encoding="utf-8") as f:
+            after = json.load(f)
+        assert after["widgets"] == before["widgets"]
+        assert after["saved_at"] > before["saved_at"]
+        assert set(after["widget_saved_at"]) == {"0:WeatherWidget", "1:WeatherForecastWidget",
+                                                 "3:RoomsWidget"}
+        assert set(after["widget_saved_at"].values()) == {before["saved_at"]}
+
+        restarted = self.build_dashboard(MockHASSClient(), pil_renderer, path)
+        assert restarted.restore_snapshot() is True
+        assert restarted.snapshot_time == datetime.fromtimestamp(before["saved_at"])
+        assert restarted.widgets[1].items == original.widgets[1].items
+
+    def test_restore_is_fast(self, saved, pil_renderer):
+        """Loading and applying the snapshot stays well under 50 ms."""
+        _, path = saved
+        dashboard = self.build_dashboard(MockHASSClient(), pil_renderer, path)
+
+        started = time.perf_counter()
+        assert dashboard.restore_snapshot() is True
+        assert time.perf_counter() - started < 0.05
+
+    def test_other_versions_are_ignored(self, saved, pil_renderer):
+        """Snapshots written in another format version are not restored."""
+        _, path = saved
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        payload["version"] = SNAPSHOT_VERSION + 1
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+        dashboard = self.build_dashboard(MockHASSClient(), pil_renderer, path)
+
+        assert dashboard.warm_start() is False
+        assert not any(widget.stale for widget in dashboard.widgets)
+
+    def test_missing_snapshot(self, mock_hass, pil_renderer, tmp_path):
+        """Without a snapshot file the dashboard simply starts cold."""
+        dashboard = self.build_dashboard(mock_hass, pil_renderer, str(tmp_path / "none.json"))
+        assert dashboard.restore_snapshot() is False
+
+
+class SlowMockHASSClient(MockHASSClient):
+    """Mock whose lookups take `delay` seconds and wait for `release`."""
+
+    def __init__(self, source, delay=0.0):
+        super().__init__()
+        self.entities = source.entities
+        self.forecast_data = source.forecast_data
+        self.delay = delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def _count_request(self):
+        super()._count_request()
+        self.release.wait(5)
+        time.sleep(self.delay)
+
+
+class TestThreadedUpdate:
+    """Tests for the thread-pool update mode."""
+
+    def build_dashboard(self, hass, renderer, **kwargs):
+        dashboard = Dashboard(renderer, **kwargs)
+        dashboard.add_widget(WeatherWidget(hass, renderer, cache_ttl=0))
+        dashboard.add_widget(WeatherForecastWidget(hass, renderer, device_id="test", cache_ttl=0))
+        dashboard.add_widget(SunWidget(hass, renderer, cache_ttl=0))
+        dashboard.add_widget(RoomsWidget(hass, renderer, cache_ttl=0))
+        return dashboard
+
+    def test_widgets_update_in_parallel(self, mock_hass, pil_renderer):
+        """A cycle takes about as long as the slowest widget, not the sum."""
+        hass = SlowMockHASSClient(mock_hass, delay=0.2)
+        dashboard = self.build_dashboard(hass, pil_renderer, max_workers=4)
+
+        started = time.perf_counter()
+        dashboard.update_all()
+        elapsed = time.perf_counter() - started
+        dashboard.close()
+
+        assert hass.request_count == 2
+        assert elapsed < 0.6
+        assert dashboard.widgets[0].get_temperature() == 22.5
+        assert len(dashboard.widgets[3].get_rooms()) > 0
+
+    def test_deadline_leaves_slow_widgets_stale(self, mock_hass, pil_renderer):
+        """Widgets missing the deadline keep their data and catch up later."""
+        mock_hass.set_forecast([{"datetime": "2025-11-01T10:00:00+00:00", "temperature": 9.0}])
+        hass = SlowMockHASSClient(mock_hass)
+        dashboard = self.build_dashboard(hass, pil_renderer, max_workers=4, cycle_deadline=0.1)
+        dashboard.update_all()
+        weather = dashboard.widgets[0]
+        assert weather.get_temperature() == 22.5
+
+        hass.release.clear()
+        mock_hass.set_entity("weather.home", "sunny", {"temperature": 25.0})
+        started = time.perf_counter()
+        dashboard.update_all()
+        assert time.perf_counter() - started < 0.5
+        assert all(widget.stale for widget in dashboard.widgets)
+        assert weather.get_temperature() == 22.5
+
+        # A still-running update is waited on again, not resubmitted.
+        requests = hass.request_count
+        dashboard.update_all()
+        assert hass.request_count == requests
+
+        hass.release.set()
+        dashboard.update_all(deadline=5)
+        dashboard.close()
+        assert not any(widget.stale for widget in dashboard.widgets)
+        assert weather.get_temperature() == 25.0
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_rooms_fan_out_on_shared_pool(self, mock_hass, pil_renderer, max_workers):
+        """Per-room fetches share the dashboard pool without deadlocking it."""
+        bulk = RoomsWidget(mock_hass, pil_renderer)
+        bulk.update()
+
+        hass = MockHASSClient()
+        hass.entities = mock_hass.entities
+        dashboard = Dashboard(pil_renderer, max_workers=max_workers, cycle_deadline=5)
+        rooms = RoomsWidget(hass, pil_renderer, fan_out=True)
+        dashboard.add_widget(rooms)
+        dashboard.update_all()
+        dashboard.close()
+
+        assert not rooms.stale
+        assert hass.request_count == len(rooms.get_rooms())
+        assert rooms.get_rooms() == bulk.get_rooms()
+
+
+class TestCycleBudget:
+    """Tests for the cycle-level time budget in Dashboard.run."""
+
+    def test_budget_implies_threaded_mode(self, pil_renderer):
+        """A serial fetch cannot be cut short, so a budget brings a worker pool."""
+        assert Dashboard(pil_renderer, cycle_budget=1.0).max_workers == 4
+        assert Dashboard(pil_renderer, cycle_budget=1.0, max_workers=2).max_workers == 2
+
+    def test_hung_widget_renders_stale_on_schedule(self, mock_hass, pil_renderer):
+        """A hung fetch is cut off and its cached data is drawn with a stale marker."""
+        mock_hass.set_forecast(
+            [{"datetime": "2025-11-01T12:00:00+00:00", "condition": "sunny", "temperature": 11}]
+        )
+        slow = SlowMockHASSClient(mock_hass)
+        dashboard = Dashboard(pil_renderer, cycle_budget=0.3, render_reserve=0.1)
+        weather = WeatherWidget(mock_hass, pil_renderer, cache_ttl=0)
+        forecast = WeatherForecastWidget(slow, pil_renderer, device_id="test", cache_ttl=0)
+        dashboard.add_widget(weather)
+        dashboard.add_widget(forecast)
+        dashboard.run()
+        assert dashboard.metrics.overrun_cycles == 0
+
+        slow.release.clear()
+        started = time.perf_counter()
+        with patch.object(pil_renderer, "draw_text", wraps=pil_renderer.draw_text) as draw_text:
+            dashboard.run()
+        elapsed = time.perf_counter() - started
+        slow.release.set()
+        dashboard.close()
+
+        assert elapsed < 0.3
+        assert forecast.stale and not weather.stale
+        assert forecast.items[0].temperature == 11
+        texts = {call.args[:2] for call in draw_text.call_args_list}
+        assert (forecast.STALE_MARKER_POSITION, "stale") in texts
+        assert any(text.startswith("Cached: ") for _, text in texts)
+
+        metrics = dashboard.metrics
+        assert metrics.cycles == 2
+        assert metrics.overrun_cycles == 1
+        assert metrics.widget_overruns == {"WeatherForecastWidget": 1}
+        assert metrics.budget_misses == 0
+        assert metrics.last_fetch_seconds == pytest.approx(0.2, abs=0.1)
+
 
 class TestRoomsWidget:
     """Tests for rooms widget."""
@@ -308,6 +547,80 @@ class TestRoomsWidget:
         assert widget.rooms[0].humidity == 55.0
         assert Path("test_output.bmp").exists()
 
+    def test_rooms_single_bulk_request(self, mock_hass, pil_renderer):
+        """All room entities are fetched with one bulk lookup."""
+        widget = RoomsWidget(mock_hass, pil_renderer)
+
+        assert len(widget.entity_ids()) == 19
+        widget.update()
+
+        assert mock_hass.request_count == 1
+        assert widget.rooms[-1].name == "Garage"
+        assert widget.rooms[-1].temperature == 18.0
+        assert widget.rooms[-1].humidity == 52.0
+
+    def test_rooms_history_refreshes_incrementally(self, mock_hass, pil_renderer):
+        """History is fetched in one request per kind, then only from the newest sample."""
+        climate_id = "climate.0x5cc7c1fffede1ef5_5"
+        humidity_id = "sensor.0x5cc7c1fffede1ef5_humidity_5"
+        now = time.time()
+        for entity_id in RoomsWidget(mock_hass, pil_renderer).entity_ids():
+            mock_hass.add_history(entity_id, now - 86000, "heat", {"current_temperature": 20})
+        for minute in range(600, 0, -1):
+            timestamp = now - minute * 60
+            mock_hass.add_history(climate_id, timestamp, "heat", {"current_temperature": 20 + minute % 7})
+            mock_hass.add_history(humidity_id, timestamp, str(40 + minute % 5))
+
+        widget = RoomsWidget(
+            mock_hass, pil_renderer, cache_ttl=0, history_hours=24, history_points=48
+        )
+        before_first = time.time()
+        widget.update()
+
+        assert len(mock_hass.history_requests) == 2
+        assert all(len(entity_ids) > 1 for entity_ids, _ in mock_hass.history_requests)
+        room = widget.rooms[0]
+        # 601 samples across the day are downsampled to the buffer's 48,
+        # keeping both ends of the window.
+        assert len(room.temperature_history) == 48
+        assert room.temperature_history.timestamps()[0] == pytest.approx(now - 86000)
+        assert room.temperature_history.values().typecode == "f"
+        first_count = len(room.humidity_history)
+        last = room.humidity_history.last_timestamp
+        assert last == pytest.approx(now - 60)
+
+        mock_hass.add_history(humidity_id, now + 1, "47")
+        widget.update()
+
+        _, since = mock_hass.history_requests[-1]
+        assert last < before_first <= since.timestamp() < now + 1
+        room = widget.rooms[0]
+        assert len(room.humidity_history) == first_count + 1
+        assert room.humidity_history.last_timestamp == pytest.approx(now + 1)
+        timestamps = list(room.humidity_history.timestamps())
+        assert timestamps == sorted(set(timestamps))
+
+    def test_rooms_history_unseen_entity_is_requested_alone(self, mock_hass, pil_renderer):
+        """An entity without history does not make the others download the full window."""
+        now = time.time()
+        widget = RoomsWidget(mock_hass, pil_renderer, cache_ttl=0, history_hours=24)
+        missing = widget.entity_ids()[0]
+        for entity_id in widget.entity_ids()[1:]:
+            mock_hass.add_history(entity_id, now - 3600, "50", {"current_temperature": 20})
+
+        widget.update()
+        mock_hass.history_requests.clear()
+        widget.update()
+
+        window = now - 24 * 3600
+        requests = [
+            (entity_ids, since.timestamp()) for entity_ids, since in mock_hass.history_requests
+        ]
+        assert ([missing], pytest.approx(window, abs=5)) in requests
+        incremental = [(ids, since) for ids, since in requests if missing not in ids]
+        assert len(incremental) == 2
+        assert all(since >= now - 3600 for _, since in incremental)
+
 
 class TestPILRenderer:
     """Tests for PIL renderer behavior."""
@@ -321,3 +634,36 @@ class TestPILRenderer:
 
         pil_renderer.clear()
         assert pil_renderer.get_image().tobytes() == baseline
+
+    def test_draw_calls_track_dirty_rects(self, pil_renderer):
+        """Text and icon draws are reported as byte-aligned dirty rectangles."""
+        pil_renderer.clear()
+        assert pil_renderer.dirty_rects() == []
+
+        pil_renderer.draw_text((21, 30), "21.5°C", style="normal")
+        pil_renderer.draw_icon((83, 150), "weather-cloudy", 50)
+        rects = pil_renderer.dirty_rects()
+
+        assert len(rects) == 2
+        text_rect, icon_rect = rects
+        assert text_rect[0] == 16 and text_rect[1] >= 30 and text_rect[2] % 8 == 0
+        assert icon_rect == (80, 150, 136, 200)
+
+        # Every changed pixel lies inside a dirty rectangle.
+        baseline = PILRenderer(size=(800, 480)).get_image()
+        diff = ImageChops.logical_xor(baseline, pil_renderer.get_image())
+        for left, top, right, bottom in rects:
+            diff.paste(0, (left, top, right, bottom))
+        assert diff.getbbox() is None
+
+    def test_dirty_rects_merge_and_carry_previous_frame(self, pil_renderer):
+        """Touching draws merge into one rect; the last frame's rects can be included."""
+        pil_renderer.clear()
+        pil_renderer.draw_text((10, 10), "N/A")
+        pil_renderer.draw_text((30, 10), "N/A")
+        assert len(pil_renderer.dirty_rects()) == 1
+
+        pil_renderer.clear()
+        pil_renderer.draw_text((10, 300), "N/A")
+        assert len(pil_renderer.dirty_rects()) == 1
+        assert len(pil_renderer.dirty_rects(include_previous=True)) == 2